@@ -0,0 +1,3 @@
+from .origin import SyntheticOrigin
+
+__all__ = ['SyntheticOrigin']
@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+import tempfile
+from typing import Optional
+
+from src.constants import Constants
+
+from .harness import TABLE_HEADER, compare, format_result, run_benchmarks
+from .origin import SyntheticOrigin
+
+
+def _parse_arguments(argv: Optional[list]) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    :param argv: The command line arguments (sys.argv[1:] if not given).
+    :type argv: list[str]
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark the download path against a local synthetic HLS origin, without network access.'
+    )
+    parser.add_argument('--segments', type=int, default=100, help='segments per media playlist')
+    parser.add_argument(
+        '--segment-size', type=int, default=256 * 1024, help='size in bytes of the segments of the highest variant'
+    )
+    parser.add_argument('--variants', type=int, default=3, help='variants of the master playlist')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds every segment request waits')
+    parser.add_argument('--jitter', type=float, default=0.01, help='maximum random seconds added to the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of segment requests failing with 503')
+    parser.add_argument('--encrypted', action='store_true', help='encrypt the segments with AES-128')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random delays and failures')
+    parser.add_argument(
+        '--engines', nargs='+', choices=(Constants.ENGINE_THREADED, Constants.ENGINE_ASYNCIO),
+        default=[Constants.ENGINE_THREADED], help='download engines'
+    )
+    parser.add_argument(
+        '--output-modes', nargs='+', choices=(Constants.OUTPUT_MODE_STREAMING, Constants.OUTPUT_MODE_STAGED),
+        default=[Constants.OUTPUT_MODE_STREAMING, Constants.OUTPUT_MODE_STAGED], help='output modes'
+    )
+    parser.add_argument(
+        '--concurrency', nargs='+', type=int, default=[1, 4, 16], help='segments fetched in parallel per run'
+    )
+    parser.add_argument(
+        '--adaptive-concurrency', action=argparse.BooleanOptionalAction, default=False,
+        help='adapt the segment requests in flight up to the concurrency level'
+    )
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case; the median of each measurement is kept')
+    parser.add_argument('--save', help='file the results are written to as JSON')
+    parser.add_argument('--baseline', help='results of an earlier run (see --save) to compare against')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2, help='relative change tolerated before a case is a regression'
+    )
+    arguments = parser.parse_args(argv)
+    if arguments.segments < 1 or arguments.segment_size < 1 or arguments.variants < 1:
+        parser.error('--segments, --segment-size and --variants should be at least 1.')
+    if arguments.latency < 0 or arguments.jitter < 0:
+        parser.error('--latency and --jitter should not be negative.')
+    if not 0 <= arguments.error_rate < 1:
+        parser.error('--error-rate should be at least 0 and less than 1.')
+    if min(arguments.concurrency) < 1:
+        parser.error('--concurrency should be at least 1.')
+    if arguments.repeat < 1:
+        parser.error('--repeat should be at least 1.')
+    if arguments.tolerance < 0:
+        parser.error('--tolerance should not be negative.')
+    return arguments
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Run the benchmarks and print the result table.
+
+    :param argv: The command line arguments (sys.argv[1:] if not given).
+    :type argv: list[str]
+    :return: The exit code: 0 if all cases completed without regression, 1 otherwise.
+    :rtype: int
+    """
+    arguments = _parse_arguments(argv)
+    settings = {
+        'segments': arguments.segments,
+        'segment_size': arguments.segment_size,
+        'variants': arguments.variants,
+        'latency': arguments.latency,
+        'jitter': arguments.jitter,
+        'error_rate': arguments.error_rate,
+        'encrypted': arguments.encrypted,
+        'seed': arguments.seed,
+        'adaptive_concurrency': arguments.adaptive_concurrency
+    }
+    baseline = None
+    if arguments.baseline:
+        try:
+            with open(arguments.baseline, 'r') as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f'{e}\n')
+            return 1
+        if baseline.get('settings') != settings:
+            sys.stderr.write('Warning: the baseline was measured with different settings.\n')
+
+    print(TABLE_HEADER)
+    with tempfile.TemporaryDirectory() as directory, SyntheticOrigin(
+            arguments.segments, arguments.segment_size, latency=arguments.latency, jitter=arguments.jitter,
+            error_rate=arguments.error_rate, encrypted=arguments.encrypted, variants=arguments.variants,
+            seed=arguments.seed
+    ) as origin:
+        results = run_benchmarks(
+            origin, directory, arguments.engines, arguments.output_modes, arguments.concurrency,
+            arguments.adaptive_concurrency, arguments.repeat, lambda result: print(format_result(result), flush=True)
+        )
+
+    if arguments.save:
+        with open(arguments.save, 'w') as file:
+            json.dump({'settings': settings, 'results': results}, file, indent=2)
+
+    succeeded = all(result['state'] == 'Completed' for result in results)
+    if baseline is not None:
+        regressions = compare(results, baseline.get('results', []), arguments.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        succeeded = succeeded and not regressions
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
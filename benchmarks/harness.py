@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+import statistics
+import time
+
+from src.metrics import get_peak_rss
+
+from .origin import SyntheticOrigin
+
+# Metrics compared against a baseline: the relative tolerance only applies above the absolute noise floor, so
+# regressions of a few milliseconds or megabytes on a busy machine are not reported
+NOISE_FLOORS = {'throughput': 0, 'ttfb': 0.05, 'peak_rss': 8 * 1024 * 1024, 'merge_time': 0.05}
+HIGHER_IS_BETTER = ('throughput',)  # Metrics which regress when they decrease
+
+
+def _run_download(url: str, output_file: str, variant_name: str, overrides: dict, connection) -> None:
+    """
+    Download the variant of the master playlist through the download worker and send the measurements through
+    the connection. Runs in a fresh process per case, so the peak RSS belongs to that case alone.
+
+    :param url: The URL of the master playlist.
+    :type url: str
+    :param output_file: The path of the output file. Its directory is used as working directory, so no config file
+    or HTTP cache of the user is picked up.
+    :type output_file: str
+    :param variant_name: The name of the variant to download.
+    :type variant_name: str
+    :param overrides: The settings of the download worker.
+    :type overrides: dict
+    :param connection: The connection the measurements are sent through.
+    :type connection: multiprocessing.connection.Connection
+    :return: None
+    """
+    from src.inspector import PlaylistInspector
+    from src.playlist import Variant
+    from src.worker import DownloadWorker
+
+    class BenchmarkWorker(DownloadWorker):
+        """Download worker keeping the error message of a failed download."""
+
+        message = ''
+
+        def _on_error(self, message: str) -> None:
+            self.message = message
+
+    os.chdir(os.path.dirname(output_file))
+    idle_rss = get_peak_rss()
+    worker = BenchmarkWorker(
+        url, output_file, True, True, Variant(None, None, variant_name, None), overrides=overrides,
+        inspector=PlaylistInspector(ttl=0)
+    )
+    start_time = time.time()
+    worker.run()  # The worker thread's body, run on this thread
+    end_time = time.time()
+
+    merge_throughput = getattr(worker.downloader, 'merge_throughput', None)
+    output_size = os.path.getsize(worker.downloader.output_file_path) if worker.downloader is not None and \
+        os.path.isfile(worker.downloader.output_file_path) else 0
+    peak_rss = get_peak_rss()
+    connection.send({
+        'state': worker.metrics.state,
+        'message': worker.message,
+        'start_time': start_time,
+        'elapsed': end_time - start_time,
+        'output_size': output_size,
+        'retries': worker.metrics.retries,
+        'merge_time': output_size / merge_throughput if merge_throughput else None,
+        'peak_rss': peak_rss,
+        'rss_growth': peak_rss - idle_rss if peak_rss is not None and idle_rss is not None else None
+    })
+    connection.close()
+
+
+def run_case(
+        origin: SyntheticOrigin,
+        directory: str,
+        engine: str,
+        output_mode: str,
+        concurrency: int,
+        adaptive_concurrency: bool = False
+) -> dict:
+    """
+    Download the highest variant of the origin once and measure the end-to-end throughput, the time to first byte,
+    the peak RSS and the merge time.
+
+    :param origin: The running origin.
+    :type origin: SyntheticOrigin
+    :param directory: The directory the output file is written to (and deleted from afterwards).
+    :type directory: str
+    :param engine: The download engine.
+    :type engine: str
+    :param output_mode: The output mode.
+    :type output_mode: str
+    :param concurrency: The number of segments fetched in parallel (max_threads and max_concurrency).
+    :type concurrency: int
+    :param adaptive_concurrency: A flag to adapt the concurrency to errors and latency, up to the given value.
+    :type adaptive_concurrency: bool
+    :return: The result of the case: its settings, state, message and measurements (throughput in bytes per second,
+    ttfb, elapsed and merge_time in seconds, peak_rss and rss_growth in bytes).
+    :rtype: dict
+    """
+    output_file = os.path.join(directory, f'{engine}-{output_mode}-{concurrency}.mp4')
+    overrides = {
+        'engine': engine,
+        'output_mode': output_mode,
+        'max_threads': concurrency,
+        'max_concurrency': concurrency,
+        'adaptive_concurrency': adaptive_concurrency
+    }
+    origin.reset()
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_download, args=(origin.master_url, output_file, f'v{origin.variants}', overrides, sender)
+    )
+    process.start()
+    sender.close()
+    try:
+        measurements = receiver.recv()
+    except EOFError:
+        measurements = {'state': 'Failed', 'message': 'Benchmark process exited unexpectedly.'}
+    finally:
+        receiver.close()
+        process.join()
+    try:
+        os.remove(output_file)
+    except OSError:
+        pass
+
+    result = {'engine': engine, 'output_mode': output_mode, 'concurrency': concurrency}
+    result.update(measurements)
+    start_time = result.pop('start_time', None)
+    output_size = result.pop('output_size', 0)
+    if result['state'] == 'Completed' and output_size != origin.get_output_size():
+        result['state'] = 'Failed'
+        result['message'] = f'Output size {output_size} does not match {origin.get_output_size()}.'
+    elapsed = result.get('elapsed')
+    result['throughput'] = output_size / elapsed if elapsed else None
+    result['ttfb'] = origin.first_byte_time - start_time if origin.first_byte_time and start_time else None
+    result['requests'] = origin.requests
+    result['errors'] = origin.errors
+    return result
+
+
+def run_benchmarks(
+        origin: SyntheticOrigin,
+        directory: str,
+        engines: list,
+        output_modes: list,
+        concurrency_levels: list,
+        adaptive_concurrency: bool = False,
+        repeat: int = 1,
+        on_result=None
+) -> list:
+    """
+    Run every combination of engine, output mode and concurrency level, repeating every case and keeping the median
+    of each measurement.
+
+    :param origin: The running origin.
+    :type origin: SyntheticOrigin
+    :param directory: The directory the output files are written to.
+    :type directory: str
+    :param engines: The download engines.
+    :type engines: list[str]
+    :param output_modes: The output modes.
+    :type output_modes: list[str]
+    :param concurrency_levels: The numbers of segments fetched in parallel.
+    :type concurrency_levels: list[int]
+    :param adaptive_concurrency: A flag to adapt the concurrency to errors and latency, up to the given levels.
+    :type adaptive_concurrency: bool
+    :param repeat: The number of runs per case.
+    :type repeat: int
+    :param on_result: Callable invoked with the result of every case once measured.
+    :type on_result: Callable[[dict], None]
+    :return: The results of all cases.
+    :rtype: list[dict]
+    """
+    results = []
+    for engine in engines:
+        for output_mode in output_modes:
+            for concurrency in concurrency_levels:
+                runs = [
+                    run_case(origin, directory, engine, output_mode, concurrency, adaptive_concurrency)
+                    for _ in range(repeat)
+                ]
+                result = _get_median_result(runs)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return results
+
+
+def _get_median_result(runs: list) -> dict:
+    """
+    Combine the runs of a case into a single result holding the median of every measurement. A case fails if any
+    of its runs failed.
+
+    :param runs: The results of the runs.
+    :type runs: list[dict]
+    :return: The combined result.
+    :rtype: dict
+    """
+    failed = [run for run in runs if run['state'] != 'Completed']
+    result = dict(failed[0] if failed else runs[0])
+    for key, value in result.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and key != 'concurrency':
+            values = [run[key] for run in runs if run.get(key) is not None]
+            result[key] = statistics.median(values) if values else None
+    return result
+
+
+def get_case_key(result: dict) -> tuple:
+    """
+    Get the key identifying the case of a result.
+
+    :param result: The result.
+    :type result: dict
+    :return: The engine, output mode and concurrency level.
+    :rtype: tuple
+    """
+    return result['engine'], result['output_mode'], result['concurrency']
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Compare the results against the results of a baseline run and list the regressions: measurements worse than the
+    baseline by more than the tolerance and the noise floor of the metric. Cases missing from the baseline are not
+    compared.
+
+    :param results: The results.
+    :type results: list[dict]
+    :param baseline: The results of the baseline run.
+    :type baseline: list[dict]
+    :param tolerance: The relative change tolerated, e.g. 0.2 for 20%.
+    :type tolerance: float
+    :return: A description of every regression.
+    :rtype: list[str]
+    """
+    baseline_by_case = {get_case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        expected = baseline_by_case.get(get_case_key(result))
+        if expected is None:
+            continue
+        case = '/'.join(map(str, get_case_key(result)))
+        if result['state'] != 'Completed':
+            if expected['state'] == 'Completed':
+                regressions.append(f'{case}: {result["state"]} ({result["message"]})')
+            continue
+        for metric, noise_floor in NOISE_FLOORS.items():
+            value, reference = result.get(metric), expected.get(metric)
+            if value is None or reference is None:
+                continue
+            change = reference - value if metric in HIGHER_IS_BETTER else value - reference
+            if change > max(abs(reference) * tolerance, noise_floor):
+                regressions.append(f'{case}: {metric} {reference:.4g} -> {value:.4g}')
+    return regressions
+
+
+def format_result(result: dict) -> str:
+    """
+    Format a result as a row of the result table.
+
+    :param result: The result.
+    :type result: dict
+    :return: The row.
+    :rtype: str
+    """
+    def scaled(value, factor, digits):
+        return '-' if value is None else f'{value / factor:.{digits}f}'
+
+    row = (
+        f'{result["engine"]:<10} {result["output_mode"]:<10} {result["concurrency"]:>5} '
+        f'{scaled(result.get("throughput"), 1024 ** 2, 1):>9} {scaled(result.get("ttfb"), 1e-3, 1):>9} '
+        f'{scaled(result.get("peak_rss"), 1024 ** 2, 1):>9} {scaled(result.get("merge_time"), 1e-3, 1):>9} '
+        f'{result.get("retries") or 0:>7}  {result["state"]}'
+    )
+    if result['state'] != 'Completed' and result.get('message'):
+        row += f' ({result["message"]})'
+    return row
+
+
+TABLE_HEADER = (
+    f'{"engine":<10} {"mode":<10} {"conc":>5} {"MiB/s":>9} {"TTFB ms":>9} {"RSS MiB":>9} {"merge ms":>9} '
+    f'{"retries":>7}  state'
+)  # Header of the result table
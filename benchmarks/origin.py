@@ -0,0 +1,323 @@
+import http.server
+import random
+import threading
+import time
+from typing import Optional
+
+KEY = bytes(range(16))  # Key of encrypted playlists
+IV = bytes(range(16, 32))  # Initialization vector of encrypted playlists, shared by all segments
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Request handler serving the synthetic playlists and segments of the owning origin."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def _respond(self, send_body: bool) -> None:
+        """
+        Answer the request with the resource at its path.
+
+        :param send_body: A flag to send the body, not only the headers.
+        :type send_body: bool
+        :return: None
+        """
+        origin = self.server
+        is_segment = self.path.endswith('.ts')
+        if is_segment:
+            delay = origin.get_delay()
+            if delay > 0:
+                time.sleep(delay)
+            if send_body and origin.should_fail():
+                origin.record_request(self.path, 503)
+                self.send_error(503)
+                return
+
+        body = origin.get_resource(self.path)
+        if body is None:
+            origin.record_request(self.path, 404)
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            if is_segment:
+                origin.record_first_byte()
+            self.wfile.write(body)
+        origin.record_request(self.path, 200)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SyntheticOrigin(http.server.ThreadingHTTPServer):
+    """
+    Local HTTP server standing in for an HLS origin, generating a master playlist and its media playlists
+    instead of serving files.
+
+    The master playlist (/master.m3u8) lists the given number of variants, named 'v1' (lowest bandwidth) up to
+    'v<variants>' (highest bandwidth, with segments of segment_size bytes; lower variants get proportionally smaller
+    segments). Every segment request waits for the latency plus a random jitter and fails with 503 at the given
+    error rate. Encrypted playlists are encrypted with AES-128 using KEY and IV. The randomness is seeded, so runs
+    with the same settings see the same delays and failures in the same order.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+            self,
+            segment_count: int = 100,
+            segment_size: int = 256 * 1024,
+            segment_duration: float = 4.0,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            encrypted: bool = False,
+            variants: int = 3,
+            seed: int = 0
+    ) -> None:
+        """
+        Initialize the SyntheticOrigin class, listening on a free port of the loopback interface.
+
+        :param segment_count: The number of segments per media playlist.
+        :type segment_count: int
+        :param segment_size: The size (in bytes) of the segments of the highest variant.
+        :type segment_size: int
+        :param segment_duration: The duration (in seconds) of every segment.
+        :type segment_duration: float
+        :param latency: The time (in seconds) every segment request waits before it is answered.
+        :type latency: float
+        :param jitter: The maximum random time (in seconds) added to or subtracted from the latency.
+        :type jitter: float
+        :param error_rate: The fraction of segment requests failing with 503.
+        :type error_rate: float
+        :param encrypted: A flag to encrypt the segments with AES-128.
+        :type encrypted: bool
+        :param variants: The number of variants of the master playlist.
+        :type variants: int
+        :param seed: The seed of the random delays and failures.
+        :type seed: int
+        """
+        if segment_count < 1 or segment_size < 1 or variants < 1:
+            raise ValueError('segment_count, segment_size and variants should be at least 1.')
+        if latency < 0 or jitter < 0:
+            raise ValueError('latency and jitter should not be negative.')
+        if not 0 <= error_rate < 1:
+            raise ValueError('error_rate should be at least 0 and less than 1.')
+
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.segment_count = segment_count
+        self.segment_size = segment_size
+        self.segment_duration = segment_duration
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.encrypted = encrypted
+        self.variants = variants
+        self.requests = 0
+        self.errors = 0
+        self.first_byte_time = None
+        self._random = random.Random(seed)
+        self._resources = self._generate_resources()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Getter property for the URL of the origin.
+
+        :return: The URL, without trailing slash.
+        :rtype: str
+        """
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    @property
+    def master_url(self) -> str:
+        """
+        Getter property for the URL of the master playlist.
+
+        :return: The URL.
+        :rtype: str
+        """
+        return f'{self.url}/master.m3u8'
+
+    def get_media_url(self, variant: Optional[int] = None) -> str:
+        """
+        Get the URL of the media playlist of the given variant.
+
+        :param variant: The number of the variant, 1 being the lowest bandwidth (the highest variant if not given).
+        :type variant: int
+        :return: The URL.
+        :rtype: str
+        """
+        return f'{self.url}/v{variant or self.variants}/index.m3u8'
+
+    def get_output_size(self, variant: Optional[int] = None) -> int:
+        """
+        Get the size of the concatenated segments of the given variant.
+
+        :param variant: The number of the variant, 1 being the lowest bandwidth (the highest variant if not given).
+        :type variant: int
+        :return: The size in bytes.
+        :rtype: int
+        """
+        return self.segment_count * len(self._get_plain_segment(variant or self.variants))
+
+    def _get_plain_segment(self, variant: int) -> bytes:
+        """
+        Get the unencrypted content shared by all segments of the given variant: a null packet pattern of 188-byte
+        MPEG-TS packets, truncated to the segment size.
+
+        :param variant: The number of the variant.
+        :type variant: int
+        :return: The content.
+        :rtype: bytes
+        """
+        size = max(1, self.segment_size * variant // self.variants)
+        packet = b'\x47\x1f\xff\x10' + bytes(184)
+        return (packet * (size // len(packet) + 1))[:size]
+
+    def _generate_resources(self) -> dict:
+        """
+        Generate the playlists, segment contents and key served by the origin.
+
+        :return: The content by path.
+        :rtype: dict[str, bytes]
+        """
+        master = ['#EXTM3U']
+        resources = {}
+        key_tag = ''
+        if self.encrypted:
+            resources['/key.bin'] = KEY
+            key_tag = f'#EXT-X-KEY:METHOD=AES-128,URI="/key.bin",IV=0x{IV.hex()}\n'
+        for variant in range(1, self.variants + 1):
+            segment = self._get_plain_segment(variant)
+            bandwidth = int(len(segment) * 8 / self.segment_duration)
+            master.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},NAME="v{variant}"\nv{variant}/index.m3u8')
+            resources[f'/v{variant}/segment.ts'] = self._encrypt(segment) if self.encrypted else segment
+            resources[f'/v{variant}/index.m3u8'] = (
+                f'#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:{int(self.segment_duration + 0.999)}\n{key_tag}'
+                + ''.join(
+                    f'#EXTINF:{self.segment_duration:.3f},\nsegment{index}.ts\n' for index in range(self.segment_count)
+                )
+                + '#EXT-X-ENDLIST\n'
+            ).encode()
+        resources['/master.m3u8'] = ('\n'.join(master) + '\n').encode()
+        return resources
+
+    @staticmethod
+    def _encrypt(data: bytes) -> bytes:
+        """
+        Encrypt the content of a segment with AES-128 in CBC mode with PKCS#7 padding.
+
+        :param data: The content.
+        :type data: bytes
+        :return: The encrypted content.
+        :rtype: bytes
+        """
+        from cryptography.hazmat.primitives import padding
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        encryptor = Cipher(algorithms.AES(KEY), modes.CBC(IV)).encryptor()
+        return encryptor.update(padder.update(data) + padder.finalize()) + encryptor.finalize()
+
+    def get_resource(self, path: str) -> Optional[bytes]:
+        """
+        Get the content served at the given path.
+
+        :param path: The path of the request.
+        :type path: str
+        :return: The content, or None if there is none.
+        :rtype: bytes
+        """
+        directory, _, name = path.rpartition('/')
+        if name.startswith('segment') and name.endswith('.ts'):
+            index = name[len('segment'):-len('.ts')]
+            if not index.isdigit() or int(index) >= self.segment_count:
+                return None
+            path = f'{directory}/segment.ts'
+        return self._resources.get(path)
+
+    def get_delay(self) -> float:
+        """
+        Draw the delay of a segment request.
+
+        :return: The delay in seconds.
+        :rtype: float
+        """
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self) -> bool:
+        """
+        Draw whether a segment request fails.
+
+        :return: True if the request is answered with 503.
+        :rtype: bool
+        """
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def record_request(self, path: str, status: int) -> None:
+        """
+        Count an answered request.
+
+        :param path: The path of the request.
+        :type path: str
+        :param status: The HTTP status code of the response.
+        :type status: int
+        :return: None
+        """
+        with self._lock:
+            self.requests += 1
+            if status >= 400:
+                self.errors += 1
+
+    def record_first_byte(self) -> None:
+        """Record the time (since the epoch, comparable across processes) the first segment byte was sent."""
+        with self._lock:
+            if self.first_byte_time is None:
+                self.first_byte_time = time.time()
+
+    def reset(self) -> None:
+        """Reset the request counters and the first byte time, e.g. between two benchmark runs."""
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.first_byte_time = None
+
+    def start(self) -> 'SyntheticOrigin':
+        """
+        Start serving requests in a background thread.
+
+        :return: The origin.
+        :rtype: SyntheticOrigin
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests and close the listening socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'SyntheticOrigin':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
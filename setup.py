@@ -5,19 +5,23 @@ from src import Constants
 setup(
     name=Constants.APP_PACKAGE_NAME,
     version=Constants.APP_VERSION,
-    package_dir={'': 'src'},
+    packages=['src'],
+    package_dir={'src': 'src'},
+    package_data={'src': ['Resources/Images/*']},
     url='https://github.com/coldsofttech/pym3u8downloaderui',
     license='MIT',
     author='coldsofttech',
     description=Constants.APP_PACKAGE_DESCRIPTION,
     entry_points={
         'console_scripts': [
-            'pym3u8downloaderui = src.__init__:main'
+            'pym3u8downloaderui = src.__init__:main',
+            'pym3u8downloaderui-batch = src.cli:main'
         ]
     },
     install_requires=[
         'requests~=2.32.3',
-        'pym3u8downloader~=0.1.8'
+        'pym3u8downloader~=0.1.8',
+        'cryptography>=42.0.0'
     ],
     requires_python=">=3.10",
     long_description=open('README.md').read(),
@@ -0,0 +1,129 @@
+import os
+import platform
+import shutil
+import threading
+import time
+from typing import Optional
+
+from .constants import Constants
+
+
+def get_cache_directory() -> str:
+    """
+    Get the per-user cache directory of the application, following the conventions of the operating system.
+
+    :return: The path of the cache directory (not necessarily existing yet).
+    :rtype: str
+    """
+    system = platform.system().lower()
+    if system == 'windows':
+        base_directory = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    elif system == 'darwin':
+        base_directory = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        base_directory = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_directory, Constants.APP_PACKAGE_NAME)
+
+
+class AssetCache:
+    """
+    Class for serving the application assets (icons) from the user cache directory without touching the network.
+
+    Assets are shipped as package data and copied into the cache on first use. Newer versions are fetched from the
+    repository in the background, at most once per refresh interval, and take effect on the next start.
+    """
+
+    package_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Resources', 'Images')
+
+    def __init__(self, cache_directory: Optional[str] = None) -> None:
+        """
+        Initialize the AssetCache class.
+
+        :param cache_directory: The cache directory (the per-user cache directory if not given).
+        :type cache_directory: str
+        """
+        self.cache_directory = cache_directory or get_cache_directory()
+
+    def get_path(self, file_name: str) -> Optional[str]:
+        """
+        Get the local path of the asset, copying the packaged asset into the cache if needed.
+
+        :param file_name: The file name of the asset.
+        :type file_name: str
+        :return: The path of the asset, or None if it is neither cached nor packaged.
+        :rtype: str
+        """
+        cached_path = os.path.join(self.cache_directory, file_name)
+        if os.path.isfile(cached_path):
+            return cached_path
+
+        packaged_path = os.path.join(self.package_directory, file_name)
+        if not os.path.isfile(packaged_path):
+            return None
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            shutil.copyfile(packaged_path, cached_path)
+            return cached_path
+        except OSError:
+            return packaged_path  # Read-only home directory: use the packaged asset directly
+
+    def is_stale(self, file_name: str) -> bool:
+        """
+        Check if the cached asset is due for a refresh.
+
+        :param file_name: The file name of the asset.
+        :type file_name: str
+        :return: True if the asset is not cached or older than the refresh interval, False otherwise.
+        :rtype: bool
+        """
+        try:
+            age = time.time() - os.path.getmtime(os.path.join(self.cache_directory, file_name))
+        except OSError:
+            return True
+        return age > Constants.APP_ASSET_REFRESH_INTERVAL
+
+    def refresh(self, file_name: str, url: str) -> bool:
+        """
+        Download the asset into the cache if the cached copy is stale. Meant to run in the background.
+
+        :param file_name: The file name of the asset.
+        :type file_name: str
+        :param url: The URL of the asset.
+        :type url: str
+        :return: True if the cached asset was updated, False otherwise.
+        :rtype: bool
+        """
+        if not self.is_stale(file_name):
+            return False
+
+        import requests
+
+        cached_path = os.path.join(self.cache_directory, file_name)
+        try:
+            response = requests.get(url, timeout=Constants.APP_ASSET_REFRESH_TIMEOUT)
+            response.raise_for_status()
+            os.makedirs(self.cache_directory, exist_ok=True)
+            temp_path = f'{cached_path}.tmp'
+            with open(temp_path, 'wb') as file:
+                file.write(response.content)
+            os.replace(temp_path, cached_path)
+            return True
+        except (requests.RequestException, OSError):
+            return False
+
+    def refresh_in_background(self, assets: dict) -> threading.Thread:
+        """
+        Refresh the given assets on a daemon thread.
+
+        :param assets: The URL of every asset, keyed by file name.
+        :type assets: dict[str, str]
+        :return: The started thread.
+        :rtype: threading.Thread
+        """
+        def refresh_all() -> None:
+            for file_name, url in assets.items():
+                self.refresh(file_name, url)
+
+        thread = threading.Thread(target=refresh_all, name='AssetRefresh', daemon=True)
+        thread.start()
+        return thread
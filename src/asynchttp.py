@@ -0,0 +1,424 @@
+import asyncio
+import base64
+import socket
+import ssl
+import urllib.request
+from typing import AsyncIterator, Optional
+from urllib.parse import unquote, urljoin, urlsplit
+
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)  # Status codes followed as redirects
+
+
+class AsyncHTTPError(OSError):
+    """An exception raised for failed requests of the AsyncHTTPConnectionPool."""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        """
+        Initialize a new instance of AsyncHTTPError.
+
+        :param message: A human-readable error message describing the exception.
+        :type message: str
+        :param status: The HTTP status code of the response (if any).
+        :type status: int
+        """
+        self.message = message
+        self.status = status
+        super().__init__(self.message)
+
+
+class AsyncHTTPResponse:
+    """Class for reading the response of a request made through the AsyncHTTPConnectionPool."""
+
+    def __init__(
+            self,
+            pool: 'AsyncHTTPConnectionPool',
+            key: tuple,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            url: str,
+            method: str,
+            status: int,
+            headers: dict
+    ) -> None:
+        """
+        Initialize the AsyncHTTPResponse class.
+
+        :param pool: The pool the connection is returned to.
+        :type pool: AsyncHTTPConnectionPool
+        :param key: The (scheme, host, port) key of the connection.
+        :type key: tuple
+        :param reader: The stream the body is read from.
+        :type reader: asyncio.StreamReader
+        :param writer: The stream of the connection.
+        :type writer: asyncio.StreamWriter
+        :param url: The URL of the response.
+        :type url: str
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param status: The HTTP status code.
+        :type status: int
+        :param headers: The response headers with lower-case names.
+        :type headers: dict
+        """
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._pool = pool
+        self._key = key
+        self._reader = reader
+        self._writer = writer
+        self._method = method
+        self._complete = method == 'HEAD' or status in (204, 304)
+        self._keep_alive = headers.get('connection', '').lower() != 'close'
+
+    def raise_for_status(self) -> None:
+        """Raise an AsyncHTTPError if the response is not successful."""
+        if self.status >= 400:
+            raise AsyncHTTPError(f'{self.status} error for url: {self.url}', self.status)
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        """
+        Iterate over the body of the response.
+
+        :param chunk_size: The maximum size of a single chunk.
+        :type chunk_size: int
+        :return: The chunks of the body.
+        :rtype: AsyncIterator[bytes]
+        """
+        if self._complete:
+            return
+
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await self._read(self._reader.readline())
+                try:
+                    size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                except ValueError:
+                    raise AsyncHTTPError(f'Invalid chunk size {size_line!r} while reading {self.url}.')
+                if size == 0:
+                    while (await self._read(self._reader.readline())).strip():
+                        pass
+                    break
+                while size > 0:
+                    chunk = await self._read(self._reader.read(min(chunk_size, size)))
+                    if not chunk:
+                        raise AsyncHTTPError(f'Connection closed while reading {self.url}.')
+                    size -= len(chunk)
+                    yield chunk
+                await self._read(self._reader.readline())
+        elif 'content-length' in self.headers:
+            try:
+                remaining = int(self.headers['content-length'])
+            except ValueError:
+                raise AsyncHTTPError(f'Invalid Content-Length {self.headers["content-length"]!r} for {self.url}.')
+            while remaining > 0:
+                chunk = await self._read(self._reader.read(min(chunk_size, remaining)))
+                if not chunk:
+                    raise AsyncHTTPError(f'Connection closed while reading {self.url}.')
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            self._keep_alive = False
+            while True:
+                chunk = await self._read(self._reader.read(chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+
+        self._complete = True
+
+    async def read(self) -> bytes:
+        """
+        Read the complete body of the response.
+
+        :return: The body.
+        :rtype: bytes
+        """
+        return b''.join([chunk async for chunk in self.iter_chunks(64 * 1024)])
+
+    def release(self) -> None:
+        """Return the connection to the pool if the body was read completely, close it otherwise."""
+        if self._complete and self._keep_alive:
+            self._pool.put_connection(self._key, self._reader, self._writer)
+        else:
+            self._writer.close()
+
+    async def _read(self, awaitable):
+        """
+        Await a read of the body stream within the timeout of the pool.
+
+        :param awaitable: The read operation.
+        :return: The result of the read operation.
+        """
+        return await asyncio.wait_for(awaitable, self._pool.timeout)
+
+
+class AsyncHTTPConnectionPool:
+    """
+    Minimal HTTP/1.1 client built on asyncio streams, keeping idle connections alive per host.
+
+    A request costs one coroutine and a small stream buffer instead of a thread, which allows hundreds of
+    requests to be in flight at once. Like requests, the pool honours the proxies configured in the environment
+    (http_proxy, https_proxy and no_proxy): http URLs are requested through the proxy, https URLs are tunnelled
+    through it with CONNECT.
+    """
+
+    _max_redirects = 5  # Maximum number of redirects followed for a single request
+    _user_agent = 'pym3u8downloaderui'  # User agent sent with every request
+
+    def __init__(self, verify_ssl: bool = True, timeout: float = 30) -> None:
+        """
+        Initialize the AsyncHTTPConnectionPool class.
+
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param timeout: Timeout (in seconds) for connecting and for every single read.
+        :type timeout: float
+        """
+        self.timeout = timeout
+        self._idle = {}
+        self._proxies = urllib.request.getproxies()
+        self._ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def put_connection(self, key: tuple, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Return an idle connection to the pool.
+
+        :param key: The (scheme, host, port) key of the connection.
+        :type key: tuple
+        :param reader: The stream reader of the connection.
+        :type reader: asyncio.StreamReader
+        :param writer: The stream writer of the connection.
+        :type writer: asyncio.StreamWriter
+        :return: None
+        """
+        self._idle.setdefault(key, []).append((reader, writer))
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None) -> AsyncHTTPResponse:
+        """
+        Send a request and read the response headers. Redirects are followed.
+
+        :param method: The HTTP method.
+        :type method: str
+        :param url: The URL.
+        :type url: str
+        :param headers: Additional request headers.
+        :type headers: dict
+        :return: The response, whose body still needs to be read and which needs to be released.
+        :rtype: AsyncHTTPResponse
+        """
+        for _ in range(self._max_redirects + 1):
+            response = await self._send(method, url, headers or {})
+            location = response.headers.get('location')
+            if response.status not in REDIRECT_STATUS_CODES or not location:
+                return response
+
+            await response.read()
+            response.release()
+            url = urljoin(url, location)
+            method = 'GET' if response.status == 303 else method
+
+        raise AsyncHTTPError(f'Exceeded {self._max_redirects} redirects for url: {url}')
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                writer.close()
+
+    async def _send(self, method: str, url: str, headers: dict) -> AsyncHTTPResponse:
+        """
+        Send a single request, retrying once on a fresh connection if a reused connection was stale.
+
+        :param method: The HTTP method.
+        :type method: str
+        :param url: The URL.
+        :type url: str
+        :param headers: Additional request headers.
+        :type headers: dict
+        :return: The response.
+        :rtype: AsyncHTTPResponse
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise AsyncHTTPError(f'Invalid url: {url}')
+
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        proxy = self._get_proxy(parts.scheme, parts.hostname)
+        if proxy is not None and parts.scheme == 'http':
+            target = url.split('#')[0]  # Requests through a proxy carry the absolute URL
+            headers = dict(self._get_proxy_headers(proxy), **headers)
+        else:
+            target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        request_lines = [
+            f'{method} {target} HTTP/1.1',
+            f'Host: {parts.netloc}',
+            f'User-Agent: {self._user_agent}',
+            'Accept-Encoding: identity',
+            'Connection: keep-alive'
+        ] + [f'{name}: {value}' for name, value in headers.items()]
+        request = ('\r\n'.join(request_lines) + '\r\n\r\n').encode('latin-1')
+
+        while True:
+            reader, writer, reused = await self._get_connection(key, proxy)
+            try:
+                writer.write(request)
+                await asyncio.wait_for(writer.drain(), self.timeout)
+                status, response_headers = await self._read_head(reader, parts.netloc)
+                return AsyncHTTPResponse(self, key, reader, writer, url, method, status, response_headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+            except BaseException:
+                writer.close()
+                raise
+
+    async def _read_head(self, reader: asyncio.StreamReader, host: str) -> tuple:
+        """
+        Read the status line and the headers of a response, skipping interim (1xx) responses.
+
+        :param reader: The stream the response is read from.
+        :type reader: asyncio.StreamReader
+        :param host: The host the response is read from, for error messages.
+        :type host: str
+        :return: The status code and the headers with lower-case names.
+        :rtype: tuple
+        """
+        while True:
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not status_line:
+                raise ConnectionResetError(f'Connection closed by {host}.')
+
+            try:
+                version, status_code = status_line.split(maxsplit=2)[:2]
+                status = int(status_code)
+                if not version.startswith(b'HTTP/') or not 100 <= status <= 599:
+                    raise ValueError(status_line)
+            except ValueError:
+                raise AsyncHTTPError(f'Invalid status line {status_line!r} from {host}.')
+
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, separator, value = line.decode('latin-1').partition(':')
+                if not separator or not name.strip():
+                    raise AsyncHTTPError(f'Invalid header line {line!r} from {host}.', status)
+                headers[name.strip().lower()] = value.strip()
+
+            if status >= 200 or status == 101:
+                return status, headers
+
+    def _get_proxy(self, scheme: str, host: str) -> Optional[str]:
+        """
+        Get the proxy requests to the host go through.
+
+        :param scheme: The scheme of the URL.
+        :type scheme: str
+        :param host: The host of the URL.
+        :type host: str
+        :return: The URL of the proxy, or None to connect directly.
+        :rtype: str
+        """
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass_environment(host, self._proxies):
+            return None
+        if '://' not in proxy:
+            proxy = f'http://{proxy}'
+        if urlsplit(proxy).scheme != 'http':
+            raise AsyncHTTPError(f'Unsupported proxy: {proxy}')
+        return proxy
+
+    @staticmethod
+    def _get_proxy_headers(proxy: str) -> dict:
+        """
+        Get the headers authenticating requests to the proxy.
+
+        :param proxy: The URL of the proxy.
+        :type proxy: str
+        :return: The Proxy-Authorization header if the URL holds credentials, no headers otherwise.
+        :rtype: dict
+        """
+        parts = urlsplit(proxy)
+        if parts.username is None:
+            return {}
+        credentials = f'{unquote(parts.username)}:{unquote(parts.password or "")}'.encode('latin-1')
+        return {'Proxy-Authorization': f'Basic {base64.b64encode(credentials).decode("ascii")}'}
+
+    async def _get_connection(self, key: tuple, proxy: Optional[str] = None) -> tuple:
+        """
+        Get an idle connection for the key or open a new one.
+
+        :param key: The (scheme, host, port) key of the connection.
+        :type key: tuple
+        :param proxy: The URL of the proxy to connect through (if any).
+        :type proxy: str
+        :return: The reader, the writer and a flag to indicate if the connection was reused.
+        :rtype: tuple
+        """
+        connections = self._idle.get(key)
+        while connections:
+            reader, writer = connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        ssl_context = self._ssl_context if scheme == 'https' else None
+        if proxy is None:
+            connection = asyncio.open_connection(host, port, ssl=ssl_context)
+        elif scheme == 'http':
+            parts = urlsplit(proxy)
+            connection = asyncio.open_connection(parts.hostname, parts.port or 80)
+        else:
+            connection = self._open_tunnel(proxy, host, port)
+        reader, writer = await asyncio.wait_for(connection, self.timeout)
+        return reader, writer, False
+
+    async def _open_tunnel(self, proxy: str, host: str, port: int) -> tuple:
+        """
+        Open a TLS connection to the host through a CONNECT tunnel of the proxy.
+
+        :param proxy: The URL of the proxy.
+        :type proxy: str
+        :param host: The host to connect to.
+        :type host: str
+        :param port: The port to connect to.
+        :type port: int
+        :return: The reader and the writer of the connection.
+        :rtype: tuple
+        """
+        loop = asyncio.get_running_loop()
+        parts = urlsplit(proxy)
+        address = (await loop.getaddrinfo(parts.hostname, parts.port or 80, type=socket.SOCK_STREAM))[0]
+        sock = socket.socket(address[0], address[1], address[2])
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address[4])
+            request_lines = [f'CONNECT {host}:{port} HTTP/1.1', f'Host: {host}:{port}'] + [
+                f'{name}: {value}' for name, value in self._get_proxy_headers(proxy).items()
+            ]
+            await loop.sock_sendall(sock, ('\r\n'.join(request_lines) + '\r\n\r\n').encode('latin-1'))
+
+            # Read the response byte by byte, so nothing sent by the host after it is consumed
+            head = b''
+            while not head.endswith(b'\r\n\r\n'):
+                byte = await loop.sock_recv(sock, 1)
+                if not byte or len(head) > 64 * 1024:
+                    raise AsyncHTTPError(f'Invalid response of proxy {parts.hostname} to CONNECT.')
+                head += byte
+            status_line = head.split(b'\r\n', 1)[0]
+            fields = status_line.split()
+            if len(fields) < 2 or fields[1] != b'200':
+                raise AsyncHTTPError(f'Proxy {parts.hostname} refused to connect to {host}: {status_line!r}')
+
+            return await asyncio.open_connection(sock=sock, ssl=self._ssl_context, server_hostname=host)
+        except BaseException:
+            sock.close()
+            raise
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class SegmentCheckpoint:
+    """
+    Class for recording finished segments in a manifest next to the output file, so an interrupted download
+    can be resumed by fetching only the missing segments.
+
+    The manifest is a JSON-lines file: a header identifying the playlist followed by one line per finished segment
+    holding its index, its byte offset in the output file (if already known) and its size. Lines are only ever
+    appended, so recording a segment costs the same regardless of the playlist length.
+    """
+
+    _version = 1  # Version of the manifest format
+
+    def __init__(self, file_path: str, url: str, segments: list, mode: str = 'staged') -> None:
+        """
+        Initialize the SegmentCheckpoint class.
+
+        :param file_path: The path of the manifest.
+        :type file_path: str
+        :param url: The URL of the media playlist.
+        :type url: str
+        :param segments: The segments of the media playlist.
+        :type segments: list[Segment]
+        :param mode: The output mode of the download. Manifests of another mode are not resumed.
+        :type mode: str
+        """
+        self.file_path = file_path
+        self.url = url
+        self.mode = mode
+        self.total = len(segments)
+        self.fingerprint = self.get_fingerprint(segments)
+        self.completed = {}
+        self._offsets = {}
+        self._next_index = 0
+        self._next_offset = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_fingerprint(segments: list) -> str:
+        """
+        Get a fingerprint identifying the segment list. Query strings are ignored, since they usually carry
+        expiring access tokens.
+
+        :param segments: The segments of the media playlist.
+        :type segments: list[Segment]
+        :return: The fingerprint.
+        :rtype: str
+        """
+        digest = hashlib.sha1()
+        for segment in segments:
+            digest.update(urlsplit(segment.uri).path.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    @property
+    def header(self) -> dict:
+        """
+        Getter property for the header identifying the playlist of the manifest.
+
+        :return: The header.
+        :rtype: dict
+        """
+        return {
+            'version': self._version,
+            'url': self.url,
+            'mode': self.mode,
+            'segments': self.total,
+            'fingerprint': self.fingerprint
+        }
+
+    @property
+    def next_index(self) -> int:
+        """
+        Getter property for the index of the first segment not covered by the contiguous finished prefix.
+
+        :return: The index of the first missing segment.
+        :rtype: int
+        """
+        with self._lock:
+            return self._next_index
+
+    @property
+    def next_offset(self) -> int:
+        """
+        Getter property for the byte offset in the output file following the contiguous finished prefix.
+
+        :return: The size of the contiguous finished prefix in bytes.
+        :rtype: int
+        """
+        with self._lock:
+            return self._next_offset
+
+    def open(self) -> bool:
+        """
+        Open the manifest for recording. An existing manifest of the same playlist is resumed, any other
+        manifest is replaced.
+
+        :return: True if an existing manifest was resumed, False otherwise.
+        :rtype: bool
+        """
+        resumed, complete_lines = self._load()
+        self._file = open(self.file_path, 'a' if resumed else 'w', encoding='utf-8')
+        if not resumed:
+            self._write_line(self.header)
+        elif not complete_lines:
+            self._file.write('\n')
+        return resumed
+
+    def close(self) -> None:
+        """Close the manifest. The file is kept, so the download can be resumed."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the manifest, once the download is complete."""
+        self.close()
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+
+    def discard(self, index: int) -> None:
+        """
+        Forget a recorded segment, e.g. when its staged data turns out to be missing.
+
+        :param index: The index of the segment.
+        :type index: int
+        :return: None
+        """
+        with self._lock:
+            self.completed.pop(index, None)
+            self._offsets.clear()
+            self._next_index = 0
+            self._next_offset = 0
+            self._advance()
+
+    def record(self, index: int, size: int, offset: Optional[int] = None) -> None:
+        """
+        Record a finished segment.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param size: The size of the segment in bytes.
+        :type size: int
+        :param offset: The byte offset of the segment in the output file. Derived from the sizes of the preceding
+        segments if not given.
+        :type offset: int
+        :return: None
+        """
+        with self._lock:
+            self.completed[index] = size
+            self._advance()
+            if offset is None:
+                offset = self._offsets.get(index)
+            self._write_line({'index': index, 'offset': offset, 'size': size})
+
+    def get_offset(self, index: int) -> Optional[int]:
+        """
+        Get the byte offset of the segment in the output file.
+
+        :param index: The index of the segment.
+        :type index: int
+        :return: The offset, or None if a preceding segment is not finished yet.
+        :rtype: int
+        """
+        with self._lock:
+            return self._offsets.get(index)
+
+    def _advance(self) -> None:
+        """Assign offsets to the finished segments following the contiguous finished prefix."""
+        while self._next_index in self.completed:
+            self._offsets[self._next_index] = self._next_offset
+            self._next_offset += self.completed[self._next_index]
+            self._next_index += 1
+
+    def _load(self) -> tuple:
+        """
+        Load the finished segments of an existing manifest of the same playlist.
+
+        :return: A flag to indicate if a manifest of the same playlist was loaded and a flag to indicate if its
+        last line is complete.
+        :rtype: tuple
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return False, True
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            return False, True
+
+        # The URL is informational only: signed playlist URLs change between runs of the same download
+        if any(header.get(key) != value for key, value in self.header.items() if key != 'url'):
+            return False, True
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                index, size = int(entry['index']), int(entry['size'])
+            except (ValueError, KeyError, TypeError):
+                continue  # Partially written last line of an interrupted run
+            if 0 <= index < self.total:
+                self.completed[index] = size
+
+        self._advance()
+        return True, lines[-1].endswith('\n')
+
+    def _write_line(self, entry: dict) -> None:
+        """
+        Append a line to the manifest.
+
+        :param entry: The content of the line.
+        :type entry: dict
+        :return: None
+        """
+        if self._file is not None:
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
@@ -0,0 +1,459 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional, TextIO
+
+from .constants import Constants
+from .decryption import SegmentDecryptor
+from .httpcache import HttpCache
+from .inspector import PlaylistInspector
+from .memorybudget import MemoryBudget
+from .playlist import MasterPlaylist, Variant
+from .progress import ProgressChannel
+from .ratelimit import BandwidthLimiter
+from .remux import get_muxer_arguments
+from .scheduler import DownloadJob, JobScheduler, JobState
+from .segmentcache import SegmentCache
+from .worker import DownloadWorker
+
+
+class BatchWorker(DownloadWorker):
+    """Thread class for downloading a playlist of a batch, selecting master playlist variants automatically."""
+
+    def __init__(
+            self,
+            job: DownloadJob,
+            progress: ProgressChannel,
+            overrides: dict,
+            inspector: PlaylistInspector,
+            bandwidth_limiter: BandwidthLimiter,
+            segment_cache: Optional[SegmentCache] = None,
+            memory_budget: Optional[MemoryBudget] = None,
+            decryptor: Optional[SegmentDecryptor] = None
+    ) -> None:
+        """
+        Initialize the BatchWorker class.
+
+        :param job: The job to be downloaded.
+        :type job: DownloadJob
+        :param progress: The channel progress events are published to.
+        :type progress: ProgressChannel
+        :param overrides: Settings (attribute name and value) taking precedence over the config file.
+        :type overrides: dict
+        :param inspector: The inspector shared by all jobs of the batch.
+        :type inspector: PlaylistInspector
+        :param bandwidth_limiter: The bandwidth limiter shared by all jobs of the batch.
+        :type bandwidth_limiter: BandwidthLimiter
+        :param segment_cache: The segment cache shared by all jobs of the batch.
+        :type segment_cache: SegmentCache
+        :param memory_budget: The memory budget shared by all jobs of the batch.
+        :type memory_budget: MemoryBudget
+        :param decryptor: The decryptor of encrypted segments shared by all jobs of the batch.
+        :type decryptor: SegmentDecryptor
+        """
+        super().__init__(
+            job.input_url, job.output_file, job.verify_ssl, job.is_master, job.variant, job, progress, overrides,
+            inspector, bandwidth_limiter, segment_cache, job.live, memory_budget, decryptor
+        )
+
+    def _create_downloader(self):
+        """
+        Create the downloader of the configured engine. The pym3u8downloader engine is rejected, as it writes its
+        progress to the standard output (which only carries the JSON lines) instead of the progress channel.
+
+        :return: The downloader.
+        :rtype: SegmentDownloader | AsyncSegmentDownloader
+        """
+        if self.engine == Constants.ENGINE_PYM3U8DOWNLOADER:
+            raise ValueError(f'The {self.engine} engine is not supported in batch mode.')
+        return super()._create_downloader()
+
+    def _select_variant(self, playlist: MasterPlaylist) -> Optional[Variant]:
+        """
+        Select the variant by measured throughput if a variant deadline is configured, or the variant with the
+        highest bandwidth otherwise (used when no variant was requested on the command line).
+
+        :param playlist: The master playlist.
+        :type playlist: MasterPlaylist
+        :return: The selected variant, or None if the playlist has no variants.
+        :rtype: Variant
+        """
+        variant = super()._select_variant(playlist)
+        if variant is None and playlist.variants:
+            variant = max(playlist.variants, key=lambda item: item.bits_per_second)
+        return variant
+
+
+class BatchRunner:
+    """
+    Class for downloading a batch of playlists without user interface, through the same job scheduler and download
+    workers as the application, reporting progress as JSON lines.
+    """
+
+    _finished_states = (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED, JobState.VARIANT_REQUIRED)
+
+    def __init__(
+            self,
+            jobs: list,
+            max_workers: int = Constants.DEFAULT_MAX_CONCURRENT_JOBS,
+            overrides: Optional[dict] = None,
+            output: Optional[TextIO] = None,
+            interval: float = Constants.CLI_PROGRESS_INTERVAL,
+            bandwidth_limiter: Optional[BandwidthLimiter] = None,
+            segment_cache: Optional[SegmentCache] = None,
+            memory_budget: Optional[MemoryBudget] = None,
+            decryptor: Optional[SegmentDecryptor] = None
+    ) -> None:
+        """
+        Initialize the BatchRunner class.
+
+        :param jobs: The jobs to be downloaded.
+        :type jobs: list[DownloadJob]
+        :param max_workers: The maximum number of jobs downloaded in parallel.
+        :type max_workers: int
+        :param overrides: Settings (attribute name and value) taking precedence over the config file.
+        :type overrides: dict
+        :param output: The stream the JSON lines are written to (standard output if not given).
+        :type output: TextIO
+        :param interval: The interval (in seconds) progress is reported at.
+        :type interval: float
+        :param bandwidth_limiter: The bandwidth limiter shared by all jobs (unlimited if not given).
+        :type bandwidth_limiter: BandwidthLimiter
+        :param segment_cache: The segment cache shared by all jobs (from the config file if not given).
+        :type segment_cache: SegmentCache
+        :param memory_budget: The memory budget shared by all jobs (from the config file if not given).
+        :type memory_budget: MemoryBudget
+        :param decryptor: The decryptor of encrypted segments shared by all jobs (one per job if not given).
+        :type decryptor: SegmentDecryptor
+        """
+        self.jobs = jobs
+        self.overrides = overrides or {}
+        self.output = output or sys.stdout
+        self.interval = interval
+        self.progress = ProgressChannel()
+        self.inspector = PlaylistInspector(Constants.PLAYLIST_CACHE_TTL, HttpCache(Constants.HTTP_CACHE_FILE))
+        self.bandwidth_limiter = bandwidth_limiter or BandwidthLimiter()
+        self.segment_cache = segment_cache
+        self.memory_budget = memory_budget
+        self.decryptor = decryptor
+        self.scheduler = JobScheduler(self._create_worker, max_workers)
+        self.workers = {}
+        self._reported = set()
+
+    def _create_worker(self, job: DownloadJob) -> BatchWorker:
+        """
+        Create the worker downloading the given job. Used as thread factory by the job scheduler.
+
+        :param job: The job to be downloaded.
+        :type job: DownloadJob
+        :return: The worker (not yet started).
+        :rtype: BatchWorker
+        """
+        worker = self.workers[job.job_id] = BatchWorker(
+            job, self.progress, self.overrides, self.inspector, self.bandwidth_limiter, self.segment_cache,
+            self.memory_budget, self.decryptor
+        )
+        return worker
+
+    def run(self) -> bool:
+        """
+        Download all jobs and wait until they are finished. An interrupt (Ctrl+C) cancels all jobs.
+
+        :return: True if all jobs completed successfully, False otherwise.
+        :rtype: bool
+        """
+        for job in self.jobs:
+            self.scheduler.enqueue(job)
+
+        while self.scheduler.is_busy():
+            try:
+                time.sleep(self.interval)
+            except KeyboardInterrupt:
+                for job in self.jobs:
+                    self.scheduler.cancel(job)
+            self._report()
+        self._report()
+
+        completed = sum(job.state == JobState.COMPLETED for job in self.jobs)
+        self._emit({'event': 'summary', 'jobs': len(self.jobs), 'completed': completed})
+        return completed == len(self.jobs)
+
+    def _report(self) -> None:
+        """Report the latest progress of every running job and the outcome of every newly finished job."""
+        for job_id, event in self.progress.drain().items():
+            self._emit({
+                'event': 'progress',
+                'job': job_id,
+                'stage': event.stage,
+                'completed': event.completed,
+                'total': event.total,
+                'percentage': event.percentage,
+                'message': event.message
+            })
+
+        for job in self.jobs:
+            if job.job_id in self._reported or job.state not in self._finished_states:
+                continue
+            self._reported.add(job.job_id)
+            worker = self.workers.get(job.job_id)
+            self._emit({
+                'event': 'finished',
+                'job': job.job_id,
+                'url': job.input_url,
+                'output': job.output_file,
+                'state': job.state,
+                'message': job.message,
+                'metrics': worker.metrics.to_dict() if worker else None
+            })
+
+    def _emit(self, record: dict) -> None:
+        """
+        Write a record as a single JSON line.
+
+        :param record: The record.
+        :type record: dict
+        :return: None
+        """
+        self.output.write(json.dumps(record, default=str) + '\n')
+        self.output.flush()
+
+
+def read_batch_file(file: TextIO) -> list:
+    """
+    Read the URL and output file pairs of a batch. Every line holds a URL followed by the output file, separated by
+    whitespace; blank lines and lines starting with '#' are ignored.
+
+    :param file: The batch file.
+    :type file: TextIO
+    :return: The URL and output file pairs.
+    :rtype: list[tuple[str, str]]
+    """
+    pairs = []
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(None, 1)
+        if len(parts) != 2:
+            raise ValueError(f'Line {line_number}: expected "<url> <output file>".')
+        pairs.append((parts[0], parts[1].strip()))
+    return pairs
+
+
+def _load_config() -> dict:
+    """
+    Load the configuration settings from the config file (if exists).
+
+    :return: The settings, empty if the file does not exist or is invalid.
+    :rtype: dict
+    """
+    try:
+        with open(Constants.CONFIG_FILE, 'r') as file:
+            config = json.load(file)
+        return config if isinstance(config, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_max_concurrent_jobs(config: dict) -> int:
+    """
+    Get the maximum number of parallel jobs from the configuration settings.
+
+    :param config: The configuration settings.
+    :type config: dict
+    :return: The maximum number of parallel jobs.
+    :rtype: int
+    """
+    try:
+        return max(1, int(config.get('max_concurrent_jobs', Constants.DEFAULT_MAX_CONCURRENT_JOBS)))
+    except (ValueError, TypeError):
+        return Constants.DEFAULT_MAX_CONCURRENT_JOBS
+
+
+def _parse_arguments(argv: Optional[list]) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    :param argv: The command line arguments (sys.argv[1:] if not given).
+    :type argv: list[str]
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        prog=f'{Constants.APP_PACKAGE_NAME}-batch',
+        description='Download a batch of M3U8 playlists without user interface, reporting progress as JSON lines.'
+    )
+    parser.add_argument('batch_file', help='file with one "<url> <output file>" pair per line, or - for stdin')
+    parser.add_argument('-j', '--jobs', type=int, help='number of playlists downloaded in parallel')
+    parser.add_argument('--engine', choices=Constants.ENGINES, help='download engine')
+    parser.add_argument('--max-threads', type=int, help='segments fetched in parallel per playlist')
+    parser.add_argument('--max-concurrency', type=int, help='segment requests in flight for the asyncio engine')
+    parser.add_argument(
+        '--adaptive-concurrency', action=argparse.BooleanOptionalAction,
+        help='adapt the segment requests in flight per host to errors and latency'
+    )
+    parser.add_argument('--segment-timeout', type=float, help='maximum seconds a single segment request may take')
+    parser.add_argument('--max-retries', type=int, help='retries of a failed segment request')
+    parser.add_argument(
+        '--hedge-requests', action=argparse.BooleanOptionalAction,
+        help='send a duplicate request for segments slower than the observed p95 latency'
+    )
+    parser.add_argument(
+        '--output-mode', choices=(Constants.OUTPUT_MODE_STREAMING, Constants.OUTPUT_MODE_STAGED),
+        help='how segments are written to the output file'
+    )
+    parser.add_argument('--skip-ssl', action='store_true', help='skip SSL verification')
+    parser.add_argument('--live', action='store_true', help='record live and event playlists until they end')
+    parser.add_argument('--live-max-duration', type=float, help='maximum seconds of media recorded from live playlists')
+    parser.add_argument('--skip-space-check', action='store_true', default=None, help='skip the disk space check')
+    parser.add_argument(
+        '--size-estimate-samples', type=int,
+        help='segments whose size is requested to estimate the output size (0 for all)'
+    )
+    parser.add_argument(
+        '--preallocate', action=argparse.BooleanOptionalAction,
+        help='reserve the estimated size of the output file on disk before writing it'
+    )
+    parser.add_argument(
+        '--remux-command',
+        help='muxer command the ordered segments are piped into, writing the output file given by {output}'
+    )
+    parser.add_argument(
+        '--profile', action='store_true', default=None,
+        help='profile every job with cProfile, writing <output>.prof and <output>.profile.txt'
+    )
+    parser.add_argument(
+        '--trace-memory', action='store_true', default=None,
+        help='trace the memory allocations of every job, listing the top allocations in <output>.profile.txt'
+    )
+    parser.add_argument('--name', help='name of the variant to download from master playlists')
+    parser.add_argument('--bandwidth', help='bandwidth of the variant to download from master playlists')
+    parser.add_argument('--resolution', help='resolution of the variant to download from master playlists')
+    parser.add_argument(
+        '--deadline', type=float,
+        help='select the highest variant of master playlists expected to download within this many seconds'
+    )
+    parser.add_argument('--limit-rate', type=int, help='bandwidth limit in bytes per second shared by all playlists')
+    parser.add_argument(
+        '--segment-cache-size', type=int, help='maximum size in bytes of the segment cache shared by all playlists'
+    )
+    parser.add_argument(
+        '--memory-budget', type=int,
+        help='maximum bytes of received segment content not yet written, over all playlists (0 for no limit)'
+    )
+    parser.add_argument(
+        '--decryption-workers', type=int, help='processes decrypting encrypted segments (0 to decrypt in the downloads)'
+    )
+    parser.add_argument(
+        '--interval', type=float, default=Constants.CLI_PROGRESS_INTERVAL, help='seconds between progress reports'
+    )
+    arguments = parser.parse_args(argv)
+    if arguments.jobs is not None and arguments.jobs < 1:
+        parser.error('--jobs should be at least 1.')
+    if arguments.limit_rate is not None and arguments.limit_rate < 0:
+        parser.error('--limit-rate should not be negative.')
+    if arguments.deadline is not None and arguments.deadline <= 0:
+        parser.error('--deadline should be positive.')
+    if arguments.live_max_duration is not None and arguments.live_max_duration <= 0:
+        parser.error('--live-max-duration should be positive.')
+    if arguments.decryption_workers is not None and arguments.decryption_workers < 0:
+        parser.error('--decryption-workers should not be negative.')
+    if arguments.memory_budget is not None and arguments.memory_budget < 0:
+        parser.error('--memory-budget should not be negative.')
+    if arguments.segment_cache_size is not None and arguments.segment_cache_size < 0:
+        parser.error('--segment-cache-size should not be negative.')
+    if arguments.segment_timeout is not None and arguments.segment_timeout <= 0:
+        parser.error('--segment-timeout should be positive.')
+    if arguments.max_retries is not None and arguments.max_retries < 0:
+        parser.error('--max-retries should not be negative.')
+    if arguments.size_estimate_samples is not None and arguments.size_estimate_samples < 0:
+        parser.error('--size-estimate-samples should not be negative.')
+    if arguments.remux_command:
+        try:
+            get_muxer_arguments(arguments.remux_command, '')
+        except ValueError as e:
+            parser.error(str(e).replace('remux_command', '--remux-command'))
+    return arguments
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Run the headless batch mode.
+
+    :param argv: The command line arguments (sys.argv[1:] if not given).
+    :type argv: list[str]
+    :return: The exit code: 0 if all playlists were downloaded, 1 otherwise.
+    :rtype: int
+    """
+    arguments = _parse_arguments(argv)
+    try:
+        if arguments.batch_file == '-':
+            pairs = read_batch_file(sys.stdin)
+        else:
+            with open(arguments.batch_file, 'r', encoding='utf-8') as file:
+                pairs = read_batch_file(file)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f'{e}\n')
+        return 1
+
+    overrides = {
+        key: value for key, value in (
+            ('engine', arguments.engine),
+            ('max_threads', arguments.max_threads),
+            ('max_concurrency', arguments.max_concurrency),
+            ('adaptive_concurrency', arguments.adaptive_concurrency),
+            ('segment_timeout', arguments.segment_timeout),
+            ('max_retries', arguments.max_retries),
+            ('hedge_requests', arguments.hedge_requests),
+            ('output_mode', arguments.output_mode),
+            ('skip_space_check', arguments.skip_space_check),
+            ('size_estimate_samples', arguments.size_estimate_samples),
+            ('preallocate', arguments.preallocate),
+            ('remux_command', arguments.remux_command),
+            ('profile', arguments.profile),
+            ('trace_memory', arguments.trace_memory),
+            ('variant_deadline', arguments.deadline),
+            ('live_max_duration', arguments.live_max_duration)
+        ) if value is not None
+    }
+    variant = None
+    if arguments.name or arguments.bandwidth or arguments.resolution:
+        variant = Variant(None, arguments.bandwidth, arguments.name, arguments.resolution)
+    jobs = [
+        DownloadJob(url, os.path.abspath(output_file), not arguments.skip_ssl, False, variant, arguments.live)
+        for url, output_file in pairs
+    ]
+    config = _load_config()
+    try:
+        bandwidth_limiter = BandwidthLimiter(
+            (config.get('bandwidth_limit') or 0) if arguments.limit_rate is None else arguments.limit_rate,
+            config.get('bandwidth_burst')
+        )
+        segment_cache = SegmentCache(max_size=(
+            (config.get('segment_cache_size') or 0) if arguments.segment_cache_size is None
+            else arguments.segment_cache_size
+        ))
+        memory_budget = MemoryBudget(
+            (config.get('memory_budget') or 0) if arguments.memory_budget is None else arguments.memory_budget
+        )
+        decryptor = SegmentDecryptor(
+            config.get('decryption_workers') if arguments.decryption_workers is None else arguments.decryption_workers
+        )
+    except (ValueError, TypeError) as e:
+        sys.stderr.write(f'{e}\n')
+        return 1
+    runner = BatchRunner(
+        jobs, arguments.jobs or _load_max_concurrent_jobs(config), overrides, sys.stdout, arguments.interval,
+        bandwidth_limiter, segment_cache, memory_budget, decryptor
+    )
+
+    try:
+        return 0 if runner.run() else 1
+    finally:
+        decryptor.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
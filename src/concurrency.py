@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class HostConcurrency:
+    """Class holding the concurrency state of a single host."""
+
+    def __init__(self, limit: float) -> None:
+        """
+        Initialize the HostConcurrency class.
+
+        :param limit: The initial number of requests allowed in flight.
+        :type limit: float
+        """
+        self.limit = limit
+        self.in_flight = 0
+        self.latency = None
+        self.last_decrease = 0.0
+
+
+class ConcurrencyController:
+    """
+    Class for adapting the number of segment requests in flight per host (additive increase, multiplicative decrease).
+
+    Every successful request with a stable latency raises the limit of its host by 1/limit, i.e. by one request per
+    round of requests. A failed request (e.g. 429 or 503) or a latency spike (more than latency_tolerance times the
+    average latency of the host) multiplies the limit by decrease_factor, at most once per average latency so a burst
+    of failures of the same round counts once. All methods are thread-safe.
+    """
+
+    def __init__(
+            self,
+            max_limit: int,
+            initial_limit: Optional[int] = None,
+            min_limit: int = 1,
+            decrease_factor: float = 0.5,
+            latency_tolerance: float = 2.0,
+            on_change: Optional[Callable[[str, int, Optional[str]], None]] = None
+    ) -> None:
+        """
+        Initialize the ConcurrencyController class.
+
+        :param max_limit: The maximum number of requests in flight per host.
+        :type max_limit: int
+        :param initial_limit: The number of requests in flight per host to start with (max_limit if not given).
+        :type initial_limit: int
+        :param min_limit: The minimum number of requests in flight per host.
+        :type min_limit: int
+        :param decrease_factor: The factor the limit is multiplied by when backing off.
+        :type decrease_factor: float
+        :param latency_tolerance: The latency, relative to the average latency of the host, treated as spike.
+        :type latency_tolerance: float
+        :param on_change: Callable called with the host, the new limit and the reason of a back-off (None for an
+        increase) whenever the limit of a host changes.
+        :type on_change: Callable[[str, int, str], None]
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError('max_limit should be at least min_limit, which should be at least 1.')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor should be between 0 and 1.')
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.initial_limit = max(min_limit, min(max_limit, initial_limit or max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.on_change = on_change
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    def _get_host(self, host: str) -> HostConcurrency:
+        """
+        Get the state of the host, creating it on first use. Must be called with the condition held.
+
+        :param host: The host.
+        :type host: str
+        :return: The state of the host.
+        :rtype: HostConcurrency
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostConcurrency(self.initial_limit)
+        return state
+
+    def get_limit(self, host: str) -> int:
+        """
+        Get the number of requests currently allowed in flight to the host.
+
+        :param host: The host.
+        :type host: str
+        :return: The limit.
+        :rtype: int
+        """
+        with self._condition:
+            return int(self._get_host(host).limit)
+
+    def try_acquire(self, host: str) -> bool:
+        """
+        Start a request to the host if its limit allows it.
+
+        :param host: The host.
+        :type host: str
+        :return: True if the request may start, False otherwise.
+        :rtype: bool
+        """
+        with self._condition:
+            state = self._get_host(host)
+            if state.in_flight >= int(state.limit):
+                return False
+            state.in_flight += 1
+            return True
+
+    def acquire(self, host: str, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Wait until a request to the host may start.
+
+        :param host: The host.
+        :type host: str
+        :param cancel_event: The event which stops waiting when set.
+        :type cancel_event: threading.Event
+        :return: True if the request may start, False if the wait was cancelled.
+        :rtype: bool
+        """
+        with self._condition:
+            while not self.try_acquire(host):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self._condition.wait(0.1)
+            return True
+
+    def release(self, host: str, latency: Optional[float] = None, success: Optional[bool] = True) -> None:
+        """
+        Finish a request to the host and adapt its limit to the outcome.
+
+        :param host: The host.
+        :type host: str
+        :param latency: The time (in seconds) the request took.
+        :type latency: float
+        :param success: True if the request succeeded, False if it failed, None if it was abandoned (no adaptation).
+        :type success: bool
+        :return: None
+        """
+        with self._condition:
+            state = self._get_host(host)
+            state.in_flight -= 1
+            old_limit = int(state.limit)
+            reason = None
+
+            if success is None:
+                pass
+            elif not success:
+                reason = 'request failed'
+            elif state.latency is not None and latency is not None and latency > state.latency * self.latency_tolerance:
+                reason = f'latency {latency:.2f}s'
+
+            if reason is not None:
+                now = time.monotonic()
+                if now - state.last_decrease >= (state.latency or 0):
+                    state.limit = max(self.min_limit, state.limit * self.decrease_factor)
+                    state.last_decrease = now
+            elif success:
+                state.limit = min(self.max_limit, state.limit + 1 / state.limit)
+
+            if success and latency is not None:
+                state.latency = latency if state.latency is None else state.latency * 0.9 + latency * 0.1
+            new_limit = int(state.limit)
+            self._condition.notify_all()
+
+        if new_limit != old_limit and self.on_change is not None:
+            self.on_change(host, new_limit, reason)
@@ -0,0 +1,126 @@
+import platform
+
+
+class Constants:
+    """This class holds all the constant values used in the application"""
+
+    APP_TITLE = 'M3U8 Downloader'  # Title of the application
+    APP_VERSION = '0.1.5'  # Version of the application
+    APP_PACKAGE_NAME = 'pym3u8downloaderui'  # Package name of the application
+    APP_PACKAGE_DESCRIPTION = """
+    M3U8 Downloader UI is a Python-based graphical user interface (GUI) application designed
+    to simplify the process of downloading and concatenating video files using the
+    pym3u8downloader package. This application streamlines the task of downloading and
+    merging video files from M3U8 playlists.
+    """  # Description of the application
+    APP_WINDOW_WIDTH = 450  # Width of the application window
+    APP_WINDOW_HEIGHT = 520  # Height of the application window
+    APP_PALETTE_BACKGROUND = '#FFFFFF'  # Background color of the application
+    APP_PALETTE_FOREGROUND = '#000000'  # Foreground color of the application
+    APP_THEME = 'xpnative' if platform.system().lower() == 'windows' else 'clam'  # Theme of the application
+    APP_LABEL_FONT_TYPE = 'Segoe UI'  # Font type for labels
+    APP_LABEL_FONT_SIZE = 8  # Font size for labels
+    APP_LABEL_FONT_STYLE = 'bold'  # Font style for labels
+    APP_ROW_MIN_SIZE = 10  # Minimum size for rows
+    APP_PADDING = 10  # Padding for elements
+    APP_REFRESH_INTERVAL = 250  # Interval (in milliseconds) for refreshing the job list
+    APP_PROBE_DELAY = 500  # Delay (in milliseconds) after the last change of the input URL before it is probed
+    CLI_PROGRESS_INTERVAL = 0.5  # Interval (in seconds) for reporting progress in batch mode
+    APP_ICON_IMAGE_FILE_NAME = 'icon.png'  # File name of the icon image
+    APP_ICON_IMAGE_FILE_PATH = (
+        f'https://raw.githubusercontent.com/coldsofttech/pym3u8downloaderui/'
+        f'main/src/Resources/Images/{APP_ICON_IMAGE_FILE_NAME}'
+    )  # Full URL of the icon image file
+    APP_ICON_FILE_NAME = 'icon.ico'  # File name of the icon
+    APP_ICON_FILE_PATH = (
+        f'https://raw.githubusercontent.com/coldsofttech/pym3u8downloaderui/'
+        f'main/src/Resources/Images/{APP_ICON_FILE_NAME}'
+    )  # Full URL of the icon file
+    APP_ASSET_REFRESH_INTERVAL = 7 * 24 * 60 * 60  # Interval (in seconds) for refreshing the cached assets
+    APP_ASSET_REFRESH_TIMEOUT = 10  # Timeout (in seconds) for downloading an asset
+
+    MENU_FILE_TITLE = 'File'  # Title of the file menu
+    MENU_FILE_NEW_TITLE = 'New'  # Tile of the 'New' option in the file menu
+    MENU_FILE_OPEN_REPORT_TITLE = 'Open Latest Report'  # Title of the 'Open Latest Report' option in the file menu
+    MENU_FILE_EXIT_TITLE = 'Exit'  # Title of the 'Exit' option in the file menu
+    MENU_HELP_TITLE = 'Help'  # Title of the help menu
+    MENU_HELP_HELP_TITLE = 'Help'  # Title of the 'Help' option in the help menu
+    MENU_HELP_ABOUT_TITLE = 'About'  # Title of the 'About' option in the help menu
+
+    LABEL_INPUT_TITLE = 'Input URL (.m3u8):'  # Title for input URL label
+    LABEL_OUTPUT_TITLE = 'Output File (.mp4):'  # Title for output file label
+    LABEL_SKIP_SSL_VERIFICATION_TITLE = 'Skip SSL Verification'  # Title for skip SSL verification label
+    LABEL_LIVE_RECORDING_TITLE = 'Record Live'  # Title for live recording label
+    LABEL_MASTER_CONFIGURATION_TITLE = 'Variants:'  # Title for variants available in the master playlist
+    LABEL_JOBS_TITLE = 'Jobs:'  # Title for the download job list
+    LABEL_BANDWIDTH_LIMIT_TITLE = 'Limit (KiB/s, 0 = off):'  # Title for the bandwidth limit shared by all jobs
+
+    BUTTON_BROWSE_TITLE = '...'  # Title for browse button
+    BUTTON_DOWNLOAD_TITLE = 'Download'  # Title for download button
+    BUTTON_CANCEL_TITLE = 'Cancel'  # Title for cancel button
+
+    INVALID_INPUT_TITLE = 'Warning'  # Title for invalid input warning
+    INVALID_INPUT_MESSAGE = 'Please provide both input url and output file.'  # Message for invalid input warning
+
+    BROWSE_FILE_TYPES = [('MP4 Files', '*.mp4'), ('All files', '*.*')]  # File types for browsing
+    BROWSE_DEFAULT_EXTENSION = '.mp4'  # Default extension for browsing
+
+    DOWNLOAD_IN_PROGRESS_TITLE = 'Warning'  # Title for download in progress warning
+    # Message for download in progress warning
+    DOWNLOAD_IN_PROGRESS_MESSAGE = 'Download is in progress and cannot be interrupted!'
+    DOWNLOAD_COMPLETE_TITLE = 'Download'  # Title for download complete message
+    DOWNLOAD_COMPLETE_MESSAGE = 'Download completed successfully!'  # Message for download complete message
+    DOWNLOAD_ERROR_TITLE = 'Error'  # Title for download error message
+    DOWNLOAD_MASTER_IDENTIFIED_TITLE = 'Master Playlist'  # Title for playlist identified as master
+    DOWNLOAD_MASTER_IDENTIFIED_MESSAGE = (
+        'Identified m3u8 file as master playlist. Select appropriate configuration for download.'
+    )  # Message for playlist identified as master
+
+    NO_REPORT_TITLE = 'Report'  # Title for no profiling report message
+    NO_REPORT_MESSAGE = (
+        'No profiling report was written yet. Enable "profile" or "trace_memory" in config.json.'
+    )  # Message for no profiling report message
+
+    ABOUT_TITLE = 'About'  # Title for about window
+    ABOUT_WINDOW_WIDTH = 300  # Width of the about window
+    ABOUT_WINDOW_HEIGHT = 250  # Height of the about window
+
+    JOBS_COLUMNS = ('id', 'input', 'output', 'state')  # Column identifiers of the download job list
+    JOBS_COLUMN_TITLES = ('#', 'Input URL', 'Output File', 'State')  # Column titles of the download job list
+    JOBS_COLUMN_WIDTHS = (30, 170, 130, 90)  # Column widths of the download job list
+    JOBS_LIST_HEIGHT = 6  # Number of visible rows in the download job list
+
+    CONFIG_FILE = 'config.json'  # File name for configuration file
+    DEFAULT_MAX_CONCURRENT_JOBS = 2  # Default number of download jobs running at the same time
+    DEFAULT_MAX_THREADS = 10  # Default number of segments fetched in parallel by a single job
+    DEFAULT_MAX_CONCURRENCY = 100  # Default number of segment requests in flight for the asyncio engine
+    DEFAULT_REORDER_BUFFER_SIZE = 64 * 1024 * 1024  # Default size (in bytes) of the streaming reorder buffer
+    DEFAULT_ADAPTIVE_CONCURRENCY = True  # Adapt the segment requests in flight per host to errors and latency
+    DEFAULT_SEGMENT_TIMEOUT = 60  # Default maximum time (in seconds) of a single segment request
+    DEFAULT_MAX_RETRIES = 3  # Default number of retries of a failed segment request
+    DEFAULT_HEDGE_REQUESTS = False  # Send a duplicate request for segments slower than the observed p95 latency
+    DEFAULT_SIZE_ESTIMATE_SAMPLES = 24  # Segments whose size is requested to estimate the output size (0 for all)
+    DEFAULT_PREALLOCATE = True  # Reserve the estimated size of the output file on disk before writing it
+    DEFAULT_MEMORY_BUDGET = 0  # Default limit (in bytes) of segment content buffered by all jobs (0 for none)
+    DEFAULT_DECRYPTION_WORKERS = None  # Default number of segment decryption processes (None for the number of CPUs)
+    DEFAULT_REMUX_COMMAND = None  # Default muxer command the segments are piped into (None to concatenate them)
+    BANDWIDTH_LIMIT_INCREMENT = 256  # Step (in KiB/s) of the bandwidth limit control
+
+    PROGRESS_STAGE_STARTED = 'Downloading'  # Stage published when a download thread starts
+    METRICS_FILE_SUFFIX = '.metrics.json'  # Suffix of the transfer metrics dumped next to the output file
+    PROFILE_FILE_SUFFIX = '.prof'  # Suffix of the cProfile statistics of a profiled job, next to the output file
+    PROFILE_REPORT_SUFFIX = '.profile.txt'  # Suffix of the readable report of a profiled job, next to the output file
+    PROFILE_REPORT_LIMIT = 30  # Number of functions and allocations listed in the report of a profiled job
+
+    ENGINE_PYM3U8DOWNLOADER = 'pym3u8downloader'  # Engine downloading through pym3u8downloader's M3U8Downloader
+    ENGINE_THREADED = 'threaded'  # Engine fetching the segments through a bounded thread pool
+    ENGINE_ASYNCIO = 'asyncio'  # Engine fetching the segments from an asyncio event loop
+    ENGINES = (ENGINE_PYM3U8DOWNLOADER, ENGINE_THREADED, ENGINE_ASYNCIO)  # All supported engines
+    DEFAULT_ENGINE = ENGINE_THREADED  # Engine used when none is configured
+    PLAYLIST_CACHE_TTL = 60  # Time (in seconds) an inspected playlist is reused
+    HTTP_CACHE_FILE = 'http_cache.json'  # File name of the HTTP cache of playlists and keys, next to the config file
+    SEGMENT_CACHE_DIRECTORY = 'segments'  # Directory of the segment cache in the per-user cache directory
+    DEFAULT_SEGMENT_CACHE_SIZE = 0  # Default maximum size (in bytes) of the segment cache; 0 disables it
+
+    OUTPUT_MODE_STREAMING = 'streaming'  # Segments are appended to the output file in playlist order
+    OUTPUT_MODE_STAGED = 'staged'  # Segments are staged on disk and joined once all are downloaded
@@ -0,0 +1,262 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from pym3u8downloader import M3U8DownloaderError
+
+from .httpcache import HttpCache
+
+AES_128 = 'AES-128'  # The only segment encryption method supported
+
+
+def decrypt_aes_128(data: bytes, key: bytes, iv: bytes) -> bytes:
+    """
+    Decrypt a segment encrypted with AES-128 in CBC mode with PKCS#7 padding.
+
+    :param data: The encrypted content of the segment.
+    :type data: bytes
+    :param key: The 16-byte key.
+    :type key: bytes
+    :param iv: The 16-byte initialization vector.
+    :type iv: bytes
+    :return: The decrypted content.
+    :rtype: bytes
+    :raises ValueError: If the content is not a valid ciphertext for the key.
+    """
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    return unpadder.update(decryptor.update(data) + decryptor.finalize()) + unpadder.finalize()
+
+
+def decrypt_aes_128_file(
+        source_path: str,
+        destination_path: str,
+        key: bytes,
+        iv: bytes,
+        chunk_size: int = 1024 * 1024
+) -> int:
+    """
+    Decrypt a segment file encrypted with AES-128 in CBC mode with PKCS#7 padding into another file, in chunks, so the
+    segment is never held in memory whole.
+
+    :param source_path: The path of the encrypted segment.
+    :type source_path: str
+    :param destination_path: The path the decrypted segment is written to.
+    :type destination_path: str
+    :param key: The 16-byte key.
+    :type key: bytes
+    :param iv: The 16-byte initialization vector.
+    :type iv: bytes
+    :param chunk_size: The size of the chunks read from the encrypted segment.
+    :type chunk_size: int
+    :return: The size of the decrypted segment in bytes.
+    :rtype: int
+    :raises ValueError: If the content is not a valid ciphertext for the key.
+    """
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    size = 0
+    with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            size += destination.write(unpadder.update(decryptor.update(chunk)))
+        size += destination.write(unpadder.update(decryptor.finalize()) + unpadder.finalize())
+    return size
+
+
+class KeyCache:
+    """
+    Class for fetching the keys of encrypted segments once per download, by key URI.
+
+    Keys are revalidated against the HTTP cache (if any), like playlists, and every key is requested by a single
+    thread while the others wait for it. All methods are thread-safe.
+    """
+
+    _timeout = 30  # Timeout (in seconds) for downloading a key
+
+    def __init__(self, http_cache: Optional[HttpCache] = None) -> None:
+        """
+        Initialize the KeyCache class.
+
+        :param http_cache: The cache the keys are revalidated against (always fetched in full if not given).
+        :type http_cache: HttpCache
+        """
+        self.http_cache = http_cache
+        self._keys = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, uri: str, session) -> bytes:
+        """
+        Get the key from the given URI, fetching it on first use.
+
+        :param uri: The absolute URL of the key.
+        :type uri: str
+        :param session: The HTTP session used to fetch the key.
+        :type session: requests.Session
+        :return: The 16-byte key.
+        :rtype: bytes
+        :raises M3U8DownloaderError: If the key cannot be downloaded or is not a 16-byte key.
+        """
+        with self._lock:
+            key = self._keys.get(uri)
+            if key is not None:
+                return key
+            lock = self._locks.setdefault(uri, threading.Lock())
+
+        with lock:
+            with self._lock:
+                key = self._keys.get(uri)
+            if key is None:
+                key = self._fetch(uri, session)
+                with self._lock:
+                    self._keys[uri] = key
+        return key
+
+    def _fetch(self, uri: str, session) -> bytes:
+        """
+        Fetch the key from the given URI.
+
+        :param uri: The absolute URL of the key.
+        :type uri: str
+        :param session: The HTTP session used to fetch the key.
+        :type session: requests.Session
+        :return: The 16-byte key.
+        :rtype: bytes
+        """
+        import requests
+
+        headers = self.http_cache.get_headers(uri) if self.http_cache is not None else {}
+        try:
+            response = session.get(uri, headers=headers, timeout=self._timeout)
+            if self.http_cache is not None:
+                key = self.http_cache.resolve(uri, response)[0]
+            else:
+                response.raise_for_status()
+                key = response.content
+        except requests.RequestException as e:
+            raise M3U8DownloaderError(message=f'Unable to download key "{uri.split("/")[-1]}".') from e
+
+        if len(key) != 16:
+            raise M3U8DownloaderError(message=f'Key "{uri.split("/")[-1]}" is not a 128-bit key.')
+        return key
+
+
+class SegmentDecryptor:
+    """
+    Class for decrypting segments in a pool of worker processes, so decryption scales across cores instead of
+    competing with the download threads for the GIL. With no worker processes, segments are decrypted by the calling
+    thread.
+
+    The pool is started on first use and can be shared by all download jobs. Worker processes are spawned rather than
+    forked, since the application forks from a process running many threads. If the worker processes cannot be
+    started (e.g. in an embedded interpreter), segments are decrypted in the calling thread from then on.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Initialize the SegmentDecryptor class.
+
+        :param max_workers: The number of worker processes (the number of CPUs if not given, 0 to decrypt in the
+        calling thread).
+        :type max_workers: int
+        """
+        if max_workers is not None and max_workers < 0:
+            raise ValueError('max_workers should not be negative.')
+
+        self.max_workers = max_workers
+        self._executor = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Get the pool of worker processes, starting it on first use.
+
+        :return: The pool, or None if segments are decrypted in the calling thread.
+        :rtype: ProcessPoolExecutor
+        """
+        if self.max_workers == 0 or self._broken:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def decrypt_file(self, source_path: str, destination_path: str, key: bytes, iv: bytes) -> int:
+        """
+        Decrypt an AES-128 encrypted segment file into another file, waiting for a worker process. Only the paths
+        are passed to the worker process, never the content.
+
+        :param source_path: The path of the encrypted segment.
+        :type source_path: str
+        :param destination_path: The path the decrypted segment is written to.
+        :type destination_path: str
+        :param key: The 16-byte key.
+        :type key: bytes
+        :param iv: The 16-byte initialization vector.
+        :type iv: bytes
+        :return: The size of the decrypted segment in bytes.
+        :rtype: int
+        :raises ValueError: If the content is not a valid ciphertext for the key.
+        """
+        source_path, destination_path = os.path.abspath(source_path), os.path.abspath(destination_path)
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(decrypt_aes_128_file, source_path, destination_path, key, iv).result()
+            except BrokenProcessPool:
+                self._break()
+        return decrypt_aes_128_file(source_path, destination_path, key, iv)
+
+    async def decrypt_file_async(self, source_path: str, destination_path: str, key: bytes, iv: bytes) -> int:
+        """
+        Decrypt an AES-128 encrypted segment file into another file without blocking the event loop.
+
+        :param source_path: The path of the encrypted segment.
+        :type source_path: str
+        :param destination_path: The path the decrypted segment is written to.
+        :type destination_path: str
+        :param key: The 16-byte key.
+        :type key: bytes
+        :param iv: The 16-byte initialization vector.
+        :type iv: bytes
+        :return: The size of the decrypted segment in bytes.
+        :rtype: int
+        :raises ValueError: If the content is not a valid ciphertext for the key.
+        """
+        source_path, destination_path = os.path.abspath(source_path), os.path.abspath(destination_path)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return await loop.run_in_executor(
+                    executor, decrypt_aes_128_file, source_path, destination_path, key, iv
+                )
+            except BrokenProcessPool:
+                self._break()
+        return await loop.run_in_executor(None, decrypt_aes_128_file, source_path, destination_path, key, iv)
+
+    def _break(self) -> None:
+        """Stop using the worker processes after they failed."""
+        self._broken = True
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes (if started); they are started again on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,2031 @@
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import BinaryIO, Optional
+from urllib.parse import urlparse
+
+from pym3u8downloader import M3U8DownloaderError, M3U8DownloaderWarning
+
+from .asynchttp import AsyncHTTPConnectionPool
+from .checkpoint import SegmentCheckpoint
+from .concurrency import ConcurrencyController
+from .constants import Constants
+from .decryption import AES_128, KeyCache, decrypt_aes_128_file
+from .inspector import PlaylistInspector
+from .metrics import TransferMetrics
+from .playlist import MasterPlaylist, MediaPlaylist, Segment, Variant
+from .remux import MuxerPipe, get_muxer_arguments
+from .writer import SegmentReceiver, StreamingSegmentWriter, copy_file
+
+
+class DownloadCancelledError(M3U8DownloaderError):
+    """An exception raised when a download is cancelled through the cancel method of the downloader."""
+
+    def __init__(self) -> None:
+        """Initialize a new instance of DownloadCancelledError."""
+        super().__init__(message='Download cancelled.')
+
+
+class SegmentDownloader:
+    """
+    Class for downloading M3U8 playlists by fetching the media segments through a bounded thread pool.
+
+    It is a drop-in alternative for pym3u8downloader's M3U8Downloader: it accepts the same settings and exposes
+    the same download_playlist and download_master_playlist methods, raising the same errors and warnings. The
+    download_variant method downloads a variant selected from an inspected master playlist without fetching the
+    master playlist again.
+
+    Segments are either appended to the output file in playlist order as they arrive (streaming), holding
+    out-of-order segments in a bounded reorder buffer, or staged on disk and joined once all are present (staged).
+    Progress is reported to the on_progress callable (stage, completed, total, message) when set, or written to the
+    standard output otherwise. Transfer metrics are collected in the metrics attribute, a TransferMetrics instance
+    which can be replaced before the download starts. Playlists are fetched through the inspector attribute, which can
+    be replaced by a caching PlaylistInspector shared with whoever already inspected the playlist. Segment bodies are
+    throttled by the bandwidth_limiter attribute, a BandwidthLimiter shared between jobs, when set. Segments are
+    served from and stored in the segment_cache attribute, a SegmentCache shared between jobs, when set. Given a
+    remux command, the ordered segments are piped into that muxer process, which writes the output file itself.
+    """
+
+    OUTPUT_MODE_STREAMING = Constants.OUTPUT_MODE_STREAMING  # Segments are appended to the output file in order
+    OUTPUT_MODE_STAGED = Constants.OUTPUT_MODE_STAGED  # Segments are staged on disk and joined at the end
+    OUTPUT_MODES = (OUTPUT_MODE_STREAMING, OUTPUT_MODE_STAGED)  # All supported output modes
+
+    _chunk_size = 64 * 1024  # Size of the chunks segment bodies are streamed in
+    _copy_buffer_size = 1024 * 1024  # Size of the chunks copied when joining the segments
+    _timeout = 30  # Timeout (in seconds) of a single HTTP request
+    _initial_concurrency = 4  # Segment requests in flight per host to start with when adapting the concurrency
+    _retry_status_codes = (408, 425, 429, 500, 502, 503, 504)  # HTTP status codes of segment requests worth retrying
+    _backoff_base = 0.5  # Maximum delay (in seconds) before the first retry of a segment
+    _backoff_cap = 10  # Maximum delay (in seconds) before any retry of a segment
+    _hedge_min_samples = 20  # Segments observed before their p95 latency is used to hedge requests
+    _live_min_poll_interval = 0.5  # Minimum time (in seconds) between two reloads of a live playlist
+
+    def __init__(
+            self,
+            input_file_path: str,
+            output_file_path: str,
+            skip_space_check: Optional[bool] = False,
+            debug: Optional[bool] = False,
+            debug_file_path: Optional[str] = 'debug.log',
+            max_threads: Optional[int] = 10,
+            verify_ssl: Optional[bool] = True,
+            output_mode: Optional[str] = OUTPUT_MODE_STREAMING,
+            reorder_buffer_size: Optional[int] = 64 * 1024 * 1024,
+            adaptive_concurrency: Optional[bool] = False,
+            segment_timeout: Optional[float] = 60,
+            max_retries: Optional[int] = 3,
+            hedge_requests: Optional[bool] = False,
+            live: Optional[bool] = False,
+            live_max_duration: Optional[float] = None,
+            size_estimate_samples: Optional[int] = 24,
+            preallocate: Optional[bool] = False,
+            remux_command: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the SegmentDownloader class.
+
+        :param input_file_path: The URL of the M3U8 playlist.
+        :type input_file_path: str
+        :param output_file_path: The path to the output video file.
+        :type output_file_path: str
+        :param skip_space_check: A flag indicating whether to skip disk space checking.
+        :type skip_space_check: bool
+        :param debug: A flag indicating whether debug mode is enabled.
+        :type debug: bool
+        :param debug_file_path: The file path for storing debug logs.
+        :type debug_file_path: str
+        :param max_threads: The maximum number of segments fetched in parallel.
+        :type max_threads: int
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param output_mode: How segments are written to the output file (one of OUTPUT_MODES).
+        :type output_mode: str
+        :param reorder_buffer_size: The maximum number of bytes held for out-of-order segments in streaming mode.
+        :type reorder_buffer_size: int
+        :param adaptive_concurrency: A flag to adapt the segment requests in flight per host (up to max_threads) to
+        the observed errors and latency.
+        :type adaptive_concurrency: bool
+        :param segment_timeout: The maximum time (in seconds) a single request of a segment may take.
+        :type segment_timeout: float
+        :param max_retries: The maximum number of retries of a failed segment request.
+        :type max_retries: int
+        :param hedge_requests: A flag to send a duplicate request for segments slower than the observed p95 latency.
+        :type hedge_requests: bool
+        :param live: A flag to record live and event playlists until they end, instead of downloading the segments
+        listed when the download starts.
+        :type live: bool
+        :param live_max_duration: The maximum duration (in seconds) of media recorded from a live playlist.
+        :type live_max_duration: float
+        :param size_estimate_samples: The number of segments, spread evenly over the playlist, whose size is requested
+        to estimate the output size, extrapolated by duration (0 requests the size of every segment).
+        :type size_estimate_samples: int
+        :param preallocate: A flag to reserve the estimated size of the output file on disk before writing it.
+        :type preallocate: bool
+        :param remux_command: The command of a local muxer reading the segments from its standard input and writing
+        the output file given by the {output} placeholder (the segments are concatenated into the output file if not
+        given).
+        :type remux_command: str
+        """
+        if max_threads < 1:
+            raise ValueError('max_threads should be at least 1.')
+        if segment_timeout <= 0:
+            raise ValueError('segment_timeout should be positive.')
+        if max_retries < 0:
+            raise ValueError('max_retries should not be negative.')
+        if live_max_duration is not None and live_max_duration <= 0:
+            raise ValueError('live_max_duration should be positive.')
+        if output_mode not in self.OUTPUT_MODES:
+            raise ValueError(f'output_mode should be one of {", ".join(self.OUTPUT_MODES)}.')
+        if reorder_buffer_size < 0:
+            raise ValueError('reorder_buffer_size should not be negative.')
+        if size_estimate_samples < 0:
+            raise ValueError('size_estimate_samples should not be negative.')
+        if remux_command:
+            get_muxer_arguments(remux_command, output_file_path)
+
+        self.input_file_path = input_file_path
+        self.output_file_path = output_file_path if output_file_path.endswith('.mp4') else f'{output_file_path}.mp4'
+        self.skip_space_check = skip_space_check
+        self.debug = debug
+        self.debug_file_path = debug_file_path
+        self.max_threads = max_threads
+        self.verify_ssl = verify_ssl
+        self.output_mode = output_mode
+        self.reorder_buffer_size = reorder_buffer_size
+        self.adaptive_concurrency = adaptive_concurrency
+        self.segment_timeout = segment_timeout
+        self.max_retries = max_retries
+        self.hedge_requests = hedge_requests
+        self.live = live
+        self.live_max_duration = live_max_duration
+        self.size_estimate_samples = size_estimate_samples
+        self.preallocate = preallocate
+        self.remux_command = remux_command or None
+        self.is_download_complete = False
+        self.merge_throughput = None
+        self.on_progress = None
+        self.metrics = TransferMetrics()
+        self.inspector = PlaylistInspector(ttl=0)
+        self.bandwidth_limiter = None
+        self.memory_budget = None
+        self.segment_cache = None
+        self.decryptor = None
+        self.key_cache = None
+        self._session = None
+        self._checkpoint = None
+        self._writer = None
+        self._concurrency = None
+        self._executor = None
+        self._hedge_executor = None
+        self._held = {}  # Bytes of segment content buffered by segment index
+        self._held_size = 0
+        self._cancel_event = threading.Event()
+        self._bandwidth_lock = threading.Lock()
+        self._throttled_until = 0.0  # Time (monotonic) until which the last bandwidth reservation waits
+        self._memory_lock = threading.Lock()
+        self._logger = self._configure_debug_logger()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        Getter property for the cancellation status.
+
+        :return: True if the download was cancelled, False otherwise.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """
+        Request the download to stop. Segments in flight are abandoned at their next chunk and
+        the download method raises DownloadCancelledError.
+        """
+        self._cancel_event.set()
+
+    def _raise_if_cancelled(self) -> None:
+        """Raise DownloadCancelledError if the download was cancelled."""
+        if self._cancel_event.is_set():
+            raise DownloadCancelledError()
+
+    @property
+    def parts_directory_path(self) -> str:
+        """
+        Getter property for the directory the segments are staged in before they are joined.
+
+        :return: The path of the staging directory.
+        :rtype: str
+        """
+        return f'{self.output_file_path}.parts'
+
+    @property
+    def checkpoint_file_path(self) -> str:
+        """
+        Getter property for the manifest recording the finished segments, used to resume interrupted downloads.
+
+        :return: The path of the manifest.
+        :rtype: str
+        """
+        return f'{self.output_file_path}.checkpoint'
+
+    def _configure_debug_logger(self) -> logging.Logger:
+        """
+        Configure the logger for debugging purposes.
+
+        :return: The debug logger.
+        :rtype: logging.Logger
+        """
+        logger = logging.Logger(__name__)
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+            handler = logging.FileHandler(self.debug_file_path)
+            handler.setFormatter(logging.Formatter('%(asctime)s :: %(threadName)s :: %(message)s'))
+            logger.addHandler(handler)
+        else:
+            logger.addHandler(logging.NullHandler())
+        return logger
+
+    def _get_session(self):
+        """
+        Get the HTTP session shared by all requests of this downloader, sized for the thread pool.
+
+        :return: The HTTP session.
+        :rtype: requests.Session
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.verify = self.verify_ssl
+            adapter = HTTPAdapter(pool_connections=self.max_threads, pool_maxsize=self.max_threads)
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+            if not self.verify_ssl:
+                import urllib3
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        return self._session
+
+    def _close_session(self) -> None:
+        """Close the HTTP session (if opened) and the debug log."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        for handler in self._logger.handlers:
+            handler.close()
+
+    def _validate(self) -> None:
+        """Validate the input URL before starting the download process."""
+        parsed_url = urlparse(self.input_file_path)
+        if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+            raise ValueError('input_file_path is not a valid url.')
+
+    def _fetch_playlist(self, url: str):
+        """
+        Fetch and parse the playlist from the given URL, through the playlist inspector.
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :return: The parsed playlist.
+        :rtype: MediaPlaylist | MasterPlaylist
+        """
+        try:
+            return self.inspector.inspect(url, self.verify_ssl, self._get_session())
+        except M3U8DownloaderError as e:
+            self._logger.debug(f'Index file download failed. {e.__cause__ or e.message}')
+            raise
+
+    def _get_content_length(self, segment: Segment) -> int:
+        """
+        Get the size of the segment as reported by the server.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :return: The size of the segment in bytes, or 0 if unknown.
+        :rtype: int
+        """
+        import requests
+
+        try:
+            response = self._get_session().head(segment.uri, allow_redirects=True, timeout=self._timeout)
+            if response.status_code == 200:
+                return int(response.headers.get('Content-Length', 0))
+        except (requests.RequestException, ValueError):
+            pass
+        return 0
+
+    def _estimate_size(self, segments: list) -> int:
+        """
+        Estimate the total size of the segments from the sizes reported by the server, requested in parallel.
+
+        With size_estimate_samples set, only that many segments spread evenly over the list are requested and the
+        total is extrapolated from their size per second of media (or their average size if durations are unknown).
+
+        :param segments: The segments.
+        :type segments: list[Segment]
+        :return: The estimated size in bytes, or 0 if unknown.
+        :rtype: int
+        """
+        samples = segments
+        if 0 < self.size_estimate_samples < len(segments):
+            step = len(segments) / self.size_estimate_samples
+            samples = [segments[int(i * step)] for i in range(self.size_estimate_samples)]
+
+        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+            sizes = list(executor.map(self._get_content_length, samples))
+        if samples is segments:
+            estimated_size = sum(sizes)
+        else:
+            known = [(segment, size) for segment, size in zip(samples, sizes) if size]
+            if not known:
+                return 0
+            sampled_size = sum(size for _, size in known)
+            sampled_duration = sum(segment.duration for segment, _ in known)
+            total_duration = sum(segment.duration for segment in segments)
+            if sampled_duration > 0 and total_duration > 0:
+                estimated_size = int(sampled_size * total_duration / sampled_duration)
+            else:
+                estimated_size = sampled_size * len(segments) // len(known)
+
+        self._logger.debug(f'Estimated size: {estimated_size} bytes ({len(samples)} of {len(segments)} segments)')
+        return estimated_size
+
+    def _check_required_disk_space(self, pending_size: int, staged_size: int = 0, copies: int = 2) -> None:
+        """
+        Check if the disk space required for staging and joining the segments is available.
+
+        :param pending_size: The (estimated) size of the segments still to be downloaded.
+        :type pending_size: int
+        :param staged_size: The size of the segments already staged by an interrupted run.
+        :type staged_size: int
+        :param copies: The number of copies of every pending segment kept on disk.
+        :type copies: int
+        """
+        required_size = copies * pending_size + staged_size
+        self._logger.debug(f'Required space: {required_size}')
+
+        output_directory = os.path.dirname(os.path.abspath(self.output_file_path))
+        if shutil.disk_usage(output_directory).free < required_size:
+            raise OSError(f'Path "{self.output_file_path}" is low on storage. Required: {required_size} bytes.')
+
+    def _preallocate(self, output_file: BinaryIO, size: int) -> None:
+        """
+        Reserve disk space for the given number of bytes after the current position of the output file, so the
+        file is laid out contiguously instead of growing in fragments. The file is extended accordingly and must be
+        truncated to its final size once written. Does nothing if preallocation is disabled or not supported, or if
+        the output is piped into a muxer.
+
+        :param output_file: The output file.
+        :type output_file: BinaryIO
+        :param size: The number of bytes to reserve.
+        :type size: int
+        """
+        if not self.preallocate or self.remux_command or size <= 0 or not hasattr(os, 'posix_fallocate'):
+            return
+
+        try:
+            os.posix_fallocate(output_file.fileno(), output_file.tell(), size)
+        except OSError as e:
+            self._logger.debug(f'Preallocation of {size} bytes failed. {e}')
+
+    def _download_segment(self, segment: Segment) -> int:
+        """
+        Download the segment into its part file and append it to the output file (streaming) or keep it there until
+        all segments are joined (staged).
+
+        :param segment: The segment to be downloaded.
+        :type segment: Segment
+        :return: The size of the segment in bytes.
+        :rtype: int
+        """
+        self._raise_if_cancelled()
+        start_time = time.perf_counter()
+        part_file_path = self._get_part_file_path(segment)
+        received_file_path = self._get_received_file_path(segment)
+        size = self._fetch_segment(segment, received_file_path)
+        self.metrics.record_segment(size, time.perf_counter() - start_time)
+        if segment.key is not None:
+            size = self._decrypt_segment(segment, received_file_path, part_file_path)
+        self._store_segment(segment, part_file_path, size)
+        return size
+
+    def _get_received_file_path(self, segment: Segment) -> str:
+        """
+        Get the path the segment is received at: its part file, or a file next to it when the segment is encrypted
+        and still needs to be decrypted into the part file.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :return: The path of the received segment.
+        :rtype: str
+        """
+        part_file_path = self._get_part_file_path(segment)
+        return part_file_path if segment.key is None else f'{part_file_path}.encrypted'
+
+    def _store_segment(self, segment: Segment, part_file_path: str, size: int) -> None:
+        """
+        Hand the segment over to the streaming writer, waiting for space in the reorder buffer if needed, or record
+        it as staged.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param part_file_path: The path of the part file holding the content of the segment.
+        :type part_file_path: str
+        :param size: The size of the segment in bytes.
+        :type size: int
+        """
+        if self._writer is not None:
+            self._writer.write(segment.index, part_file_path)
+        else:
+            self._segment_downloaded(segment, size)
+
+    def _get_segment_key(self, segment: Segment) -> bytes:
+        """
+        Get the key the segment is encrypted with, from the key cache.
+
+        :param segment: The encrypted segment.
+        :type segment: Segment
+        :return: The 16-byte key.
+        :rtype: bytes
+        :raises M3U8DownloaderError: If the encryption method is not supported or the key cannot be downloaded.
+        """
+        if segment.key.method != AES_128 or not segment.key.uri:
+            raise M3U8DownloaderError(
+                message=f'Encryption method "{segment.key.method}" of segment "{segment.uri.split("/")[-1]}" '
+                        f'is not supported.'
+            )
+        if self.key_cache is None:
+            self.key_cache = KeyCache(getattr(self.inspector, 'http_cache', None))
+        return self.key_cache.get(segment.key.uri, self._get_session())
+
+    def _decrypt_segment(self, segment: Segment, source_path: str, destination_path: str) -> int:
+        """
+        Decrypt the received encrypted segment into its part file through the decryptor (if any), or on this thread
+        otherwise, and delete the encrypted file.
+
+        :param segment: The encrypted segment.
+        :type segment: Segment
+        :param source_path: The path of the encrypted segment.
+        :type source_path: str
+        :param destination_path: The path the decrypted segment is written to.
+        :type destination_path: str
+        :return: The size of the decrypted segment in bytes.
+        :rtype: int
+        :raises M3U8DownloaderError: If the segment cannot be decrypted.
+        """
+        key = self._get_segment_key(segment)
+        try:
+            if self.decryptor is None:
+                return decrypt_aes_128_file(source_path, destination_path, key, segment.iv)
+            return self.decryptor.decrypt_file(source_path, destination_path, key, segment.iv)
+        except ValueError as e:
+            raise M3U8DownloaderError(
+                message=f'Segment "{segment.uri.split("/")[-1]}" could not be decrypted. {e}'
+            ) from e
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(source_path)
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """
+        Check if a failed segment request is worth retrying: network errors, timeouts and the HTTP status codes
+        signalling a temporary condition.
+
+        :param error: The error of the request.
+        :type error: Exception
+        :return: True if the request should be retried, False otherwise.
+        :rtype: bool
+        """
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        if status is None:
+            status = getattr(error, 'status', None)
+        return status is None or status in self._retry_status_codes
+
+    def _get_backoff_delay(self, attempt: int) -> float:
+        """
+        Get the time to wait before the given retry: exponential backoff with full jitter.
+
+        :param attempt: The number of the retry (starting from 1).
+        :type attempt: int
+        :return: The delay in seconds.
+        :rtype: float
+        """
+        return random.uniform(0, min(self._backoff_cap, self._backoff_base * 2 ** (attempt - 1)))
+
+    def _get_hedge_delay(self) -> Optional[float]:
+        """
+        Get the time after which a duplicate request is sent for a segment still in flight: the observed p95 latency.
+
+        :return: The delay in seconds, or None if hedging is disabled or too few segments were observed yet.
+        :rtype: float
+        """
+        if not self.hedge_requests or sum(self.metrics.latency_counts) < self._hedge_min_samples:
+            return None
+        delay = self.metrics.get_latency_percentile(95)
+        return None if delay is None or delay == float('inf') else delay
+
+    def _segment_failed(self, segment: Segment, attempt: int, error: Exception) -> None:
+        """
+        Handle a failed request of the segment: raise the error if it is not temporary, an M3U8DownloaderError if the
+        retries are exhausted, otherwise record the retry.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param attempt: The number of the failed attempt (starting from 1).
+        :type attempt: int
+        :param error: The error of the request.
+        :type error: Exception
+        """
+        if not self._is_retryable(error):
+            raise error
+        if attempt > self.max_retries:
+            raise M3U8DownloaderError(
+                message=f'Segment "{segment.uri.split("/")[-1]}" failed after {attempt} attempt(s): {error}'
+            ) from error
+        self.metrics.record_retry()
+        self._logger.debug(f'{segment.uri} attempt {attempt} failed, retrying. {error}')
+
+    def _get_cache_headers(self, segment: Segment) -> Optional[dict]:
+        """
+        Get the conditional request headers revalidating the copy of the segment in the segment cache (if any).
+
+        :param segment: The segment.
+        :type segment: Segment
+        :return: The If-None-Match and If-Modified-Since headers (empty if the segment was cached without
+        validators), or None if the segment is not cached.
+        :rtype: dict
+        """
+        cache = self.segment_cache
+        if cache is None:
+            return None
+        return cache.get_headers(segment.uri)
+
+    def _get_cached_segment(self, segment: Segment, file_path: str) -> Optional[int]:
+        """
+        Copy the content of the segment from the segment cache (if any) to the given file.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :return: The size of the segment in bytes, or None if it is not cached.
+        :rtype: int
+        """
+        cache = self.segment_cache
+        if cache is None or not cache.enabled:
+            return None
+        size = cache.get(segment.uri, file_path)
+        if size is not None:
+            if self._writer is not None:
+                self._hold_memory(segment, size, wait=False)
+            self.metrics.record_cache_hit(size)
+            self._logger.debug(f'{segment.uri} served from the segment cache ({size} bytes)')
+        return size
+
+    def _cache_segment(self, segment: Segment, file_path: str, validators: dict) -> None:
+        """
+        Count the segment fetched in full as a miss of the segment cache (if any) and store a copy in it.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param file_path: The path of the file holding the content of the segment.
+        :type file_path: str
+        :param validators: The etag and last_modified validators of the response.
+        :type validators: dict
+        """
+        cache = self.segment_cache
+        if cache is not None and cache.enabled:
+            cache.record_miss()
+            self.metrics.record_cache_miss()
+            cache.put(segment.uri, file_path, **validators)
+
+    def _fetch_segment(self, segment: Segment, file_path: str) -> int:
+        """
+        Fetch the content of the segment into the given file from the segment cache or the network, retrying failed
+        requests with jittered exponential backoff. A cached segment is revalidated with a conditional request and
+        served from the cache only if it did not change (or if it was cached without validators).
+
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :return: The size of the segment in bytes.
+        :rtype: int
+        """
+        headers = self._get_cache_headers(segment)
+        if headers == {}:  # Cached without validators, so there is nothing to revalidate it with
+            size = self._get_cached_segment(segment, file_path)
+            if size is not None:
+                return size
+            headers = None
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self._request_slot(segment.uri) as timings:
+                    size, validators = self._fetch_segment_hedged(segment, file_path, timings, headers)
+                if validators is None:  # Not modified since it was cached
+                    size = self._get_cached_segment(segment, file_path)
+                    if size is not None:
+                        return size
+                    headers = None  # The cached copy is gone or damaged: fetch it in full
+                    continue
+            except OSError as e:
+                self._segment_failed(segment, attempt, e)
+            else:
+                self._cache_segment(segment, file_path, validators)
+                return size
+            if self._cancel_event.wait(self._get_backoff_delay(attempt)):
+                raise DownloadCancelledError()
+
+    def _fetch_segment_hedged(
+            self,
+            segment: Segment,
+            file_path: str,
+            timings: Optional[list] = None,
+            headers: Optional[dict] = None
+    ) -> tuple:
+        """
+        Fetch the content of the segment, sending a duplicate request once the first one takes longer than the
+        observed p95 latency and keeping whichever finishes first.
+
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :param timings: The list the time (in seconds) until the response headers of each request is appended to.
+        :type timings: list[float]
+        :param headers: The conditional request headers revalidating the cached copy of the segment.
+        :type headers: dict
+        :return: The size of the segment in bytes and the validators of the response (both None if not modified).
+        :rtype: tuple[int, dict]
+        """
+        delay = self._get_hedge_delay()
+        if delay is None or self._hedge_executor is None:
+            return self._fetch_segment_once(segment, file_path, None, timings, headers)
+
+        abandoned = threading.Event()
+        arguments = (segment, file_path, abandoned, timings, headers)
+        futures = [self._hedge_executor.submit(self._fetch_segment_once, *arguments)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            self.metrics.record_hedge()
+            self._logger.debug(f'{segment.uri} slower than {delay}s, sending a hedged request')
+            futures.append(self._hedge_executor.submit(self._fetch_segment_once, *arguments))
+
+        try:
+            error = None
+            for future in as_completed(futures):
+                try:
+                    return future.result()
+                except OSError as e:
+                    error = e
+            raise error
+        finally:
+            abandoned.set()
+
+    def _fetch_segment_once(
+            self,
+            segment: Segment,
+            file_path: str,
+            abandoned: Optional[threading.Event] = None,
+            timings: Optional[list] = None,
+            headers: Optional[dict] = None
+    ) -> tuple:
+        """
+        Fetch the content of the segment with a single request, within the segment timeout. The content is received
+        in chunks straight into the file. When streaming, its size is reserved from the memory budget first, since it
+        stays buffered until all preceding segments are written.
+
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :param abandoned: The event which stops the request when set (a duplicate request finished first).
+        :type abandoned: threading.Event
+        :param timings: The list the time (in seconds) until the response headers arrived is appended to.
+        :type timings: list[float]
+        :param headers: The conditional request headers revalidating the cached copy of the segment.
+        :type headers: dict
+        :return: The size of the segment in bytes (None if abandoned or not modified) and the validators of the
+        response (None if not modified).
+        :rtype: tuple[int, dict]
+        """
+        deadline = time.perf_counter() + self.segment_timeout
+        timeout = min(self._timeout, self.segment_timeout)
+        buffered = self._writer is not None
+        receiver = SegmentReceiver(file_path)
+        held = 0
+        try:
+            request_start = time.perf_counter()
+            with self._get_session().get(segment.uri, stream=True, timeout=timeout, headers=headers) as response:
+                if timings is not None:
+                    timings.append(time.perf_counter() - request_start)
+                if headers and response.status_code == 304:
+                    receiver.discard()
+                    return None, None
+                response.raise_for_status()
+                if buffered:
+                    held = self._parse_content_length(response.headers.get('Content-Length'))
+                    wait_start = time.perf_counter()
+                    self._hold_memory(segment, held)
+                    deadline += time.perf_counter() - wait_start  # Waiting for the budget is not part of the timeout
+                for chunk in response.iter_content(chunk_size=self._chunk_size):
+                    self._raise_if_cancelled()
+                    if abandoned is not None and abandoned.is_set():
+                        receiver.discard()
+                        self._release_memory(segment.index, held)
+                        return None, {}
+                    if time.perf_counter() > deadline:
+                        raise TimeoutError(f'Segment not downloaded within {self.segment_timeout}s.')
+                    receiver.write(chunk)
+                    if buffered and receiver.size > held:
+                        self._hold_memory(segment, receiver.size - held, wait=False)  # Content-Length was missing
+                        held = receiver.size
+                    self._throttle(len(chunk))
+                validators = {
+                    'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')
+                }
+            return receiver.commit(), validators
+        except BaseException:
+            receiver.discard()
+            self._release_memory(segment.index, held)
+            raise
+
+    @staticmethod
+    def _parse_content_length(value: Optional[str]) -> int:
+        """
+        Parse the Content-Length header of a response.
+
+        :param value: The value of the header.
+        :type value: str
+        :return: The size in bytes, or 0 if unknown.
+        :rtype: int
+        """
+        try:
+            return max(0, int(value or 0))
+        except ValueError:
+            return 0
+
+    def _may_overdraw_memory(self, segment: Segment) -> bool:
+        """
+        Check if the segment may be buffered regardless of the memory budget: the streaming writer waits for it
+        to write the segments it buffered, so it must not wait for them to be released.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :return: True if the budget may be exceeded, False otherwise.
+        :rtype: bool
+        """
+        writer = self._writer
+        return writer is not None and writer.next_index >= segment.index
+
+    def _hold_memory(self, segment: Segment, size: int, wait: bool = True) -> None:
+        """
+        Reserve the given number of bytes of the segment from the memory budget (if any), waiting until the budget
+        allows it unless told otherwise, and record the memory held by this downloader.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param size: The number of bytes.
+        :type size: int
+        :param wait: A flag to wait for the budget; False reserves the bytes regardless of the budget.
+        :type wait: bool
+        """
+        if not size:
+            return
+        budget = self.memory_budget
+        if budget is not None:
+            if not wait:
+                budget.try_acquire(size, overdraw=True)
+            elif not budget.acquire(size, self._cancel_event, lambda: self._may_overdraw_memory(segment)):
+                raise DownloadCancelledError()
+        self._record_held_memory(segment, size)
+
+    def _record_held_memory(self, segment: Segment, size: int) -> None:
+        """
+        Record the given number of bytes of the segment as buffered.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param size: The number of bytes.
+        :type size: int
+        """
+        with self._memory_lock:
+            self._held[segment.index] = self._held.get(segment.index, 0) + size
+            self._held_size += size
+            held_size = self._held_size
+        self.metrics.record_buffered(held_size)
+
+    def _release_memory(self, index: int, size: Optional[int] = None) -> None:
+        """
+        Release the bytes of the segment buffered.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param size: The number of bytes (all bytes of the segment if not given).
+        :type size: int
+        """
+        with self._memory_lock:
+            held = self._held.get(index, 0)
+            size = held if size is None else min(size, held)
+            if not size:
+                return
+            if size == held:
+                del self._held[index]
+            else:
+                self._held[index] = held - size
+            self._held_size -= size
+        if self.memory_budget is not None:
+            self.memory_budget.release(size)
+
+    def _release_all_memory(self) -> None:
+        """Release the bytes of all segments buffered, e.g. segments in flight when the download failed."""
+        for index in list(self._held):
+            self._release_memory(index)
+
+    def _create_concurrency_controller(self, max_limit: int) -> Optional[ConcurrencyController]:
+        """
+        Create the controller adapting the segment requests in flight, if adaptive concurrency is enabled.
+
+        :param max_limit: The maximum number of segment requests in flight per host.
+        :type max_limit: int
+        :return: The controller, or None if adaptive concurrency is disabled.
+        :rtype: ConcurrencyController
+        """
+        if not self.adaptive_concurrency:
+            return None
+        controller = ConcurrencyController(
+            max_limit, min(self._initial_concurrency, max_limit), on_change=self._concurrency_changed
+        )
+        self.metrics.record_concurrency(controller.initial_limit)
+        return controller
+
+    def _concurrency_changed(self, host: str, limit: int, reason: Optional[str]) -> None:
+        """
+        Record a decision of the concurrency controller, reporting back-offs as progress messages.
+
+        :param host: The host the decision applies to.
+        :type host: str
+        :param limit: The new number of segment requests in flight allowed to the host.
+        :type limit: int
+        :param reason: The reason of a back-off, or None for an increase.
+        :type reason: str
+        """
+        self.metrics.record_concurrency(limit)
+        self._logger.debug(f'Concurrency for {host}: {limit} ({reason or "increase"})')
+        if reason is not None:
+            self._write_message('Download', f'Backing off {host} to {limit} requests in flight ({reason})')
+
+    @contextlib.contextmanager
+    def _request_slot(self, uri: str):
+        """
+        Context manager holding one of the request slots of the host of the URL while the segment is fetched, and
+        reporting the outcome to the concurrency controller (if any). It yields the list the requests append the time
+        until their response headers to: the latency reported is the fastest of these, so waiting for the bandwidth
+        limiter, the memory budget or a hedged request does not count as a slow host.
+
+        :param uri: The URL of the segment.
+        :type uri: str
+        """
+        timings = []
+        controller = self._concurrency
+        if controller is None:
+            yield timings
+            return
+
+        host = urlparse(uri).netloc
+        if not controller.acquire(host, self._cancel_event):
+            raise DownloadCancelledError()
+        start_time = time.perf_counter()
+        success = None
+        try:
+            yield timings
+            success = True
+        except DownloadCancelledError:
+            raise
+        except BaseException:
+            success = False
+            raise
+        finally:
+            controller.release(host, min(timings) if timings else time.perf_counter() - start_time, success)
+
+    def _reserve_bandwidth(self, size: int) -> tuple:
+        """
+        Reserve the given number of bytes from the bandwidth limiter once the previous reservation of this downloader
+        has been waited for, so every downloader keeps a single reservation outstanding and concurrent jobs share the
+        limit equally. Only the reservation is made under the lock; the callers wait outside it.
+
+        :param size: The number of bytes received.
+        :type size: int
+        :return: True and the time (in seconds) to wait if the bytes were reserved, or False and the time until the
+        previous reservation has been waited for.
+        :rtype: tuple[bool, float]
+        """
+        with self._bandwidth_lock:
+            now = time.monotonic()
+            if now < self._throttled_until:
+                return False, self._throttled_until - now
+            delay = self.bandwidth_limiter.reserve(size)
+            self._throttled_until = now + delay
+            return True, delay
+
+    def _throttle(self, size: int) -> None:
+        """
+        Wait until the bandwidth limiter (if any) allows receiving more after the given number of bytes.
+
+        :param size: The number of bytes received.
+        :type size: int
+        """
+        limiter = self.bandwidth_limiter
+        if limiter is None or not limiter.rate:
+            return
+        reserved = False
+        while not reserved:
+            reserved, delay = self._reserve_bandwidth(size)
+            if delay > 0 and self._cancel_event.wait(delay):
+                raise DownloadCancelledError()
+
+    def _segment_written(self, index: int, offset: int, size: int) -> None:
+        """
+        Record a segment appended to the output file in the checkpoint manifest.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param offset: The byte offset of the segment in the output file.
+        :type offset: int
+        :param size: The size of the segment in bytes.
+        :type size: int
+        """
+        self._logger.debug(f'Segment {index} written at offset {offset} ({size} bytes)')
+        self._release_memory(index)
+        if self._checkpoint is not None:
+            self._checkpoint.record(index, size, offset)
+
+    def _segment_downloaded(self, segment: Segment, size: int) -> None:
+        """
+        Record a downloaded segment in the checkpoint manifest.
+
+        :param segment: The downloaded segment.
+        :type segment: Segment
+        :param size: The size of the segment in bytes.
+        :type size: int
+        """
+        self._logger.debug(f'{segment.uri} downloaded ({size} bytes)')
+        if self._checkpoint is not None:
+            self._checkpoint.record(segment.index, size)
+
+    @contextlib.contextmanager
+    def _downloading(self):
+        """
+        Context manager creating the thread pool, the hedged request executor and the concurrency controller the
+        segments are downloaded with, shared by every call of _download_segments within it (e.g. all polls of a live
+        recording), and shutting them down when leaving it.
+        """
+        self._concurrency = self._create_concurrency_controller(self.max_threads)
+        if self.hedge_requests:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.max_threads)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+                self._executor = executor
+                yield
+        finally:
+            self._executor = None
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+                self._hedge_executor = None
+            self._release_all_memory()
+
+    def _download_segments(self, segments: list, total: int) -> None:
+        """
+        Download the given segments through the thread pool, creating it for this call unless called within
+        _downloading.
+
+        :param segments: The segments still to be downloaded.
+        :type segments: list[Segment]
+        :param total: The total number of segments, including those downloaded before.
+        :type total: int
+        """
+        if self._executor is None:
+            with self._downloading():
+                self._download_segments(segments, total)
+            return
+
+        futures = [self._executor.submit(self._download_segment, segment) for segment in segments]
+        try:
+            for completed, future in enumerate(as_completed(futures), start=total - len(segments) + 1):
+                future.result()
+                self._write_progress('Download', completed, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            if self._writer is not None:
+                self._writer.close()  # Fail the workers waiting for reorder buffer space
+            raise
+
+    def _merge_segments(self, playlist: MediaPlaylist) -> None:
+        """
+        Join the staged segments into the output file in playlist order, copying inside the kernel where
+        supported, and report the merge throughput.
+
+        :param playlist: The downloaded media playlist.
+        :type playlist: MediaPlaylist
+        """
+        total = len(playlist.segments)
+        size = 0
+        start_time = time.perf_counter()
+        with self._open_output() as output_file:
+            self._preallocate(
+                output_file, sum(os.path.getsize(self._get_part_file_path(segment)) for segment in playlist.segments)
+            )
+            for completed, segment in enumerate(playlist.segments, start=1):
+                self._raise_if_cancelled()
+                with open(self._get_part_file_path(segment), 'rb', buffering=0) as part_file:
+                    if self.remux_command is not None:
+                        size += output_file.copy_from(part_file.fileno(), self._copy_buffer_size)
+                    else:
+                        size += copy_file(part_file.fileno(), output_file.fileno(), self._copy_buffer_size)
+                self._write_progress('Build', completed, total)
+            if self.remux_command is None:
+                output_file.truncate(size)
+        elapsed = max(time.perf_counter() - start_time, 1e-9)
+
+        self.merge_throughput = size / elapsed
+        message = f'Merged {size / 1024 ** 2:.1f} MiB in {elapsed:.2f}s ({self.merge_throughput / 1024 ** 2:.1f} MiB/s)'
+        self._logger.debug(message)
+        self._write_message('Build', message)
+
+    def _open_output(self):
+        """
+        Open the output file for unbuffered writing, or start the muxer writing it when remuxing.
+
+        :return: The output file or the muxer, to be used as a context manager.
+        :rtype: BinaryIO | MuxerPipe
+        """
+        if self.remux_command is not None:
+            return MuxerPipe(self.remux_command, self.output_file_path)
+        return open(self.output_file_path, 'wb', buffering=0)
+
+    @contextlib.contextmanager
+    def _receiving_parts(self):
+        """
+        Context manager providing an empty parts directory, which the segments of a streaming download are received
+        in until they are appended to the output file, and deleting it afterwards.
+        """
+        shutil.rmtree(self.parts_directory_path, ignore_errors=True)
+        os.makedirs(self.parts_directory_path, exist_ok=True)
+        try:
+            yield
+        finally:
+            shutil.rmtree(self.parts_directory_path, ignore_errors=True)
+
+    def _create_writer(self, output_file, next_index: int = 0) -> StreamingSegmentWriter:
+        """
+        Create the writer appending the segments to the output file in playlist order.
+
+        :param output_file: The output file, positioned where the next segment is to be written, or the muxer.
+        :type output_file: BinaryIO | MuxerPipe
+        :param next_index: The index of the next segment to be written.
+        :type next_index: int
+        :return: The writer.
+        :rtype: StreamingSegmentWriter
+        """
+        return StreamingSegmentWriter(
+            output_file, next_index, self.reorder_buffer_size, self._segment_written, self._copy_buffer_size
+        )
+
+    def _get_part_file_path(self, segment: Segment) -> str:
+        """
+        Get the path the given segment is staged at.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :return: The path of the staged segment.
+        :rtype: str
+        """
+        return os.path.join(self.parts_directory_path, f'segment{segment.index}.ts')
+
+    def _write_progress(self, stage: str, completed: int, total: int) -> None:
+        """
+        Report the progress of a stage whenever its percentage changes, through on_progress if set or to the
+        standard output otherwise.
+
+        :param stage: The name of the stage.
+        :type stage: str
+        :param completed: The number of completed items.
+        :type completed: int
+        :param total: The total number of items.
+        :type total: int
+        """
+        percentage = completed * 100 // total
+        if completed != total and percentage == (completed - 1) * 100 // total:
+            return
+
+        if self.on_progress is not None:
+            self.on_progress(stage, completed, total, '')
+        else:
+            progress_bar = '#' * (percentage // 2)
+            sys.stdout.write(f'\r{stage:<8}: [{progress_bar:<50}] {percentage}%')
+            if completed == total:
+                sys.stdout.write('\n')
+            sys.stdout.flush()
+
+    def _write_message(self, stage: str, message: str) -> None:
+        """
+        Report a message of a stage, through on_progress if set or to the standard output otherwise.
+
+        :param stage: The name of the stage.
+        :type stage: str
+        :param message: The message.
+        :type message: str
+        """
+        if self.on_progress is not None:
+            self.on_progress(stage, 0, 0, message)
+        else:
+            sys.stdout.write(f'{message}\n')
+            sys.stdout.flush()
+
+    def _download_media_playlist(self, playlist: MediaPlaylist) -> None:
+        """
+        Download all segments of the media playlist into the output file.
+
+        :param playlist: The media playlist to be downloaded.
+        :type playlist: MediaPlaylist
+        """
+        if not playlist.segments:
+            raise M3U8DownloaderError(message=f'Playlist "{playlist.url}" does not contain any segments.')
+        self._raise_if_cancelled()
+
+        try:
+            if self.live and not playlist.is_endlist:
+                self._record_live(playlist)
+            elif self.output_mode == self.OUTPUT_MODE_STREAMING and self.remux_command is not None:
+                self._download_remuxed(playlist)
+            elif self.output_mode == self.OUTPUT_MODE_STREAMING:
+                self._download_streaming(playlist)
+            else:
+                self._download_staged(playlist)
+        finally:
+            if self.segment_cache is not None:
+                self.segment_cache.flush()
+            http_cache = getattr(self.inspector, 'http_cache', None)
+            if http_cache is not None:
+                http_cache.flush()
+
+    def _record_live(self, playlist: MediaPlaylist) -> None:
+        """
+        Record the live or event playlist: poll it at its target duration and append the segments added since the
+        previous poll to the output file as they arrive, until the playlist ends or the maximum duration is recorded.
+
+        New segments are found by their media sequence number, so every poll costs in proportion to the segments
+        added rather than to the length of the playlist. Live recordings are always streamed and cannot be resumed.
+
+        :param playlist: The media playlist as fetched when the download started.
+        :type playlist: MediaPlaylist
+        """
+        self.metrics.start(0)
+        last_sequence = None
+        recorded_duration = 0.0
+        next_index = 0
+        reload_failures = 0
+        with self._receiving_parts(), self._open_output() as output_file, self._downloading():
+            self._writer = self._create_writer(output_file)
+            try:
+                while True:
+                    fetched_time = time.monotonic()
+                    segments = self._get_new_segments(playlist, last_sequence)
+                    if self.live_max_duration is not None:
+                        segments = self._limit_duration(segments, self.live_max_duration - recorded_duration)
+                    if segments:
+                        last_sequence = segments[-1].sequence
+                        recorded_duration += sum(segment.duration for segment in segments)
+                        segments = [
+                            Segment(next_index + offset, segment.uri, segment.duration, segment.sequence, segment.key)
+                            for offset, segment in enumerate(segments)
+                        ]
+                        next_index += len(segments)
+                        self.metrics.add_segments(len(segments))
+                        self._download_segments(segments, next_index)
+
+                    if playlist.is_endlist or (
+                            self.live_max_duration is not None and recorded_duration >= self.live_max_duration
+                    ):
+                        break
+
+                    # Poll again after one target duration, or half of it if the playlist did not change
+                    delay = max(playlist.target_duration if segments else playlist.target_duration / 2,
+                                self._live_min_poll_interval)
+                    if self._cancel_event.wait(max(0.0, fetched_time + delay - time.monotonic())):
+                        raise DownloadCancelledError()
+                    try:
+                        playlist = self._reload_playlist(playlist)
+                        reload_failures = 0
+                    except M3U8DownloaderError:
+                        reload_failures += 1
+                        if reload_failures > self.max_retries:
+                            raise
+            finally:
+                self._writer.close()
+                self._writer = None
+
+        self._write_message('Download', f'Recorded {next_index} segments ({recorded_duration:.0f}s)')
+
+    def _get_new_segments(self, playlist: MediaPlaylist, last_sequence: Optional[int]) -> list:
+        """
+        Get the segments of the playlist following the segment with the given media sequence number.
+
+        :param playlist: The media playlist.
+        :type playlist: MediaPlaylist
+        :param last_sequence: The media sequence number of the last recorded segment (None if nothing was recorded).
+        :type last_sequence: int
+        :return: The new segments.
+        :rtype: list[Segment]
+        """
+        if last_sequence is None:
+            return playlist.segments
+
+        start = last_sequence + 1 - playlist.media_sequence
+        if start < 0:
+            self._write_message('Download', f'{-start} segments left the live playlist before they were recorded')
+            start = 0
+        return playlist.segments[start:]
+
+    @staticmethod
+    def _limit_duration(segments: list, duration: float) -> list:
+        """
+        Get the leading segments covering at most the given duration (at least one segment if any duration is left).
+
+        :param segments: The segments.
+        :type segments: list[Segment]
+        :param duration: The duration in seconds.
+        :type duration: float
+        :return: The segments.
+        :rtype: list[Segment]
+        """
+        limited = []
+        for segment in segments:
+            if duration <= 0:
+                break
+            limited.append(segment)
+            duration -= segment.duration
+        return limited
+
+    def _reload_playlist(self, playlist: MediaPlaylist) -> MediaPlaylist:
+        """
+        Fetch the live playlist again, bypassing the freshness of the inspector cache.
+
+        :param playlist: The media playlist.
+        :type playlist: MediaPlaylist
+        :return: The reloaded media playlist.
+        :rtype: MediaPlaylist
+        """
+        try:
+            reloaded = self.inspector.inspect(playlist.url, self.verify_ssl, self._get_session(), max_age=0)
+        except M3U8DownloaderError as e:
+            self._logger.debug(f'Live playlist reload failed. {e.__cause__ or e.message}')
+            raise
+        if not isinstance(reloaded, MediaPlaylist):
+            raise M3U8DownloaderError(message=f'Playlist "{playlist.url}" is no longer a media playlist.')
+        return reloaded
+
+    def _download_streaming(self, playlist: MediaPlaylist) -> None:
+        """
+        Download the segments of the media playlist and append them to the output file in playlist order.
+        The segments written by an interrupted run of the same playlist and output file are kept.
+
+        :param playlist: The media playlist to be downloaded.
+        :type playlist: MediaPlaylist
+        """
+        checkpoint = SegmentCheckpoint(self.checkpoint_file_path, playlist.url, playlist.segments, self.output_mode)
+        resumed = checkpoint.open()
+        if resumed and (
+                not os.path.isfile(self.output_file_path)
+                or os.path.getsize(self.output_file_path) < checkpoint.next_offset
+        ):
+            checkpoint.remove()
+            checkpoint = SegmentCheckpoint(
+                self.checkpoint_file_path, playlist.url, playlist.segments, self.output_mode
+            )
+            resumed = checkpoint.open()
+
+        next_index = checkpoint.next_index
+        if resumed:
+            self._logger.debug(f'Resuming with {next_index} of {len(playlist.segments)} segments')
+        segments = playlist.segments[next_index:]
+        self.metrics.start(len(playlist.segments), next_index)
+        self._checkpoint = checkpoint
+        try:
+            pending_size = 0
+            if segments and (not self.skip_space_check or self.preallocate):
+                pending_size = self._estimate_size(segments)
+            if not self.skip_space_check:
+                self._check_required_disk_space(pending_size, copies=1)
+            with self._receiving_parts(), open(self.output_file_path, 'r+b' if resumed else 'wb', 0) as output_file:
+                # Drop whatever an interrupted run wrote after the last recorded segment
+                output_file.seek(checkpoint.next_offset)
+                output_file.truncate()
+                self._preallocate(output_file, pending_size)
+                self._writer = self._create_writer(output_file, next_index)
+                try:
+                    if segments:
+                        self._download_segments(segments, len(playlist.segments))
+                finally:
+                    output_file.truncate(self._writer.offset)  # Release the space preallocated beyond the end
+                self._logger.debug(f'Peak reorder buffer size: {self._writer.peak_buffered_size}')
+                if self._writer.next_index != len(playlist.segments):
+                    raise M3U8DownloaderError(message=f'Playlist "{playlist.url}" was not downloaded completely.')
+        except BaseException:
+            checkpoint.close()
+            raise
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._checkpoint = None
+
+        checkpoint.remove()
+
+    def _download_remuxed(self, playlist: MediaPlaylist) -> None:
+        """
+        Download the segments of the media playlist and pipe them into the muxer in playlist order. Remuxed
+        downloads cannot be resumed, since the output of the muxer cannot be appended to; the manifest of an
+        interrupted run is dropped.
+
+        :param playlist: The media playlist to be downloaded.
+        :type playlist: MediaPlaylist
+        """
+        SegmentCheckpoint(self.checkpoint_file_path, playlist.url, playlist.segments, self.output_mode).remove()
+        self.metrics.start(len(playlist.segments))
+        if not self.skip_space_check:
+            self._check_required_disk_space(self._estimate_size(playlist.segments), copies=1)
+        with self._receiving_parts(), self._open_output() as output_file:
+            self._writer = self._create_writer(output_file)
+            try:
+                self._download_segments(playlist.segments, len(playlist.segments))
+                self._logger.debug(f'Peak reorder buffer size: {self._writer.peak_buffered_size}')
+            finally:
+                self._writer.close()
+                self._writer = None
+
+    def _download_staged(self, playlist: MediaPlaylist) -> None:
+        """
+        Download, stage and join all segments of the media playlist. Segments staged by an interrupted run of the
+        same playlist and output file are reused; they are kept when the download fails or is cancelled.
+
+        :param playlist: The media playlist to be downloaded.
+        :type playlist: MediaPlaylist
+        """
+        checkpoint = SegmentCheckpoint(self.checkpoint_file_path, playlist.url, playlist.segments, self.output_mode)
+        if checkpoint.open():
+            for index, size in list(checkpoint.completed.items()):
+                part_file_path = self._get_part_file_path(playlist.segments[index])
+                if not os.path.isfile(part_file_path) or os.path.getsize(part_file_path) != size:
+                    checkpoint.discard(index)
+            self._logger.debug(f'Resuming with {len(checkpoint.completed)} of {len(playlist.segments)} segments')
+        else:
+            shutil.rmtree(self.parts_directory_path, ignore_errors=True)
+        os.makedirs(self.parts_directory_path, exist_ok=True)
+
+        segments = [segment for segment in playlist.segments if segment.index not in checkpoint.completed]
+        self.metrics.start(len(playlist.segments), len(checkpoint.completed))
+        self._checkpoint = checkpoint
+        try:
+            if not self.skip_space_check:
+                pending_size = self._estimate_size(segments) if segments else 0
+                self._check_required_disk_space(pending_size, sum(checkpoint.completed.values()))
+            if segments:
+                self._download_segments(segments, len(playlist.segments))
+            self._merge_segments(playlist)
+        except BaseException:
+            checkpoint.close()
+            raise
+        finally:
+            self._checkpoint = None
+
+        checkpoint.remove()
+        shutil.rmtree(self.parts_directory_path, ignore_errors=True)
+
+    def download_playlist(self) -> None:
+        """Download and concatenate the video files from the M3U8 playlist."""
+        self.is_download_complete = False
+        self._validate()
+
+        try:
+            playlist = self._fetch_playlist(self.input_file_path)
+            if isinstance(playlist, MasterPlaylist):
+                raise M3U8DownloaderError(
+                    message=f'Identified file "{self.input_file_path}" as master playlist. '
+                            f'Please use "download_master_playlist" instead.'
+                )
+
+            self._download_media_playlist(playlist)
+            self.is_download_complete = True
+        finally:
+            self._close_session()
+
+    def download_master_playlist(
+            self,
+            name: Optional[str] = None,
+            bandwidth: Optional[str] = None,
+            resolution: Optional[str] = None
+    ) -> None:
+        """
+        Download and concatenate the video files of the selected variant of the M3U8 master playlist.
+        If no variant details are specified, a M3U8DownloaderWarning is raised with all available variants.
+
+        :param name: The name of the variant to download.
+        :type name: str
+        :param bandwidth: The bandwidth of the variant to download.
+        :type bandwidth: str
+        :param resolution: The resolution of the variant to download.
+        :type resolution: str
+        """
+        self.is_download_complete = False
+        self._validate()
+
+        try:
+            playlist = self._fetch_playlist(self.input_file_path)
+            if isinstance(playlist, MediaPlaylist):
+                raise M3U8DownloaderError(
+                    message=f'Identified file "{self.input_file_path}" as playlist. '
+                            f'Please use "download_playlist" instead.'
+                )
+
+            if name is None and bandwidth is None and resolution is None:
+                raise M3U8DownloaderWarning(
+                    message=f'Identified {len(playlist.variants)} variants in the master playlist.',
+                    json_data=[variant.to_dict() for variant in playlist.variants]
+                )
+
+            variants = playlist.search(name, bandwidth, resolution)
+            if not variants:
+                raise M3U8DownloaderError(
+                    message=f'Selected variant, name="{name}", bandwidth="{bandwidth}", '
+                            f'resolution="{resolution}" not found.'
+                )
+
+            self._download_variant_playlist(variants[0])
+            self.is_download_complete = True
+        finally:
+            self._close_session()
+
+    def download_variant(self, variant: Variant) -> None:
+        """
+        Download and concatenate the video files of the given variant of the M3U8 master playlist, fetching its media
+        playlist straight from the URI of the variant. A variant only known by its details is looked up in the master
+        playlist as by download_master_playlist.
+
+        :param variant: The variant to download, e.g. as selected from the variants of the inspected master playlist.
+        :type variant: Variant
+        """
+        if variant.uri is None:
+            self.download_master_playlist(variant.name, variant.bandwidth, variant.resolution)
+            return
+
+        self.is_download_complete = False
+        self._validate()
+
+        try:
+            self._download_variant_playlist(variant)
+            self.is_download_complete = True
+        finally:
+            self._close_session()
+
+    def _download_variant_playlist(self, variant: Variant) -> None:
+        """
+        Fetch the media playlist of the variant and download its segments into the output file.
+
+        :param variant: The variant.
+        :type variant: Variant
+        """
+        media_playlist = self._fetch_playlist(variant.uri)
+        if not isinstance(media_playlist, MediaPlaylist):
+            raise M3U8DownloaderError(message=f'Variant "{variant.uri}" is not a media playlist.')
+
+        self._download_media_playlist(media_playlist)
+
+
+class AsyncSegmentDownloader(SegmentDownloader):
+    """
+    Class for downloading M3U8 playlists by fetching the media segments from an asyncio event loop.
+
+    The event loop is created on the calling (worker) thread for the duration of the download and the number of
+    segment requests in flight is limited by a semaphore, which allows far higher fan-out than a thread pool.
+    """
+
+    def __init__(
+            self,
+            input_file_path: str,
+            output_file_path: str,
+            skip_space_check: Optional[bool] = False,
+            debug: Optional[bool] = False,
+            debug_file_path: Optional[str] = 'debug.log',
+            max_threads: Optional[int] = 10,
+            verify_ssl: Optional[bool] = True,
+            output_mode: Optional[str] = SegmentDownloader.OUTPUT_MODE_STREAMING,
+            reorder_buffer_size: Optional[int] = 64 * 1024 * 1024,
+            max_concurrency: Optional[int] = 100,
+            adaptive_concurrency: Optional[bool] = False,
+            segment_timeout: Optional[float] = 60,
+            max_retries: Optional[int] = 3,
+            hedge_requests: Optional[bool] = False,
+            live: Optional[bool] = False,
+            live_max_duration: Optional[float] = None,
+            size_estimate_samples: Optional[int] = 24,
+            preallocate: Optional[bool] = False,
+            remux_command: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the AsyncSegmentDownloader class.
+
+        :param input_file_path: The URL of the M3U8 playlist.
+        :type input_file_path: str
+        :param output_file_path: The path to the output video file.
+        :type output_file_path: str
+        :param skip_space_check: A flag indicating whether to skip disk space checking.
+        :type skip_space_check: bool
+        :param debug: A flag indicating whether debug mode is enabled.
+        :type debug: bool
+        :param debug_file_path: The file path for storing debug logs.
+        :type debug_file_path: str
+        :param max_threads: The maximum number of threads used for the disk space check.
+        :type max_threads: int
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param output_mode: How segments are written to the output file (one of OUTPUT_MODES).
+        :type output_mode: str
+        :param reorder_buffer_size: The maximum number of bytes held for out-of-order segments in streaming mode.
+        :type reorder_buffer_size: int
+        :param max_concurrency: The maximum number of segment requests in flight.
+        :type max_concurrency: int
+        :param adaptive_concurrency: A flag to adapt the segment requests in flight per host (up to max_concurrency)
+        to the observed errors and latency.
+        :type adaptive_concurrency: bool
+        :param segment_timeout: The maximum time (in seconds) a single request of a segment may take.
+        :type segment_timeout: float
+        :param max_retries: The maximum number of retries of a failed segment request.
+        :type max_retries: int
+        :param hedge_requests: A flag to send a duplicate request for segments slower than the observed p95 latency.
+        :type hedge_requests: bool
+        :param live: A flag to record live and event playlists until they end, instead of downloading the segments
+        listed when the download starts.
+        :type live: bool
+        :param live_max_duration: The maximum duration (in seconds) of media recorded from a live playlist.
+        :type live_max_duration: float
+        :param size_estimate_samples: The number of segments, spread evenly over the playlist, whose size is requested
+        to estimate the output size, extrapolated by duration (0 requests the size of every segment).
+        :type size_estimate_samples: int
+        :param preallocate: A flag to reserve the estimated size of the output file on disk before writing it.
+        :type preallocate: bool
+        :param remux_command: The command of a local muxer reading the segments from its standard input and writing
+        the output file given by the {output} placeholder (the segments are concatenated into the output file if not
+        given).
+        :type remux_command: str
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency should be at least 1.')
+
+        super().__init__(
+            input_file_path, output_file_path, skip_space_check, debug, debug_file_path, max_threads, verify_ssl,
+            output_mode, reorder_buffer_size, adaptive_concurrency, segment_timeout, max_retries, hedge_requests, live,
+            live_max_duration, size_estimate_samples, preallocate, remux_command
+        )
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._main_task = None
+        self._pool = None
+        self._writer_condition = None
+        self._concurrency_condition = None
+        self._memory_released = None
+        self._memory_listener = None
+
+    def cancel(self) -> None:
+        """
+        Request the download to stop. Segment requests in flight are cancelled on the event loop and
+        the download method raises DownloadCancelledError.
+        """
+        super().cancel()
+        loop, task = self._loop, self._main_task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass
+
+    @contextlib.contextmanager
+    def _downloading(self):
+        """
+        Context manager creating the event loop, the connection pool and the concurrency controller the segments are
+        downloaded with, shared by every call of _download_segments within it (e.g. all polls of a live recording),
+        and closing them when leaving it.
+        """
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._open_async())
+            yield
+        finally:
+            try:
+                loop.run_until_complete(self._close_async())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                self._loop = None
+                loop.close()
+
+    async def _open_async(self) -> None:
+        """Create the connection pool, the synchronisation primitives and the concurrency controller on the loop."""
+        loop = asyncio.get_running_loop()
+        self._pool = AsyncHTTPConnectionPool(self.verify_ssl, self._timeout)
+        self._writer_condition = asyncio.Condition()
+        self._concurrency_condition = asyncio.Condition()
+        self._memory_released = asyncio.Event()
+        self._concurrency = self._create_concurrency_controller(self.max_concurrency)
+
+        def memory_released() -> None:
+            with contextlib.suppress(RuntimeError):  # The event loop has just been closed
+                loop.call_soon_threadsafe(self._memory_released.set)
+
+        self._memory_listener = memory_released
+        if self.memory_budget is not None:
+            self.memory_budget.add_listener(memory_released)
+
+    async def _close_async(self) -> None:
+        """Close the connection pool and release the memory held by segments in flight when the download failed."""
+        try:
+            if self._pool is not None:
+                await self._pool.close()
+        finally:
+            self._release_all_memory()
+            if self.memory_budget is not None and self._memory_listener is not None:
+                self.memory_budget.remove_listener(self._memory_listener)
+            self._pool = None
+            self._memory_listener = None
+            self._writer_condition = None
+            self._concurrency_condition = None
+            self._memory_released = None
+
+    def _download_segments(self, segments: list, total: int) -> None:
+        """
+        Download the given segments on the event loop, creating it for this call unless called within _downloading.
+
+        :param segments: The segments still to be downloaded.
+        :type segments: list[Segment]
+        :param total: The total number of segments, including those downloaded before.
+        :type total: int
+        """
+        if self._loop is None:
+            with self._downloading():
+                self._download_segments(segments, total)
+            return
+
+        self._raise_if_cancelled()
+        self._main_task = self._loop.create_task(self._download_segments_async(segments, total))
+        try:
+            self._loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            raise DownloadCancelledError()
+        finally:
+            self._main_task = None
+
+    async def _download_segments_async(self, segments: list, total: int) -> None:
+        """
+        Download the given segments, with at most max_concurrency requests in flight.
+
+        :param segments: The segments still to be downloaded.
+        :type segments: list[Segment]
+        :param total: The total number of segments, including those downloaded before.
+        :type total: int
+        """
+        pool = self._pool
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed = total - len(segments)
+
+        async def download(segment: Segment) -> None:
+            nonlocal completed
+            async with semaphore:
+                self._raise_if_cancelled()
+                await self._download_segment_async(pool, segment)
+            completed += 1
+            self._write_progress('Download', completed, total)
+
+        pending = iter(segments)
+
+        async def worker() -> None:
+            for segment in pending:
+                await download(segment)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.max_concurrency, len(segments)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for future in workers:
+                future.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    @contextlib.asynccontextmanager
+    async def _request_slot_async(self, uri: str):
+        """
+        Asynchronous context manager holding one of the request slots of the host of the URL while the segment is
+        fetched, and reporting the outcome to the concurrency controller (if any). It yields the list the requests
+        append the time until their response headers to (see _request_slot).
+
+        :param uri: The URL of the segment.
+        :type uri: str
+        """
+        timings = []
+        controller = self._concurrency
+        if controller is None:
+            yield timings
+            return
+
+        host = urlparse(uri).netloc
+        async with self._concurrency_condition:
+            await self._concurrency_condition.wait_for(lambda: controller.try_acquire(host))
+        start_time = time.perf_counter()
+        success = None
+        try:
+            yield timings
+            success = True
+        except (DownloadCancelledError, asyncio.CancelledError):
+            raise
+        except BaseException:
+            success = False
+            raise
+        finally:
+            controller.release(host, min(timings) if timings else time.perf_counter() - start_time, success)
+            async with self._concurrency_condition:
+                self._concurrency_condition.notify_all()
+
+    async def _throttle_async(self, size: int) -> None:
+        """
+        Wait until the bandwidth limiter (if any) allows receiving more after the given number of bytes, without
+        blocking the event loop.
+
+        :param size: The number of bytes received.
+        :type size: int
+        """
+        limiter = self.bandwidth_limiter
+        if limiter is None or not limiter.rate:
+            return
+        reserved = False
+        while not reserved:
+            reserved, delay = self._reserve_bandwidth(size)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _download_segment_async(self, pool: AsyncHTTPConnectionPool, segment: Segment) -> int:
+        """
+        Download the segment into its part file and append it to the output file (streaming) or keep it there until
+        all segments are joined (staged).
+
+        :param pool: The connection pool to request the segment through.
+        :type pool: AsyncHTTPConnectionPool
+        :param segment: The segment to be downloaded.
+        :type segment: Segment
+        :return: The size of the segment in bytes.
+        :rtype: int
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        part_file_path = self._get_part_file_path(segment)
+        received_file_path = self._get_received_file_path(segment)
+        size = await self._fetch_segment_async(pool, segment, received_file_path)
+        self.metrics.record_segment(size, time.perf_counter() - start_time)
+        if segment.key is not None:
+            size = await self._decrypt_segment_async(segment, received_file_path, part_file_path)
+        if self._writer is not None:
+            # The writer copies the segments to the output file and records them in the checkpoint manifest, so it
+            # runs in the executor; waiting for reorder buffer space does not block the event loop either
+            async with self._writer_condition:
+                while not await loop.run_in_executor(None, self._writer.offer, segment.index, part_file_path):
+                    await self._writer_condition.wait()
+                self._writer_condition.notify_all()
+            self._memory_released.set()  # The segment may be the next one to be written, which may overdraw the budget
+        else:
+            await loop.run_in_executor(None, self._segment_downloaded, segment, size)
+        return size
+
+    async def _decrypt_segment_async(self, segment: Segment, source_path: str, destination_path: str) -> int:
+        """
+        Decrypt the received encrypted segment into its part file through the decryptor (if any) without blocking the
+        event loop, and delete the encrypted file.
+
+        :param segment: The encrypted segment.
+        :type segment: Segment
+        :param source_path: The path of the encrypted segment.
+        :type source_path: str
+        :param destination_path: The path the decrypted segment is written to.
+        :type destination_path: str
+        :return: The size of the decrypted segment in bytes.
+        :rtype: int
+        :raises M3U8DownloaderError: If the segment cannot be decrypted.
+        """
+        loop = asyncio.get_running_loop()
+        key = await loop.run_in_executor(None, self._get_segment_key, segment)
+        try:
+            if self.decryptor is None:
+                return await loop.run_in_executor(
+                    None, decrypt_aes_128_file, source_path, destination_path, key, segment.iv
+                )
+            return await self.decryptor.decrypt_file_async(source_path, destination_path, key, segment.iv)
+        except ValueError as e:
+            raise M3U8DownloaderError(
+                message=f'Segment "{segment.uri.split("/")[-1]}" could not be decrypted. {e}'
+            ) from e
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(source_path)
+
+    async def _fetch_segment_async(self, pool: AsyncHTTPConnectionPool, segment: Segment, file_path: str) -> int:
+        """
+        Fetch the content of the segment into the given file from the segment cache or the network, retrying failed
+        requests with jittered exponential backoff. A cached segment is revalidated first (see _fetch_segment).
+
+        :param pool: The connection pool to request the segment through.
+        :type pool: AsyncHTTPConnectionPool
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :return: The size of the segment in bytes.
+        :rtype: int
+        """
+        loop = asyncio.get_running_loop()
+        headers = await loop.run_in_executor(None, self._get_cache_headers, segment)
+        if headers == {}:  # Cached without validators, so there is nothing to revalidate it with
+            size = await loop.run_in_executor(None, self._get_cached_segment, segment, file_path)
+            if size is not None:
+                return size
+            headers = None
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._request_slot_async(segment.uri) as timings:
+                    size, validators = await self._fetch_segment_hedged_async(
+                        pool, segment, file_path, timings, headers
+                    )
+                if validators is None:  # Not modified since it was cached
+                    size = await loop.run_in_executor(None, self._get_cached_segment, segment, file_path)
+                    if size is not None:
+                        return size
+                    headers = None  # The cached copy is gone or damaged: fetch it in full
+                    continue
+            except OSError as e:
+                self._segment_failed(segment, attempt, e)
+            else:
+                await loop.run_in_executor(None, self._cache_segment, segment, file_path, validators)
+                return size
+            await asyncio.sleep(self._get_backoff_delay(attempt))
+            self._raise_if_cancelled()
+
+    async def _fetch_segment_hedged_async(
+            self,
+            pool: AsyncHTTPConnectionPool,
+            segment: Segment,
+            file_path: str,
+            timings: Optional[list] = None,
+            headers: Optional[dict] = None
+    ) -> tuple:
+        """
+        Fetch the content of the segment, sending a duplicate request once the first one takes longer than the
+        observed p95 latency and keeping whichever finishes first.
+
+        :param pool: The connection pool to request the segment through.
+        :type pool: AsyncHTTPConnectionPool
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :param timings: The list the time (in seconds) until the response headers of each request is appended to.
+        :type timings: list[float]
+        :param headers: The conditional request headers revalidating the cached copy of the segment.
+        :type headers: dict
+        :return: The size of the segment in bytes and the validators of the response (both None if not modified).
+        :rtype: tuple[int, dict]
+        """
+        arguments = (pool, segment, file_path, timings, headers)
+        delay = self._get_hedge_delay()
+        if delay is None:
+            return await self._fetch_segment_once_async(*arguments)
+
+        tasks = [asyncio.ensure_future(self._fetch_segment_once_async(*arguments))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.metrics.record_hedge()
+                self._logger.debug(f'{segment.uri} slower than {delay}s, sending a hedged request')
+                tasks.append(asyncio.ensure_future(self._fetch_segment_once_async(*arguments)))
+
+            error = None
+            for future in asyncio.as_completed(tasks):
+                try:
+                    return await future
+                except OSError as e:
+                    error = e
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_segment_once_async(
+            self,
+            pool: AsyncHTTPConnectionPool,
+            segment: Segment,
+            file_path: str,
+            timings: Optional[list] = None,
+            headers: Optional[dict] = None
+    ) -> tuple:
+        """
+        Fetch the content of the segment with a single request, within the segment timeout. The content is received
+        in chunks straight into the file. When streaming, its size is reserved from the memory budget first, since it
+        stays buffered until all preceding segments are written.
+
+        :param pool: The connection pool to request the segment through.
+        :type pool: AsyncHTTPConnectionPool
+        :param segment: The segment to be fetched.
+        :type segment: Segment
+        :param file_path: The path the segment is written to.
+        :type file_path: str
+        :param timings: The list the time (in seconds) until the response headers arrived is appended to.
+        :type timings: list[float]
+        :param headers: The conditional request headers revalidating the cached copy of the segment.
+        :type headers: dict
+        :return: The size of the segment in bytes and the validators of the response (both None if not modified).
+        :rtype: tuple[int, dict]
+        """
+        buffered = self._writer is not None
+        receiver = SegmentReceiver(file_path)
+        held = 0
+
+        async def receive(response) -> None:
+            nonlocal held
+            async for chunk in response.iter_chunks(self._chunk_size):
+                self._raise_if_cancelled()
+                receiver.write(chunk)
+                if buffered and receiver.size > held:
+                    self._hold_memory(segment, receiver.size - held, wait=False)  # Content-Length was missing
+                    held = receiver.size
+                await self._throttle_async(len(chunk))
+
+        try:
+            request_start = time.perf_counter()
+            deadline = request_start + self.segment_timeout
+            response = await asyncio.wait_for(pool.request('GET', segment.uri, headers), self.segment_timeout)
+            if timings is not None:
+                timings.append(time.perf_counter() - request_start)
+            try:
+                if headers and response.status == 304:
+                    receiver.discard()
+                    return None, None
+                response.raise_for_status()
+                if buffered:
+                    held = self._parse_content_length(response.headers.get('content-length'))
+                    wait_start = time.perf_counter()
+                    await self._hold_memory_async(segment, held)
+                    deadline += time.perf_counter() - wait_start  # Waiting for the budget is not part of the timeout
+                await asyncio.wait_for(receive(response), max(0.0, deadline - time.perf_counter()))
+            finally:
+                response.release()
+            validators = {'etag': response.headers.get('etag'), 'last_modified': response.headers.get('last-modified')}
+            return receiver.commit(), validators
+        except asyncio.TimeoutError:
+            receiver.discard()
+            self._release_memory(segment.index, held)
+            raise TimeoutError(f'Segment not downloaded within {self.segment_timeout}s.')
+        except BaseException:
+            receiver.discard()
+            self._release_memory(segment.index, held)
+            raise
+
+    async def _hold_memory_async(self, segment: Segment, size: int) -> None:
+        """
+        Reserve the given number of bytes of the segment from the memory budget (if any), waiting without blocking
+        the event loop until bytes are released, and record the memory held by this downloader.
+
+        :param segment: The segment.
+        :type segment: Segment
+        :param size: The number of bytes.
+        :type size: int
+        """
+        if not size:
+            return
+        budget = self.memory_budget
+        if budget is not None:
+            while True:
+                self._memory_released.clear()  # Cleared before trying, so a release in between is not missed
+                if budget.try_acquire(size, self._may_overdraw_memory(segment)):
+                    break
+                await self._memory_released.wait()
+                self._raise_if_cancelled()
+        self._record_held_memory(segment, size)
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class HttpCache:
+    """
+    Class for keeping small HTTP responses (playlists and keys) on disk together with their validators, so they are
+    revalidated with a conditional request instead of being downloaded again.
+
+    Requests send the headers from get_headers(); resolve() then serves the stored body when the server answers 304
+    Not Modified, or stores the new body if the response carries an ETag or Last-Modified validator. Every body is
+    kept in its own file in a directory named after the cache file, and the cache file (next to the configuration
+    file) is a small index of the validators. The index is written by put() at most once per write_interval and by
+    flush(), so storing a response costs one body write rather than a rewrite of the whole cache. The cache holds at
+    most max_entries responses, the least recently stored being dropped first. All methods are thread-safe.
+    """
+
+    _write_interval = 5.0  # Minimum time (in seconds) between two writes of the index by put
+
+    def __init__(
+            self,
+            file_path: str,
+            max_entries: int = 256,
+            max_content_size: int = 1024 * 1024
+    ) -> None:
+        """
+        Initialize the HttpCache class.
+
+        :param file_path: The path of the cache file.
+        :type file_path: str
+        :param max_entries: The maximum number of responses kept.
+        :type max_entries: int
+        :param max_content_size: The maximum size (in bytes) of a response body kept.
+        :type max_content_size: int
+        """
+        if max_entries < 1:
+            raise ValueError('max_entries should be at least 1.')
+
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.max_content_size = max_content_size
+        self.directory = os.path.splitext(file_path)[0]
+        self.hits = 0
+        self.misses = 0
+        self._entries = None  # Entries by URL, least recently stored first; loaded on first use
+        self._dirty = False
+        self._written_time = None
+        self._lock = threading.Lock()
+
+    def get_headers(self, url: str) -> dict:
+        """
+        Get the conditional request headers for the stored response of the URL.
+
+        :param url: The requested URL.
+        :type url: str
+        :return: The If-None-Match and If-Modified-Since headers (empty if no response is stored).
+        :rtype: dict
+        """
+        entry = self._get_entry(url)
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get(self, url: str) -> Optional[tuple]:
+        """
+        Get the stored response of the URL.
+
+        :param url: The requested URL.
+        :type url: str
+        :return: The body and the final URL (after redirects) of the response, or None if no response is stored.
+        :rtype: tuple[bytes, str]
+        """
+        entry = self._get_entry(url)
+        if entry is None:
+            return None
+        try:
+            with open(self._get_content_path(url), 'rb') as file:
+                return file.read(), entry['url']
+        except OSError:
+            with self._lock:
+                if self._entries.get(url) is entry:
+                    del self._entries[url]
+                    self._dirty = True
+            return None
+
+    def resolve(self, url: str, response) -> tuple:
+        """
+        Get the body of the response to a request sent with the headers of get_headers(), storing new responses.
+
+        :param url: The requested URL.
+        :type url: str
+        :param response: The response.
+        :type response: requests.Response
+        :return: The body and the final URL of the response, and a flag indicating if the stored response was reused.
+        :rtype: tuple[bytes, str, bool]
+        :raises requests.HTTPError: If the response is not successful.
+        """
+        if response.status_code == 304:
+            stored = self.get(url)
+            if stored is not None:
+                with self._lock:
+                    self.hits += 1
+                return stored[0], stored[1], True
+
+        response.raise_for_status()
+        with self._lock:
+            self.misses += 1
+        content = response.content
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        no_store = 'no-store' in response.headers.get('Cache-Control', '').lower()
+        if (etag or last_modified) and not no_store and len(content) <= self.max_content_size:
+            self.put(url, content, response.url, etag, last_modified)
+        return content, response.url, False
+
+    def put(
+            self,
+            url: str,
+            content: bytes,
+            final_url: Optional[str] = None,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store the response of the URL, writing its body and, unless written shortly before, the index.
+
+        :param url: The requested URL.
+        :type url: str
+        :param content: The body of the response.
+        :type content: bytes
+        :param final_url: The final URL (after redirects) of the response (the requested URL if not given).
+        :type final_url: str
+        :param etag: The ETag header of the response.
+        :type etag: str
+        :param last_modified: The Last-Modified header of the response.
+        :type last_modified: str
+        :return: None
+        """
+        content_path = self._get_content_path(url)
+        temp_path = f'{content_path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                file.write(content)
+            os.replace(temp_path, content_path)
+        except OSError:
+            return  # Read-only or full configuration directory: the response is not stored
+
+        with self._lock:
+            self._load()
+            self._entries.pop(url, None)
+            self._entries[url] = {'url': final_url or url, 'etag': etag, 'last_modified': last_modified}
+            while len(self._entries) > self.max_entries:
+                evicted_url, _ = self._entries.popitem(last=False)
+                try:
+                    os.remove(self._get_content_path(evicted_url))
+                except OSError:
+                    pass
+            self._dirty = True
+            write = self._written_time is None or time.monotonic() - self._written_time >= self._write_interval
+        if write:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the index to disk if it changed since it was loaded or last written."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps({'entries': self._entries})
+            self._dirty = False
+            self._written_time = time.monotonic()
+
+        temp_path = f'{self.file_path}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write(snapshot)
+            os.replace(temp_path, self.file_path)
+        except OSError:
+            pass
+
+    def _get_content_path(self, url: str) -> str:
+        """
+        Get the path of the file holding the stored body of the URL.
+
+        :param url: The requested URL.
+        :type url: str
+        :return: The path of the file.
+        :rtype: str
+        """
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def _get_entry(self, url: str) -> Optional[dict]:
+        """
+        Get the stored entry of the URL.
+
+        :param url: The requested URL.
+        :type url: str
+        :return: The entry, or None if no response is stored.
+        :rtype: dict
+        """
+        with self._lock:
+            self._load()
+            return self._entries.get(url)
+
+    def _load(self) -> None:
+        """Load the cache file on first use. Must hold the lock."""
+        if self._entries is not None:
+            return
+
+        self._entries = OrderedDict()
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                entries = json.load(file)['entries']
+            for url, entry in entries.items():
+                if isinstance(entry, dict) and 'url' in entry and 'content' not in entry:  # Bodies used to be inline
+                    self._entries[url] = entry
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
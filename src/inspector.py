@@ -0,0 +1,158 @@
+import threading
+import time
+from typing import Optional, Union
+
+from pym3u8downloader import M3U8DownloaderError
+
+from .httpcache import HttpCache
+from .playlist import MasterPlaylist, MediaPlaylist, parse_playlist
+
+
+class PlaylistInspector:
+    """
+    Class for fetching and classifying M3U8 playlists, caching the parsed playlists for a limited time.
+
+    A playlist is fetched and parsed once per URL and SSL setting: detecting whether it is a master playlist, listing
+    its variants and downloading it all reuse the same parsed playlist while it is fresh. With an HTTP cache, playlists
+    which are no longer fresh are revalidated with a conditional request, and the parsed playlist is reused as well if
+    the server answers 304 Not Modified. All methods are thread-safe, so a single inspector can be shared by all
+    download threads.
+    """
+
+    _timeout = 30  # Timeout (in seconds) of a single HTTP request
+
+    def __init__(self, ttl: float = 60, http_cache: Optional[HttpCache] = None) -> None:
+        """
+        Initialize the PlaylistInspector class.
+
+        :param ttl: The time (in seconds) a parsed playlist is reused; 0 disables caching.
+        :type ttl: float
+        :param http_cache: The cache the playlists are revalidated against (always fetched in full if not given).
+        :type http_cache: HttpCache
+        """
+        if ttl < 0:
+            raise ValueError('ttl should not be negative.')
+
+        self.ttl = ttl
+        self.http_cache = http_cache
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def inspect(
+            self,
+            url: str,
+            verify_ssl: bool = True,
+            session=None,
+            max_age: Optional[float] = None
+    ) -> Union[MediaPlaylist, MasterPlaylist]:
+        """
+        Get the parsed playlist of the given URL, fetching it only if it is not cached or no longer fresh.
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param session: The HTTP session used to fetch the playlist (a new connection if not given).
+        :type session: requests.Session
+        :param max_age: The time (in seconds) a cached playlist is fresh for this call (the ttl if not given), e.g. 0
+        to reload a live playlist.
+        :type max_age: float
+        :return: The parsed playlist.
+        :rtype: MediaPlaylist | MasterPlaylist
+        :raises M3U8DownloaderError: If the playlist cannot be fetched or is not a playlist.
+        """
+        key = (url, verify_ssl)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < (self.ttl if max_age is None else max_age):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        playlist = self._fetch(url, verify_ssl, session, entry[1] if entry is not None else None)
+        if self.ttl:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), playlist)
+        return playlist
+
+    def get_cached(self, url: str, verify_ssl: bool = True) -> Optional[Union[MediaPlaylist, MasterPlaylist]]:
+        """
+        Get the parsed playlist of the given URL if it is cached and fresh, without fetching it.
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :return: The parsed playlist, or None if it is not cached or no longer fresh.
+        :rtype: MediaPlaylist | MasterPlaylist
+        """
+        with self._lock:
+            entry = self._cache.get((url, verify_ssl))
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """
+        Remove the cached playlists of the given URL, or all cached playlists.
+
+        :param url: The URL of the playlist (all playlists if not given).
+        :type url: str
+        :return: None
+        """
+        with self._lock:
+            if url is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == url]:
+                    del self._cache[key]
+
+    def _fetch(
+            self,
+            url: str,
+            verify_ssl: bool,
+            session=None,
+            previous: Optional[Union[MediaPlaylist, MasterPlaylist]] = None
+    ) -> Union[MediaPlaylist, MasterPlaylist]:
+        """
+        Fetch and parse the playlist from the given URL, revalidating it against the HTTP cache (if any).
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param session: The HTTP session used to fetch the playlist (a new connection if not given).
+        :type session: requests.Session
+        :param previous: The playlist parsed from the previous response, reused if the response did not change.
+        :type previous: MediaPlaylist | MasterPlaylist
+        :return: The parsed playlist.
+        :rtype: MediaPlaylist | MasterPlaylist
+        """
+        import requests
+
+        headers = self.http_cache.get_headers(url) if self.http_cache is not None else {}
+        try:
+            if session is not None:
+                response = session.get(url, headers=headers, timeout=self._timeout)
+            else:
+                if not verify_ssl:
+                    import urllib3
+                    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+                response = requests.get(url, headers=headers, timeout=self._timeout, verify=verify_ssl)
+            if self.http_cache is not None:
+                content, response_url, not_modified = self.http_cache.resolve(url, response)
+                if not_modified and previous is not None:
+                    return previous
+                text = content.decode('utf-8', errors='replace')
+            else:
+                response.raise_for_status()
+                text, response_url = response.text, response.url
+        except requests.RequestException as e:
+            raise M3U8DownloaderError(message=f'Unable to download "{url.split("/")[-1]}" file.') from e
+
+        try:
+            return parse_playlist(text, response_url)
+        except ValueError as e:
+            raise M3U8DownloaderError(message=str(e))
@@ -0,0 +1,145 @@
+import threading
+from typing import Callable, Optional
+
+
+class MemoryBudget:
+    """
+    Class for limiting the number of bytes of segment content buffered by all download jobs together, i.e. received
+    but not yet appended to the output file. Segments are received to disk in chunks, so the buffered bytes are
+    spooled in part files rather than held in memory whole; the budget bounds that backlog across all jobs.
+
+    Consumers reserve the bytes before receiving them and release them once written. A reservation exceeding the
+    limit waits until enough bytes are released, except when nothing is reserved (so a segment larger than the limit
+    still proceeds on its own) or when the consumer may overdraw the budget: the segment a streaming download waits
+    for to write its buffered segments must never wait for them to be released. The limit can be changed at any time
+    from any thread; the number of reserved bytes is tracked even without a limit. Consumers which cannot block a
+    thread while waiting (e.g. an event loop) register a listener, invoked whenever bytes are released or the limit
+    changes, and retry try_acquire then.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        """
+        Initialize the MemoryBudget class.
+
+        :param limit: The maximum number of bytes reserved at once; 0 disables the limit.
+        :type limit: int
+        """
+        self._condition = threading.Condition()
+        self._listeners = []
+        self._limit = 0
+        self.in_use = 0
+        self.peak = 0
+        self.set_limit(limit)
+
+    @property
+    def limit(self) -> int:
+        """
+        Getter property for the limit.
+
+        :return: The maximum number of bytes reserved at once, 0 if unlimited.
+        :rtype: int
+        """
+        return self._limit
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Change the limit. Waiting reservations are re-evaluated against the new limit.
+
+        :param limit: The maximum number of bytes reserved at once; 0 disables the limit.
+        :type limit: int
+        :return: None
+        """
+        if limit < 0:
+            raise ValueError('limit should not be negative.')
+
+        with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    def try_acquire(self, amount: int, overdraw: bool = False) -> bool:
+        """
+        Reserve the given number of bytes if the limit allows it.
+
+        :param amount: The number of bytes.
+        :type amount: int
+        :param overdraw: A flag to reserve the bytes regardless of the limit.
+        :type overdraw: bool
+        :return: True if the bytes were reserved, False otherwise.
+        :rtype: bool
+        """
+        with self._condition:
+            if self._limit and not overdraw and self.in_use and self.in_use + amount > self._limit:
+                return False
+            self.in_use += amount
+            self.peak = max(self.peak, self.in_use)
+            return True
+
+    def acquire(
+            self,
+            amount: int,
+            cancel_event: Optional[threading.Event] = None,
+            overdraw: Optional[Callable[[], bool]] = None
+    ) -> bool:
+        """
+        Wait until the given number of bytes can be reserved, and reserve them.
+
+        :param amount: The number of bytes.
+        :type amount: int
+        :param cancel_event: The event which stops waiting when set.
+        :type cancel_event: threading.Event
+        :param overdraw: Callable returning True once the bytes may be reserved regardless of the limit, polled
+        while waiting.
+        :type overdraw: Callable[[], bool]
+        :return: True if the bytes were reserved, False if the wait was cancelled.
+        :rtype: bool
+        """
+        with self._condition:
+            while not self.try_acquire(amount, overdraw is not None and overdraw()):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self._condition.wait(0.1)
+            return True
+
+    def release(self, amount: int) -> None:
+        """
+        Release the given number of reserved bytes.
+
+        :param amount: The number of bytes.
+        :type amount: int
+        :return: None
+        """
+        with self._condition:
+            self.in_use -= amount
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callable invoked (on the releasing thread) whenever bytes are released or the limit changes.
+
+        :param listener: The callable.
+        :type listener: Callable[[], None]
+        :return: None
+        """
+        with self._condition:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Unregister a callable registered with add_listener.
+
+        :param listener: The callable.
+        :type listener: Callable[[], None]
+        :return: None
+        """
+        with self._condition:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify_listeners(self) -> None:
+        """Invoke the registered listeners, outside the lock so they may reserve or release bytes themselves."""
+        with self._condition:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
@@ -0,0 +1,322 @@
+import bisect
+import json
+import sys
+import threading
+import time
+from typing import Optional
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    Get the peak resident set size of the current process.
+
+    :return: The peak RSS in bytes, or None if not supported by the platform.
+    :rtype: int
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+class TransferMetrics:
+    """
+    Class for collecting the transfer metrics of a single download job: segments and bytes transferred, throughput,
+    estimated time remaining, retries and a per-segment latency histogram with fixed buckets.
+
+    All methods are thread-safe, so the metrics can be fed from the segment workers and read from the UI thread.
+    """
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # Upper bounds (in seconds) of the latency buckets
+
+    def __init__(self) -> None:
+        """Initialize the TransferMetrics class."""
+        self.segments_total = 0
+        self.segments_completed = 0
+        self.segments_resumed = 0
+        self.bytes_downloaded = 0
+        self.retries = 0
+        self.hedges = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_bytes_saved = 0
+        self.peak_buffered_bytes = 0
+        self.peak_rss = None
+        self.concurrency = None
+        self.state = None
+        self.latency_counts = [0] * (len(self.LATENCY_BUCKETS) + 1)
+        self._start_time = None
+        self._end_time = None
+        self._lock = threading.Lock()
+
+    def start(self, segments_total: int, segments_resumed: int = 0) -> None:
+        """
+        Start measuring the transfer of the segments of a media playlist.
+
+        :param segments_total: The number of segments of the playlist.
+        :type segments_total: int
+        :param segments_resumed: The number of segments already finished by an interrupted run.
+        :type segments_resumed: int
+        :return: None
+        """
+        with self._lock:
+            self.segments_total = segments_total
+            self.segments_resumed = segments_resumed
+            self.segments_completed = segments_resumed
+            self._start_time = time.monotonic()
+            self._end_time = None
+
+    def add_segments(self, count: int) -> None:
+        """
+        Add segments to the transfer, e.g. segments appended to a live playlist while it is recorded.
+
+        :param count: The number of segments.
+        :type count: int
+        :return: None
+        """
+        with self._lock:
+            self.segments_total += count
+
+    def record_segment(self, size: int, latency: float) -> None:
+        """
+        Record a transferred segment.
+
+        :param size: The size of the segment in bytes.
+        :type size: int
+        :param latency: The time (in seconds) from requesting the segment until its last byte arrived.
+        :type latency: float
+        :return: None
+        """
+        bucket = bisect.bisect_left(self.LATENCY_BUCKETS, latency)
+        with self._lock:
+            self.segments_completed += 1
+            self.bytes_downloaded += size
+            self.latency_counts[bucket] += 1
+
+    def record_retry(self) -> None:
+        """Record a retried segment request."""
+        with self._lock:
+            self.retries += 1
+
+    def record_hedge(self) -> None:
+        """Record a duplicate request sent for a slow segment."""
+        with self._lock:
+            self.hedges += 1
+
+    def record_cache_hit(self, size: int) -> None:
+        """
+        Record a segment served from the segment cache instead of over the network.
+
+        :param size: The size of the segment in bytes.
+        :type size: int
+        :return: None
+        """
+        with self._lock:
+            self.cache_hits += 1
+            self.cache_bytes_saved += size
+
+    def record_cache_miss(self) -> None:
+        """Record a segment fetched in full although the segment cache is enabled."""
+        with self._lock:
+            self.cache_misses += 1
+
+    def record_buffered(self, size: int) -> None:
+        """
+        Record the number of bytes of segment content currently buffered on disk (received but not yet appended to
+        the output).
+
+        :param size: The number of bytes.
+        :type size: int
+        :return: None
+        """
+        with self._lock:
+            self.peak_buffered_bytes = max(self.peak_buffered_bytes, size)
+
+    def record_concurrency(self, limit: int) -> None:
+        """
+        Record the number of segment requests in flight allowed by the concurrency controller.
+
+        :param limit: The number of segment requests in flight.
+        :type limit: int
+        :return: None
+        """
+        self.concurrency = limit
+
+    def finish(self, state: Optional[str] = None) -> None:
+        """
+        Stop measuring, freezing the elapsed time and recording the peak resident set size of the process so far
+        (shared by all jobs running in the process).
+
+        :param state: The final state of the job.
+        :type state: str
+        :return: None
+        """
+        peak_rss = get_peak_rss()
+        with self._lock:
+            self.state = state
+            self.peak_rss = peak_rss
+            if self._start_time is not None and self._end_time is None:
+                self._end_time = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Getter property for the time spent transferring segments.
+
+        :return: The elapsed time in seconds.
+        :rtype: float
+        """
+        if self._start_time is None:
+            return 0.0
+        return (self._end_time or time.monotonic()) - self._start_time
+
+    @property
+    def throughput(self) -> float:
+        """
+        Getter property for the average throughput of this run.
+
+        :return: The throughput in bytes per second.
+        :rtype: float
+        """
+        elapsed = self.elapsed
+        return self.bytes_downloaded / elapsed if elapsed else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        Getter property for the estimated time until all segments are transferred, based on the segment rate of
+        this run.
+
+        :return: The estimated remaining time in seconds, or None if no segment was transferred yet.
+        :rtype: float
+        """
+        with self._lock:
+            transferred = self.segments_completed - self.segments_resumed
+            remaining = self.segments_total - self.segments_completed
+        if remaining <= 0:
+            return 0.0
+        if transferred <= 0:
+            return None
+        return self.elapsed * remaining / transferred
+
+    def get_latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get the latency percentile, as the upper bound of the histogram bucket it falls in.
+
+        :param percentile: The percentile (between 0 and 100).
+        :type percentile: float
+        :return: The upper bound of the bucket in seconds (infinity for the overflow bucket), or None if no segment
+        was transferred yet.
+        :rtype: float
+        """
+        with self._lock:
+            counts = list(self.latency_counts)
+        total = sum(counts)
+        if not total:
+            return None
+
+        threshold = total * percentile / 100
+        cumulative = 0
+        for bound, count in zip(self.LATENCY_BUCKETS + (float('inf'),), counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return bound
+        return float('inf')
+
+    def to_dict(self) -> dict:
+        """
+        Get a snapshot of all metrics.
+
+        :return: The metrics.
+        :rtype: dict
+        """
+        with self._lock:
+            counts = list(self.latency_counts)
+            snapshot = {
+                'state': self.state,
+                'segments_total': self.segments_total,
+                'segments_completed': self.segments_completed,
+                'segments_resumed': self.segments_resumed,
+                'bytes_downloaded': self.bytes_downloaded,
+                'retries': self.retries,
+                'hedges': self.hedges,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'cache_bytes_saved': self.cache_bytes_saved,
+                'peak_buffered_bytes': self.peak_buffered_bytes,
+                'peak_rss': self.peak_rss,
+                'concurrency': self.concurrency
+            }
+        bounds = [f'<={bound}s' for bound in self.LATENCY_BUCKETS] + [f'>{self.LATENCY_BUCKETS[-1]}s']
+        snapshot.update({
+            'elapsed': round(self.elapsed, 3),
+            'throughput': round(self.throughput, 1),
+            'eta': self.eta,
+            'latency_p50': self.get_latency_percentile(50),
+            'latency_p95': self.get_latency_percentile(95),
+            'latency_histogram': dict(zip(bounds, counts))
+        })
+        return snapshot
+
+    def to_json(self) -> str:
+        """
+        Get a snapshot of all metrics as JSON.
+
+        :return: The metrics as JSON document.
+        :rtype: str
+        """
+        snapshot = self.to_dict()
+        for key in ('latency_p50', 'latency_p95'):
+            if snapshot[key] == float('inf'):
+                snapshot[key] = None  # JSON has no infinity
+        return json.dumps(snapshot, indent=4)
+
+    def dump(self, file_path: str) -> None:
+        """
+        Write a snapshot of all metrics as JSON to the given file.
+
+        :param file_path: The path of the file.
+        :type file_path: str
+        :return: None
+        """
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(self.to_json())
+
+    def __str__(self) -> str:
+        """
+        Get a one line summary of the metrics.
+
+        :return: The summary.
+        :rtype: str
+        """
+        eta = self.eta
+        p95 = self.get_latency_percentile(95)
+        if p95 is None:
+            latency = '-'
+        elif p95 == float('inf'):
+            latency = f'>{self.LATENCY_BUCKETS[-1]}s'
+        else:
+            latency = f'<={p95}s'
+        parts = [
+            f'{self.throughput / 1024 ** 2:.2f} MiB/s',
+            f'{self.segments_completed}/{self.segments_total} segments',
+            f'ETA {"-" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))}',
+            f'{self.retries} retries',
+            f'p95 {latency}'
+        ]
+        if self.hedges:
+            parts.append(f'{self.hedges} hedged')
+        if self.cache_hits or self.cache_misses:
+            parts.append(
+                f'cache {self.cache_hits}/{self.cache_hits + self.cache_misses} hits, '
+                f'{self.cache_bytes_saved / 1024 ** 2:.1f} MiB saved'
+            )
+        if self.peak_buffered_bytes:
+            parts.append(f'peak {self.peak_buffered_bytes / 1024 ** 2:.1f} MiB buffered')
+        if self.peak_rss is not None:
+            parts.append(f'peak RSS {self.peak_rss / 1024 ** 2:.1f} MiB')
+        if self.concurrency is not None:
+            parts.append(f'{self.concurrency} in flight')
+        return ' | '.join(parts)
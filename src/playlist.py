@@ -0,0 +1,329 @@
+import re
+from typing import Optional, Union
+from urllib.parse import urljoin
+
+PATTERN_ATTRIBUTE = re.compile(r'(?P<key>[A-Z0-9\-]+)=(?P<value>"[^"]*"|[^,]*)')  # Attribute list of a tag
+
+
+def parse_attributes(attributes: str) -> dict:
+    """
+    Parse an HLS attribute list (e.g. 'BANDWIDTH=1280000,RESOLUTION=1280x720') into a dictionary.
+
+    :param attributes: The attribute list in a string format.
+    :type attributes: str
+    :return: The attributes mapped by their names.
+    :rtype: dict
+    """
+    return {
+        match.group('key'): match.group('value').strip('"')
+        for match in PATTERN_ATTRIBUTE.finditer(attributes)
+    }
+
+
+class SegmentKey:
+    """Class holding the encryption (EXT-X-KEY) of the media segments following it in a media playlist."""
+
+    def __init__(self, method: str, uri: Optional[str] = None, iv: Optional[bytes] = None) -> None:
+        """
+        Initialize the SegmentKey class.
+
+        :param method: The encryption method (e.g. AES-128).
+        :type method: str
+        :param uri: The absolute URL of the key.
+        :type uri: str
+        :param iv: The initialization vector (derived from the media sequence number of every segment if not given).
+        :type iv: bytes
+        """
+        self.method = method
+        self.uri = uri
+        self.iv = iv
+
+    def __repr__(self) -> str:
+        return f'SegmentKey(method={self.method!r}, uri={self.uri!r})'
+
+
+def parse_key(attributes: str, url: str) -> Optional[SegmentKey]:
+    """
+    Parse the attribute list of an EXT-X-KEY tag.
+
+    :param attributes: The attribute list in a string format.
+    :type attributes: str
+    :param url: The URL of the playlist, used to resolve a relative key URI.
+    :type url: str
+    :return: The key, or None if the segments are not encrypted (METHOD=NONE).
+    :rtype: SegmentKey
+    :raises ValueError: If the initialization vector is not a 128-bit hexadecimal number.
+    """
+    attributes = parse_attributes(attributes)
+    method = attributes.get('METHOD', 'NONE')
+    if method == 'NONE':
+        return None
+
+    iv = attributes.get('IV')
+    if iv is not None:
+        digits = iv[2:] if iv.lower().startswith('0x') else iv
+        if not digits or len(digits) > 32:
+            raise ValueError(f'Invalid initialization vector "{iv}".')
+        iv = bytes.fromhex(digits.rjust(32, '0'))
+    uri = attributes.get('URI')
+    return SegmentKey(method, urljoin(url, uri) if uri else None, iv)
+
+
+class Segment:
+    """Class holding the details of a single media segment of a media playlist."""
+
+    def __init__(
+            self,
+            index: int,
+            uri: str,
+            duration: float,
+            sequence: int,
+            key: Optional[SegmentKey] = None
+    ) -> None:
+        """
+        Initialize the Segment class.
+
+        :param index: The zero based position of the segment in the playlist.
+        :type index: int
+        :param uri: The absolute URL of the segment.
+        :type uri: str
+        :param duration: The duration of the segment in seconds.
+        :type duration: float
+        :param sequence: The media sequence number of the segment.
+        :type sequence: int
+        :param key: The encryption of the segment (None if not encrypted).
+        :type key: SegmentKey
+        """
+        self.index = index
+        self.uri = uri
+        self.duration = duration
+        self.sequence = sequence
+        self.key = key
+
+    @property
+    def iv(self) -> bytes:
+        """
+        Getter property for the initialization vector the segment is encrypted with.
+
+        :return: The IV of the key, or the media sequence number as 128-bit big-endian number if the key has none.
+        :rtype: bytes
+        """
+        if self.key is not None and self.key.iv is not None:
+            return self.key.iv
+        return self.sequence.to_bytes(16, 'big')
+
+    def __repr__(self) -> str:
+        return f'Segment(index={self.index}, sequence={self.sequence}, uri={self.uri!r})'
+
+
+class Variant:
+    """Class holding the details of a single variant stream of a master playlist."""
+
+    def __init__(
+            self,
+            uri: Optional[str],
+            bandwidth: Optional[str] = None,
+            name: Optional[str] = None,
+            resolution: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the Variant class.
+
+        :param uri: The absolute URL of the variant media playlist (None if the variant is only known by its details).
+        :type uri: str
+        :param bandwidth: The bandwidth of the variant.
+        :type bandwidth: str
+        :param name: The name of the variant.
+        :type name: str
+        :param resolution: The resolution of the variant.
+        :type resolution: str
+        """
+        self.uri = uri
+        self.bandwidth = bandwidth
+        self.name = name
+        self.resolution = resolution
+
+    @property
+    def bits_per_second(self) -> int:
+        """
+        Getter property for the bandwidth of the variant as a number.
+
+        :return: The bandwidth in bits per second, or 0 if unknown.
+        :rtype: int
+        """
+        try:
+            return int(self.bandwidth or 0)
+        except ValueError:
+            return 0
+
+    def to_dict(self) -> dict:
+        """
+        Get the displayable details of the variant, in the format used by pym3u8downloader.
+
+        :return: The name, bandwidth and resolution of the variant.
+        :rtype: dict
+        """
+        return {'bandwidth': self.bandwidth, 'name': self.name, 'resolution': self.resolution}
+
+    def matches(
+            self,
+            name: Optional[str] = None,
+            bandwidth: Optional[str] = None,
+            resolution: Optional[str] = None
+    ) -> bool:
+        """
+        Check if the variant matches the given details. Details which are not provided are ignored.
+
+        :param name: The name of the variant.
+        :type name: str
+        :param bandwidth: The bandwidth of the variant.
+        :type bandwidth: str
+        :param resolution: The resolution of the variant.
+        :type resolution: str
+        :return: True if the variant matches, False otherwise.
+        :rtype: bool
+        """
+        if name and self.name != name:
+            return False
+        if bandwidth and self.bandwidth != bandwidth:
+            return False
+        if resolution and self.resolution != resolution:
+            return False
+
+        return True
+
+    def __repr__(self) -> str:
+        return f'Variant(name={self.name!r}, bandwidth={self.bandwidth!r}, resolution={self.resolution!r})'
+
+
+class MediaPlaylist:
+    """Class holding a parsed media playlist."""
+
+    def __init__(self, url: str, segments: list, target_duration: float, media_sequence: int, is_endlist: bool) -> None:
+        """
+        Initialize the MediaPlaylist class.
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :param segments: The segments of the playlist in playlist order.
+        :type segments: list[Segment]
+        :param target_duration: The maximum segment duration in seconds (EXT-X-TARGETDURATION).
+        :type target_duration: float
+        :param media_sequence: The media sequence number of the first segment (EXT-X-MEDIA-SEQUENCE).
+        :type media_sequence: int
+        :param is_endlist: A flag to indicate if no more segments will be added (EXT-X-ENDLIST).
+        :type is_endlist: bool
+        """
+        self.url = url
+        self.segments = segments
+        self.target_duration = target_duration
+        self.media_sequence = media_sequence
+        self.is_endlist = is_endlist
+
+    @property
+    def duration(self) -> float:
+        """
+        Getter property for the total duration of the segments.
+
+        :return: The duration in seconds.
+        :rtype: float
+        """
+        return sum(segment.duration for segment in self.segments)
+
+
+class MasterPlaylist:
+    """Class holding a parsed master playlist."""
+
+    def __init__(self, url: str, variants: list) -> None:
+        """
+        Initialize the MasterPlaylist class.
+
+        :param url: The URL of the playlist.
+        :type url: str
+        :param variants: The variant streams of the playlist.
+        :type variants: list[Variant]
+        """
+        self.url = url
+        self.variants = variants
+
+    def search(
+            self,
+            name: Optional[str] = None,
+            bandwidth: Optional[str] = None,
+            resolution: Optional[str] = None
+    ) -> list:
+        """
+        Search the variants matching the given details.
+
+        :param name: The name of the variant.
+        :type name: str
+        :param bandwidth: The bandwidth of the variant.
+        :type bandwidth: str
+        :param resolution: The resolution of the variant.
+        :type resolution: str
+        :return: The matching variants.
+        :rtype: list[Variant]
+        """
+        return [variant for variant in self.variants if variant.matches(name, bandwidth, resolution)]
+
+
+def parse_playlist(content: str, url: str) -> Union[MediaPlaylist, MasterPlaylist]:
+    """
+    Parse the content of an m3u8 file into either a media or a master playlist.
+
+    :param content: The content of the m3u8 file.
+    :type content: str
+    :param url: The URL the content was fetched from, used to resolve relative URIs.
+    :type url: str
+    :return: The parsed playlist.
+    :rtype: MediaPlaylist | MasterPlaylist
+    :raises ValueError: If the content is neither a media nor a master playlist, or has an invalid key.
+    """
+    lines = [line.strip() for line in content.splitlines()]
+    segments = []
+    variants = []
+    target_duration = 0.0
+    media_sequence = 0
+    is_endlist = False
+    duration = None
+    key = None
+    variant_attributes = None
+
+    for line in lines:
+        if not line:
+            continue
+        elif line.startswith('#EXT-X-STREAM-INF:'):
+            variant_attributes = parse_attributes(line.split(':', 1)[1])
+        elif line.startswith('#EXTINF:'):
+            duration = float(line.split(':', 1)[1].split(',')[0] or 0)
+        elif line.startswith('#EXT-X-TARGETDURATION:'):
+            target_duration = float(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+            media_sequence = int(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-ENDLIST'):
+            is_endlist = True
+        elif line.startswith('#EXT-X-KEY:'):
+            key = parse_key(line.split(':', 1)[1], url)
+        elif line.startswith('#'):
+            continue
+        elif variant_attributes is not None:
+            variants.append(
+                Variant(
+                    urljoin(url, line),
+                    bandwidth=variant_attributes.get('BANDWIDTH'),
+                    name=variant_attributes.get('NAME'),
+                    resolution=variant_attributes.get('RESOLUTION')
+                )
+            )
+            variant_attributes = None
+        elif duration is not None:
+            index = len(segments)
+            segments.append(Segment(index, urljoin(url, line), duration, media_sequence + index, key))
+            duration = None
+
+    if variants:
+        return MasterPlaylist(url, variants)
+    elif segments or is_endlist or target_duration:
+        return MediaPlaylist(url, segments, target_duration, media_sequence, is_endlist)
+
+    raise ValueError(f'File "{url}" is not identified as either playlist or master.')
@@ -0,0 +1,127 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+
+class JobProfiler:
+    """
+    Class for profiling a single download job with cProfile and/or tracemalloc.
+
+    cProfile profiles the thread the profiler is started on, i.e. the job thread: the asyncio engine runs entirely on
+    it, while the segments of the threaded engine show up as time waiting for the segment threads. tracemalloc traces
+    the whole process; it is started by the first job tracing memory and stopped once no job traces it anymore.
+    """
+
+    _tracing_jobs = 0  # Number of jobs currently tracing memory
+    _tracing_owned = False  # Whether tracemalloc was started by a job, and is to be stopped by the last one
+    _tracing_lock = threading.Lock()
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False, limit: int = 30) -> None:
+        """
+        Initialize the JobProfiler class.
+
+        :param profile: A flag to profile the job with cProfile.
+        :type profile: bool
+        :param trace_memory: A flag to trace the memory allocations with tracemalloc.
+        :type trace_memory: bool
+        :param limit: The number of functions and allocations listed in the report.
+        :type limit: int
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.limit = limit
+        self.notes = []
+        self._profiler = None
+        self._tracing = False
+        self._snapshot = None
+        self._traced_memory = None
+        self._start_time = None
+        self._elapsed = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Getter property for the profiling status.
+
+        :return: True if cProfile or tracemalloc is used, False otherwise.
+        :rtype: bool
+        """
+        return self.profile or self.trace_memory
+
+    def start(self) -> None:
+        """Start profiling on the calling thread and/or tracing memory."""
+        self._start_time = time.perf_counter()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:  # Only one profiler can be active at a time since Python 3.12
+                self._profiler = None
+                self.notes.append('Not profiled: another job was being profiled at the same time.')
+        if self.trace_memory:
+            with JobProfiler._tracing_lock:
+                if JobProfiler._tracing_jobs == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    JobProfiler._tracing_owned = True
+                JobProfiler._tracing_jobs += 1
+            self._tracing = True
+
+    def stop(self) -> None:
+        """Stop profiling and take the snapshot of the memory allocations. Does nothing if already stopped."""
+        if self._start_time is not None and self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._start_time
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._tracing:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._traced_memory = tracemalloc.get_traced_memory()
+            with JobProfiler._tracing_lock:
+                JobProfiler._tracing_jobs -= 1
+                if JobProfiler._tracing_jobs == 0 and JobProfiler._tracing_owned:
+                    tracemalloc.stop()
+                    JobProfiler._tracing_owned = False
+            self._tracing = False
+
+    def write(self, report_file_path: str, profile_file_path: Optional[str] = None, title: str = '') -> None:
+        """
+        Write the readable report and, if profiled, the cProfile statistics (for pstats or other viewers).
+
+        :param report_file_path: The path of the report.
+        :type report_file_path: str
+        :param profile_file_path: The path of the cProfile statistics.
+        :type profile_file_path: str
+        :param title: The first line of the report, e.g. the URL of the job.
+        :type title: str
+        :return: None
+        """
+        sections = [title] if title else []
+        if self._elapsed is not None:
+            sections.append(f'Profiled for {self._elapsed:.2f}s')
+        sections.extend(self.notes)
+
+        if self._profiler is not None:
+            if profile_file_path:
+                self._profiler.dump_stats(profile_file_path)
+            for sort_key, heading in (('cumulative', 'cumulative time'), ('tottime', 'own time')):
+                stream = io.StringIO()
+                pstats.Stats(self._profiler, stream=stream).sort_stats(sort_key).print_stats(self.limit)
+                sections.append(f'Top {self.limit} functions by {heading}\n{stream.getvalue().strip()}')
+
+        if self._snapshot is not None:
+            current, peak = self._traced_memory
+            statistics = self._snapshot.filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            )).statistics('lineno')
+            lines = [
+                f'Top {self.limit} allocations by line (whole process; '
+                f'traced memory {current / 1024 ** 2:.1f} MiB, peak {peak / 1024 ** 2:.1f} MiB)'
+            ]
+            lines.extend(str(statistic) for statistic in statistics[:self.limit])
+            sections.append('\n'.join(lines))
+
+        with open(report_file_path, 'w', encoding='utf-8') as file:
+            file.write('\n\n'.join(sections) + '\n')
@@ -0,0 +1,95 @@
+from collections import deque
+
+
+class ProgressEvent:
+    """Class holding a single progress update of a download job."""
+
+    def __init__(self, job_id: int, stage: str, completed: int = 0, total: int = 0, message: str = '') -> None:
+        """
+        Initialize the ProgressEvent class.
+
+        :param job_id: The identifier of the job the update belongs to.
+        :type job_id: int
+        :param stage: The name of the stage the job is in.
+        :type stage: str
+        :param completed: The number of completed items of the stage.
+        :type completed: int
+        :param total: The total number of items of the stage (0 if unknown).
+        :type total: int
+        :param message: Additional information, e.g. the merge throughput.
+        :type message: str
+        """
+        self.job_id = job_id
+        self.stage = stage
+        self.completed = completed
+        self.total = total
+        self.message = message
+
+    @property
+    def percentage(self) -> int:
+        """
+        Getter property for the completed percentage of the stage.
+
+        :return: The completed percentage, or 0 if the total is unknown.
+        :rtype: int
+        """
+        return self.completed * 100 // self.total if self.total else 0
+
+    def __str__(self) -> str:
+        """
+        Get the text displayed for the update.
+
+        :return: The display text.
+        :rtype: str
+        """
+        if self.message:
+            return self.message
+        if self.total:
+            return f'{self.stage}: {self.percentage}% ({self.completed}/{self.total})'
+        return self.stage
+
+
+class ProgressChannel:
+    """
+    Class for passing progress events from download threads to the UI thread.
+
+    Download threads publish events without ever waiting on the UI: appending to a deque is atomic, so no lock is
+    involved. The UI thread drains the channel on its own schedule and only keeps the latest event of every job, so
+    any number of updates between two refreshes costs a single widget update.
+    """
+
+    def __init__(self, max_events: int = 1024) -> None:
+        """
+        Initialize the ProgressChannel class.
+
+        :param max_events: The maximum number of undrained events kept; the oldest are dropped first.
+        :type max_events: int
+        """
+        self._events = deque(maxlen=max_events)
+
+    def publish(self, event: ProgressEvent) -> None:
+        """
+        Publish a progress event. Safe to call from any thread.
+
+        :param event: The progress event.
+        :type event: ProgressEvent
+        :return: None
+        """
+        self._events.append(event)
+
+    def drain(self) -> dict:
+        """
+        Remove all published events, keeping the latest event of every job.
+
+        :return: The latest event of every job with updates, keyed by job identifier, in publishing order.
+        :rtype: dict[int, ProgressEvent]
+        """
+        latest = {}
+        while True:
+            try:
+                event = self._events.popleft()
+            except IndexError:
+                break
+            latest.pop(event.job_id, None)
+            latest[event.job_id] = event
+        return latest
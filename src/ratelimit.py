@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Optional
+
+
+class BandwidthLimiter:
+    """
+    Class for limiting the bandwidth used by all download jobs together, as a token bucket refilled at the configured
+    rate (bytes per second) and holding at most the configured burst.
+
+    Consumers reserve the bytes they receive and wait for the returned delay. Reservations are served in arrival order,
+    so when every job keeps a single reservation outstanding (see SegmentDownloader._reserve_bandwidth) the limit is
+    shared equally between the jobs, regardless of how many segments each job fetches in parallel. The rate can be
+    changed at any time from any thread.
+    """
+
+    def __init__(self, rate: float = 0, burst: Optional[float] = None) -> None:
+        """
+        Initialize the BandwidthLimiter class.
+
+        :param rate: The limit in bytes per second; 0 disables the limit.
+        :type rate: float
+        :param burst: The maximum number of bytes received at once after an idle period (one second worth if not given).
+        :type burst: float
+        """
+        self._lock = threading.Lock()
+        self._rate = 0
+        self._burst = 0
+        self._tokens = 0
+        self._updated = time.monotonic()
+        self.set_rate(rate, burst)
+
+    @property
+    def rate(self) -> float:
+        """
+        Getter property for the limit.
+
+        :return: The limit in bytes per second, 0 if unlimited.
+        :rtype: float
+        """
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """
+        Getter property for the size of the bucket.
+
+        :return: The maximum number of bytes received at once after an idle period.
+        :rtype: float
+        """
+        return self._burst
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Change the limit. Delays already handed out are not recomputed.
+
+        :param rate: The limit in bytes per second; 0 disables the limit.
+        :type rate: float
+        :param burst: The maximum number of bytes received at once after an idle period (one second worth if not given).
+        :type burst: float
+        :return: None
+        """
+        if rate < 0:
+            raise ValueError('rate should not be negative.')
+        if burst is not None and burst < 0:
+            raise ValueError('burst should not be negative.')
+
+        with self._lock:
+            self._rate = rate
+            self._burst = rate if burst is None else burst
+            self._tokens = self._burst
+            self._updated = time.monotonic()
+
+    def reserve(self, amount: int) -> float:
+        """
+        Reserve the given number of bytes.
+
+        :param amount: The number of bytes.
+        :type amount: int
+        :return: The time (in seconds) the caller should wait before receiving more.
+        :rtype: float
+        """
+        with self._lock:
+            if not self._rate:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= amount
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
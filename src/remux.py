@@ -0,0 +1,176 @@
+import shlex
+import subprocess
+import tempfile
+
+from pym3u8downloader import M3U8DownloaderError
+
+from .writer import copy_file
+
+OUTPUT_PLACEHOLDER = '{output}'  # Placeholder for the output file path in muxer commands
+
+
+def get_muxer_arguments(command: str, output_file_path: str) -> list:
+    """
+    Split the muxer command into its arguments and substitute the output file path.
+
+    :param command: The muxer command, e.g. 'ffmpeg -loglevel error -y -f mpegts -i pipe:0 -c copy {output}'.
+    :type command: str
+    :param output_file_path: The path of the output file.
+    :type output_file_path: str
+    :return: The arguments of the muxer process.
+    :rtype: list[str]
+    :raises ValueError: If the command is empty or does not contain the output placeholder.
+    """
+    arguments = shlex.split(command)
+    if not arguments:
+        raise ValueError('remux_command should not be empty.')
+    if not any(OUTPUT_PLACEHOLDER in argument for argument in arguments):
+        raise ValueError(f'remux_command should contain the {OUTPUT_PLACEHOLDER} placeholder.')
+    return [argument.replace(OUTPUT_PLACEHOLDER, output_file_path) for argument in arguments]
+
+
+class MuxerPipe:
+    """
+    Class for streaming the MPEG-TS content of the segments into the standard input of a local muxer process
+    (e.g. ffmpeg), which writes the output file itself, so the output container is produced in the same pass as the
+    download instead of reading and writing the concatenated segments again.
+
+    It is a write-only file-like object. Used as a context manager, the muxer is closed when the block completes and
+    aborted when it fails.
+    """
+
+    _abort_timeout = 10  # Time (in seconds) an aborted muxer is given to finish the output file before it is killed
+
+    def __init__(self, command: str, output_file_path: str) -> None:
+        """
+        Initialize the MuxerPipe class and start the muxer process.
+
+        :param command: The muxer command, with {output} in place of the output file path.
+        :type command: str
+        :param output_file_path: The path of the output file.
+        :type output_file_path: str
+        :raises M3U8DownloaderError: If the muxer cannot be started.
+        """
+        arguments = get_muxer_arguments(command, output_file_path)
+        self.output_file_path = output_file_path
+        self._offset = 0
+        self._stderr = tempfile.TemporaryFile()  # A file rather than a pipe, so a chatty muxer never blocks on it
+        try:
+            self._process = subprocess.Popen(
+                arguments, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+            )
+        except OSError as e:
+            self._stderr.close()
+            raise M3U8DownloaderError(message=f'Unable to start muxer "{arguments[0]}". {e.strerror}') from e
+
+    def __enter__(self) -> 'MuxerPipe':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, data: bytes) -> int:
+        """
+        Write the data to the standard input of the muxer.
+
+        :param data: The data.
+        :type data: bytes
+        :return: The number of bytes written.
+        :rtype: int
+        :raises M3U8DownloaderError: If the muxer exited.
+        """
+        try:
+            self._process.stdin.write(data)
+        except (BrokenPipeError, ValueError) as e:
+            raise M3U8DownloaderError(message=f'Muxer exited unexpectedly. {self._read_error()}'.strip()) from e
+        self._offset += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        """
+        Flush the data written so far to the muxer.
+
+        :raises M3U8DownloaderError: If the muxer exited.
+        """
+        try:
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise M3U8DownloaderError(message=f'Muxer exited unexpectedly. {self._read_error()}'.strip()) from e
+
+    def tell(self) -> int:
+        """
+        Get the number of bytes written to the muxer.
+
+        :return: The number of bytes.
+        :rtype: int
+        """
+        return self._offset
+
+    def copy_from(self, source_fd: int, buffer_size: int = 1024 * 1024) -> int:
+        """
+        Write the source file, from its current position, to the muxer, copying inside the kernel where supported.
+
+        :param source_fd: The file descriptor of the source file.
+        :type source_fd: int
+        :param buffer_size: The size of the buffer used when the kernel-side copies are not supported.
+        :type buffer_size: int
+        :return: The number of bytes copied.
+        :rtype: int
+        :raises M3U8DownloaderError: If the muxer exited.
+        """
+        self.flush()
+        try:
+            size = copy_file(source_fd, self._process.stdin.fileno(), buffer_size)
+        except BrokenPipeError as e:
+            raise M3U8DownloaderError(message=f'Muxer exited unexpectedly. {self._read_error()}'.strip()) from e
+        self._offset += size
+        return size
+
+    def close(self) -> None:
+        """
+        Signal the end of the input and wait until the muxer finished the output file.
+
+        :raises M3U8DownloaderError: If the muxer failed.
+        """
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._process.wait()
+        error = self._read_error()
+        self._stderr.close()
+        if returncode != 0:
+            raise M3U8DownloaderError(message=f'Muxer failed with exit code {returncode}. {error}'.strip())
+
+    def abort(self) -> None:
+        """
+        Stop feeding the muxer after a failed or cancelled download. The muxer is given the chance to finish the
+        output file with the segments written so far, and killed if it does not exit in time.
+        """
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(self._abort_timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._stderr.close()
+
+    def _read_error(self) -> str:
+        """
+        Get the last line the muxer wrote to its standard error.
+
+        :return: The line, empty if none.
+        :rtype: str
+        """
+        try:
+            self._stderr.seek(0)
+            lines = self._stderr.read().decode(errors='replace').strip().splitlines()
+        except (OSError, ValueError):
+            return ''
+        return lines[-1].strip() if lines else ''
@@ -0,0 +1,200 @@
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from .playlist import Variant
+
+
+class JobState:
+    """This class holds all the states a queued download job can be in"""
+
+    QUEUED = 'Queued'  # Job is waiting for a free worker
+    RUNNING = 'Running'  # Job is being downloaded
+    COMPLETED = 'Completed'  # Job finished successfully
+    FAILED = 'Failed'  # Job finished with an error
+    CANCELLED = 'Cancelled'  # Job was cancelled by the user
+    VARIANT_REQUIRED = 'Select Variant'  # Job stopped because the playlist is a master playlist
+
+
+class DownloadJob:
+    """Class holding the parameters and the current state of a single queued download."""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+            self,
+            input_url: str,
+            output_file: str,
+            verify_ssl: bool,
+            is_master: bool,
+            variant: Optional[Variant] = None,
+            live: bool = False
+    ) -> None:
+        """
+        Initialize the DownloadJob class.
+
+        :param input_url: Input URL (.m3u8).
+        :type input_url: str
+        :param output_file: Output file (.mp4).
+        :type output_file: str
+        :param verify_ssl: A flag to indicate if SSL warning needs skip.
+        :type verify_ssl: bool
+        :param is_master: A flag to indicate if playlist is master.
+        :type is_master: bool
+        :param variant: The variant to download in case of master playlist.
+        :type variant: Variant
+        :param live: A flag to record live and event playlists until they end.
+        :type live: bool
+        """
+        self.job_id = next(self._ids)
+        self.input_url = input_url
+        self.output_file = output_file
+        self.verify_ssl = verify_ssl
+        self.is_master = is_master
+        self.variant = variant
+        self.live = live
+        self.state = JobState.QUEUED
+        self.message = ''
+        self.on_finished = None
+
+    def finish(self, state: str, message: str = '') -> None:
+        """
+        Record the final state of the job and notify the owning scheduler.
+
+        :param state: The final state of the job (one of JobState).
+        :type state: str
+        :param message: Additional information such as the error message.
+        :type message: str
+        :return: None
+        """
+        self.state = state
+        self.message = message
+        if self.on_finished:
+            self.on_finished(self)
+
+
+class JobScheduler:
+    """Class for running queued download jobs concurrently under a worker limit."""
+
+    def __init__(self, thread_factory: Callable[[DownloadJob], threading.Thread], max_workers: int = 2) -> None:
+        """
+        Initialize the JobScheduler class.
+
+        :param thread_factory: Callable creating the (not yet started) thread that downloads the given job.
+        :type thread_factory: Callable[[DownloadJob], threading.Thread]
+        :param max_workers: The maximum number of jobs that can run at the same time.
+        :type max_workers: int
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers should be at least 1.')
+
+        self.thread_factory = thread_factory
+        self.jobs = []
+        self._max_workers = max_workers
+        self._pending = deque()
+        self._running = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        """
+        Getter property for the maximum number of concurrent jobs.
+
+        :return: The maximum number of concurrent jobs.
+        :rtype: int
+        """
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int) -> None:
+        """
+        Setter property for the maximum number of concurrent jobs.
+
+        :param value: The new maximum number of concurrent jobs.
+        :type value: int
+        """
+        if value < 1:
+            raise ValueError('max_workers should be at least 1.')
+        self._max_workers = value
+        self._start_pending()
+
+    def enqueue(self, job: DownloadJob) -> DownloadJob:
+        """
+        Add a job to the queue and start it as soon as a worker is free.
+
+        :param job: The job to be downloaded.
+        :type job: DownloadJob
+        :return: The queued job.
+        :rtype: DownloadJob
+        """
+        job.on_finished = self._job_finished
+        with self._lock:
+            self.jobs.append(job)
+            self._pending.append(job)
+        self._start_pending()
+        return job
+
+    def cancel(self, job: DownloadJob) -> None:
+        """
+        Cancel the job. Queued jobs are removed from the queue, running jobs are asked to stop.
+
+        :param job: The job to be cancelled.
+        :type job: DownloadJob
+        :return: None
+        """
+        with self._lock:
+            if job in self._pending:
+                self._pending.remove(job)
+                job.state = JobState.CANCELLED
+                return
+            thread = self._running.get(job.job_id)
+
+        if thread is not None and hasattr(thread, 'cancel'):
+            thread.cancel()
+
+    def is_busy(self) -> bool:
+        """
+        Check if any job is queued or running.
+
+        :return: True if any job is queued or running, False otherwise.
+        :rtype: bool
+        """
+        with self._lock:
+            return bool(self._pending) or bool(self._running)
+
+    def running_threads(self) -> list:
+        """
+        Get the threads of all running jobs.
+
+        :return: The list of running threads.
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._running.values())
+
+    def _job_finished(self, job: DownloadJob) -> None:
+        """
+        Release the worker of a finished job and start the next queued job.
+
+        :param job: The finished job.
+        :type job: DownloadJob
+        :return: None
+        """
+        with self._lock:
+            self._running.pop(job.job_id, None)
+        self._start_pending()
+
+    def _start_pending(self) -> None:
+        """Start queued jobs while workers are available."""
+        started = []
+        with self._lock:
+            while self._pending and len(self._running) < self._max_workers:
+                job = self._pending.popleft()
+                job.state = JobState.RUNNING
+                thread = self.thread_factory(job)
+                self._running[job.job_id] = thread
+                started.append(thread)
+
+        for thread in started:
+            thread.start()
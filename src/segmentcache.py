@@ -0,0 +1,326 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .assets import get_cache_directory
+from .constants import Constants
+
+
+class SegmentCache:
+    """
+    Class for keeping downloaded segments on disk, so segments fetched again (by another job, for another output file
+    or as part of another variant) are served locally instead of over the network.
+
+    Segments are looked up by their absolute URL and stored with the validators (ETag and Last-Modified) of the
+    response, which the downloader sends in a conditional request (get_headers) and serves the cached copy (get) only
+    if the origin answers 304 Not Modified; segments cached without validators are served as they are. The content is
+    stored once per SHA-256 digest, so identical segments served under different URLs take
+    the space of one. When the total size exceeds the maximum size, the least recently used segments are evicted. The
+    index is kept in memory and written to disk by flush(). All methods are thread-safe, so a single cache can be
+    shared by all download threads.
+    """
+
+    _index_file_name = 'index.json'
+    _chunk_size = 1024 * 1024  # Size of the chunks segments are hashed and copied in
+
+    def __init__(
+            self,
+            directory: Optional[str] = None,
+            max_size: int = Constants.DEFAULT_SEGMENT_CACHE_SIZE
+    ) -> None:
+        """
+        Initialize the SegmentCache class.
+
+        :param directory: The cache directory (the segments directory in the per-user cache directory if not given).
+        :type directory: str
+        :param max_size: The maximum total size (in bytes) of the cached segments; 0 disables the cache.
+        :type max_size: int
+        """
+        if max_size < 0:
+            raise ValueError('max_size should not be negative.')
+
+        self.directory = directory or os.path.join(get_cache_directory(), Constants.SEGMENT_CACHE_DIRECTORY)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = None  # Entries by URL, least recently used first; loaded on first use
+        self._blobs = {}  # Number of entries referencing every digest
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Getter property for the state of the cache.
+
+        :return: True if segments are cached, False otherwise.
+        :rtype: bool
+        """
+        return self.max_size > 0
+
+    @property
+    def size(self) -> int:
+        """
+        Getter property for the total size of the cached segments.
+
+        :return: The size in bytes.
+        :rtype: int
+        """
+        with self._lock:
+            self._load()
+            return self._size
+
+    def get(self, url: str, destination_path: str) -> Optional[int]:
+        """
+        Copy the cached content of the segment to the given file and mark it as recently used.
+
+        :param url: The absolute URL of the segment.
+        :type url: str
+        :param destination_path: The path the content is written to.
+        :type destination_path: str
+        :return: The size of the segment in bytes, or None if it is not cached (or the cached copy is damaged).
+        :rtype: int
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                self._dirty = True
+
+        size = None
+        if entry is not None:
+            size = self._copy_blob(entry['digest'], destination_path)
+
+        with self._lock:
+            if size is None:
+                if entry is not None and self._entries.get(url) is entry:
+                    self._remove_entry(url)
+            else:
+                self.hits += 1
+        return size
+
+    def get_headers(self, url: str) -> Optional[dict]:
+        """
+        Get the conditional request headers revalidating the cached segment.
+
+        :param url: The absolute URL of the segment.
+        :type url: str
+        :return: The If-None-Match and If-Modified-Since headers (empty if the segment was cached without validators),
+        or None if the segment is not cached.
+        :rtype: dict
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(url)
+        if entry is None:
+            return None
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_miss(self) -> None:
+        """Count a segment which was fetched in full: not cached, damaged, or changed since it was cached."""
+        with self._lock:
+            self.misses += 1
+
+    def put(
+            self,
+            url: str,
+            source_path: str,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store a copy of the segment file, evicting the least recently used segments if the cache is full.
+
+        :param url: The absolute URL of the segment.
+        :type url: str
+        :param source_path: The path of the file holding the content of the segment.
+        :type source_path: str
+        :param etag: The ETag header of the response.
+        :type etag: str
+        :param last_modified: The Last-Modified header of the response.
+        :type last_modified: str
+        :return: None
+        """
+        if not self.enabled:
+            return
+
+        try:
+            size = os.path.getsize(source_path)
+            if size > self.max_size:
+                return
+            digest = self._get_digest(source_path)
+            blob_path = self._get_blob_path(digest)
+            if not os.path.isfile(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                temp_path = f'{blob_path}.{threading.get_ident()}.tmp'
+                shutil.copyfile(source_path, temp_path)
+                os.replace(temp_path, blob_path)
+        except OSError:
+            return  # Read-only or full cache directory: the download goes on without caching
+
+        with self._lock:
+            self._load()
+            if url in self._entries:
+                self._remove_entry(url, blob_path)
+            self._add_entry(url, {'digest': digest, 'size': size, 'etag': etag, 'last_modified': last_modified})
+            while self._size > self.max_size:
+                self._remove_entry(next(iter(self._entries)), blob_path)
+                self.evictions += 1
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write the index to disk if it changed since it was loaded or last written."""
+        with self._lock:
+            if not self._dirty:
+                return
+            index = {'entries': [dict(entry, url=url) for url, entry in self._entries.items()]}
+            self._dirty = False
+
+        index_path = os.path.join(self.directory, self._index_file_name)
+        temp_path = f'{index_path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(index, file)
+            os.replace(temp_path, index_path)
+        except OSError:
+            pass
+
+    def _get_digest(self, path: str) -> str:
+        """
+        Get the digest of the content of the file, read in chunks.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The SHA-256 digest of the content.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            while True:
+                chunk = file.read(self._chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _copy_blob(self, digest: str, destination_path: str) -> Optional[int]:
+        """
+        Copy the content with the given digest to the file, verifying the digest while copying. Nothing is left at
+        the destination if the content is missing or damaged.
+
+        :param digest: The SHA-256 digest of the content.
+        :type digest: str
+        :param destination_path: The path the content is written to.
+        :type destination_path: str
+        :return: The size of the content in bytes, or None if it is missing or damaged.
+        :rtype: int
+        """
+        actual_digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(self._get_blob_path(digest), 'rb') as source, open(destination_path, 'wb') as destination:
+                while True:
+                    chunk = source.read(self._chunk_size)
+                    if not chunk:
+                        break
+                    actual_digest.update(chunk)
+                    size += destination.write(chunk)
+        except OSError:
+            size = None
+        if size is None or actual_digest.hexdigest() != digest:
+            try:
+                os.remove(destination_path)
+            except OSError:
+                pass
+            return None
+        return size
+
+    def _get_blob_path(self, digest: str) -> str:
+        """
+        Get the path of the file holding the content with the given digest.
+
+        :param digest: The SHA-256 digest of the content.
+        :type digest: str
+        :return: The path of the file.
+        :rtype: str
+        """
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _load(self) -> None:
+        """Load the index from disk on first use, dropping entries whose content is missing. Must hold the lock."""
+        if self._entries is not None:
+            return
+
+        self._entries = OrderedDict()
+        try:
+            with open(os.path.join(self.directory, self._index_file_name), 'r', encoding='utf-8') as file:
+                entries = json.load(file)['entries']
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        for entry in entries:
+            try:
+                url = entry.pop('url')
+                if os.path.getsize(self._get_blob_path(entry['digest'])) == entry['size']:
+                    self._add_entry(url, entry)
+            except (OSError, KeyError, TypeError, AttributeError):
+                self._dirty = True
+
+    def _add_entry(self, url: str, entry: dict) -> None:
+        """
+        Add the entry as most recently used. Must hold the lock.
+
+        :param url: The absolute URL of the segment.
+        :type url: str
+        :param entry: The digest, size and validators of the segment.
+        :type entry: dict
+        """
+        self._entries[url] = entry
+        references = self._blobs.get(entry['digest'], 0)
+        if not references:
+            self._size += entry['size']
+        self._blobs[entry['digest']] = references + 1
+
+    def _remove_entry(self, url: str, keep_path: Optional[str] = None) -> None:
+        """
+        Remove the entry, deleting its content unless another entry references it. Must hold the lock.
+
+        :param url: The absolute URL of the segment.
+        :type url: str
+        :param keep_path: The path of content which must not be deleted (just written for a new entry).
+        :type keep_path: str
+        """
+        entry = self._entries.pop(url)
+        references = self._blobs[entry['digest']] - 1
+        if references:
+            self._blobs[entry['digest']] = references
+            return
+
+        del self._blobs[entry['digest']]
+        self._size -= entry['size']
+        blob_path = self._get_blob_path(entry['digest'])
+        if blob_path != keep_path:
+            try:
+                os.remove(blob_path)
+            except OSError:
+                pass
+        self._dirty = True
@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .inspector import PlaylistInspector
+from .playlist import MasterPlaylist, MediaPlaylist, Variant
+
+
+class VariantSelector:
+    """
+    Class for selecting the variant of a master playlist automatically, based on the measured throughput.
+
+    The first segments of the lowest-bandwidth variant are fetched in parallel to measure the throughput to the
+    origin. The selected variant is the one with the highest bandwidth whose estimated download time (bandwidth times
+    duration, over the measured throughput) fits the deadline, or the lowest-bandwidth variant if none fits.
+    """
+
+    _timeout = 30  # Timeout (in seconds) of a single HTTP request
+
+    def __init__(
+            self,
+            deadline: float,
+            inspector: Optional[PlaylistInspector] = None,
+            verify_ssl: bool = True,
+            probe_segments: int = 4
+    ) -> None:
+        """
+        Initialize the VariantSelector class.
+
+        :param deadline: The time (in seconds) the download of the selected variant should fit in.
+        :type deadline: float
+        :param inspector: The inspector the variant playlists are fetched through.
+        :type inspector: PlaylistInspector
+        :param verify_ssl: A flag to verify SSL for https-based URLs.
+        :type verify_ssl: bool
+        :param probe_segments: The number of segments fetched to measure the throughput.
+        :type probe_segments: int
+        """
+        if deadline <= 0:
+            raise ValueError('deadline should be positive.')
+        if probe_segments < 1:
+            raise ValueError('probe_segments should be at least 1.')
+
+        self.deadline = deadline
+        self.inspector = inspector or PlaylistInspector(ttl=0)
+        self.verify_ssl = verify_ssl
+        self.probe_segments = probe_segments
+        self.throughput = None
+        self.duration = None
+
+    def measure_throughput(self, playlist: MediaPlaylist) -> float:
+        """
+        Measure the throughput by fetching the first segments of the media playlist in parallel.
+
+        :param playlist: The media playlist.
+        :type playlist: MediaPlaylist
+        :return: The throughput in bytes per second, or 0 if no segment could be fetched.
+        :rtype: float
+        """
+        import requests
+
+        segments = playlist.segments[:self.probe_segments]
+        if not segments:
+            return 0.0
+
+        with requests.Session() as session:
+            session.verify = self.verify_ssl
+
+            def fetch(uri: str) -> int:
+                try:
+                    response = session.get(uri, timeout=self._timeout)
+                    response.raise_for_status()
+                    return len(response.content)
+                except requests.RequestException:
+                    return 0
+
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+                size = sum(executor.map(fetch, [segment.uri for segment in segments]))
+            elapsed = time.perf_counter() - start_time
+
+        return size / elapsed if size and elapsed else 0.0
+
+    def estimate_download_time(self, variant: Variant) -> Optional[float]:
+        """
+        Estimate the download time of the variant from the measured throughput.
+
+        :param variant: The variant.
+        :type variant: Variant
+        :return: The estimated time in seconds, or None if the throughput was not measured.
+        :rtype: float
+        """
+        if not self.throughput or self.duration is None:
+            return None
+        return variant.bits_per_second / 8 * self.duration / self.throughput
+
+    def select(self, playlist: MasterPlaylist) -> Optional[Variant]:
+        """
+        Select the variant to download from the master playlist.
+
+        :param playlist: The master playlist.
+        :type playlist: MasterPlaylist
+        :return: The selected variant, or None if the playlist has no variants.
+        :rtype: Variant
+        """
+        from pym3u8downloader import M3U8DownloaderError
+
+        variants = sorted(playlist.variants, key=lambda variant: variant.bits_per_second)
+        if not variants:
+            return None
+
+        try:
+            probe_playlist = self.inspector.inspect(variants[0].uri, self.verify_ssl)
+        except M3U8DownloaderError:
+            return variants[0]
+        if not isinstance(probe_playlist, MediaPlaylist):
+            return variants[0]
+
+        self.duration = probe_playlist.duration
+        self.throughput = self.measure_throughput(probe_playlist)
+        if not self.throughput:
+            return variants[0]
+
+        fitting = [variant for variant in variants if self.estimate_download_time(variant) <= self.deadline]
+        return fitting[-1] if fitting else variants[0]
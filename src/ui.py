@@ -0,0 +1,755 @@
+import json
+import os
+import pathlib
+import platform
+import threading
+import tkinter as tk
+import webbrowser
+from tkinter import messagebox, ttk, filedialog
+from typing import Optional
+from urllib.parse import urlparse
+
+from .assets import AssetCache
+from .constants import Constants
+from .decryption import SegmentDecryptor
+from .httpcache import HttpCache
+from .inspector import PlaylistInspector
+from .memorybudget import MemoryBudget
+from .playlist import MasterPlaylist, Variant
+from .progress import ProgressChannel
+from .ratelimit import BandwidthLimiter
+from .scheduler import DownloadJob, JobScheduler, JobState
+from .segmentcache import SegmentCache
+from .worker import DownloadWorker
+
+
+def format_variant(variant: Variant) -> str:
+    """
+    Format the details of a master playlist variant for the variant selection.
+
+    :param variant: The variant.
+    :type variant: Variant
+    :return: The display text.
+    :rtype: str
+    """
+    return (
+        f'Name: {variant.name or ""} | '
+        f'Bandwidth: {variant.bandwidth or ""} | '
+        f'Resolution: {variant.resolution or ""}'
+    )
+
+
+class AboutUI:
+    """
+    Class for creating an 'About' window in the M3U8 Downloader application.
+    """
+
+    def __init__(self, parent: tk.Tk) -> None:
+        """
+        Initialize the AboutUI class.
+
+        :param parent: The parent Tkinter root window.
+        :type parent: tk.Tk
+        """
+        self.parent = parent
+        self.window = tk.Toplevel(self.parent)
+        self.window.title(Constants.ABOUT_TITLE)
+        self.window.resizable(False, False)
+        self.window.transient(self.parent)
+        self.window.grab_set()
+
+        self._set_window_size()
+        self._set_defaults()
+        self._set_styles()
+        self._set_fonts()
+        self._set_controls()
+
+    def _set_window_size(self) -> None:
+        """Set the size and position of the about window."""
+        self.window_width = Constants.ABOUT_WINDOW_WIDTH
+        self.window_height = Constants.ABOUT_WINDOW_HEIGHT
+        screen_width = self.window.winfo_screenwidth()
+        screen_height = self.window.winfo_screenheight()
+        x = (screen_width - self.window_width) // 2
+        y = (screen_height - self.window_height) // 2
+        self.window.geometry(f'{self.window_width}x{self.window_height}+{x}+{y}')
+
+    def _set_defaults(self) -> None:
+        """Set default values for various attributes."""
+        self.header = 'About this app'
+        self.app_name = 'M3U8 Downloader'
+        self.app_version = Constants.APP_VERSION
+        self.copyrights = '© 2024 coldsofttech'
+        self.license_type = 'MIT License'
+        self.license_link = 'https://raw.githubusercontent.com/coldsofttech/pym3u8downloaderui/main/LICENSE'
+
+    def _set_styles(self) -> None:
+        """Set styles for the about window."""
+        self.window.tk_setPalette(
+            background=Constants.APP_PALETTE_BACKGROUND, foreground=Constants.APP_PALETTE_FOREGROUND
+        )
+        self.style = ttk.Style()
+        self.style.theme_use(Constants.APP_THEME)
+
+        self.no_background_style = ttk.Style()
+        self.no_background_style.configure('NoBackground.TLabel', background=self.window.cget('background'))
+
+    def _set_fonts(self) -> None:
+        """Set font styles for labels."""
+        self.font_header_style = (Constants.APP_LABEL_FONT_TYPE, 15, Constants.APP_LABEL_FONT_STYLE)
+        self.font_label_style = (Constants.APP_LABEL_FONT_TYPE, 10)
+
+    def _set_controls(self) -> None:
+        """Set up various controls/widgets in the about window."""
+        self.window.rowconfigure(0, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.header_label = ttk.Label(
+            self.window, text=self.header, font=self.font_header_style, style='NoBackground.TLabel'
+        )
+        self.header_label.grid(row=1, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.window.rowconfigure(2, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self._show_icon()
+
+        self.window.rowconfigure(4, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.app_name_label = ttk.Label(
+            self.window, text=f'{self.app_name} {self.app_version}', font=self.font_label_style,
+            style='NoBackground.TLabel'
+        )
+        self.app_name_label.grid(row=5, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.copyright_label = ttk.Label(
+            self.window, text=self.copyrights, font=self.font_label_style, style='NoBackground.TLabel'
+        )
+        self.copyright_label.grid(row=6, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.window.rowconfigure(7, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.license_label = ttk.Label(
+            self.window, text=self.license_type, foreground='blue', cursor='hand2', font=self.font_label_style,
+            style='NoBackground.TLabel'
+        )
+        self.license_label.grid(row=8, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+        self.license_label.bind('<Button-1>', self._open_license)
+
+    def _show_icon(self) -> None:
+        """Show icon for the application."""
+        icon_path = AssetCache().get_path(Constants.APP_ICON_IMAGE_FILE_NAME)
+        if icon_path is None:
+            return
+
+        try:
+            self.image = tk.PhotoImage(file=icon_path)
+            self.image = self.image.subsample(int(self.image.width() / 64), int(self.image.height() / 64))
+
+            self.icon_label = ttk.Label(self.window, image=self.image)
+            self.icon_label.image = self.image
+            self.icon_label.grid(row=3, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+        except tk.TclError:
+            pass
+
+    def _open_license(self, event) -> None:
+        """
+        Open the license link in a web browser.
+
+        :param event: Mouse click event.
+        :type event: tkinter.Event
+        :return: None
+        """
+        webbrowser.open(self.license_link)
+
+
+class M3U8DownloaderUI:
+    """
+    Class for creating and managing the user interface of an M3U8 Downloader application
+    """
+
+    def __init__(self, master: tk.Tk) -> None:
+        """
+        Initialize the M3U8DownloaderUI class.
+
+        :param master: The Tkinter root window.
+        :type master: tk.Tk
+        """
+        self.master = master
+        self.master.title(Constants.APP_TITLE)
+        self.master.geometry(f'{Constants.APP_WINDOW_WIDTH}x{Constants.APP_WINDOW_HEIGHT}')
+        self.master.resizable(False, False)
+        self._set_icon()
+
+        self._set_overrides()
+        self._set_defaults()
+        self._set_styles()
+        self._set_fonts()
+        self._set_menus()
+        self._set_controls()
+
+        # Idle callbacks run in order, so this runs after the redraws queued while building the window
+        self.master.after_idle(self._refresh_assets)
+
+    def _set_icon(self) -> None:
+        """
+        Set icon for the application window from the local asset cache. Newer icons are fetched in the background
+        once the window is shown (see _refresh_assets), so startup never waits on the network.
+        """
+        self.asset_cache = AssetCache()
+        try:
+            if platform.system().lower() == 'windows':
+                icon_path = self.asset_cache.get_path(Constants.APP_ICON_FILE_NAME)
+                if icon_path is not None:
+                    self.master.iconbitmap(default=icon_path)
+            else:
+                icon_path = self.asset_cache.get_path(Constants.APP_ICON_IMAGE_FILE_NAME)
+                if icon_path is not None:
+                    self.icon = tk.PhotoImage(file=icon_path)
+                    self.master.iconphoto(True, self.icon)
+        except tk.TclError:
+            pass
+
+    def _refresh_assets(self) -> None:
+        """Refresh the cached icons in the background after the window is painted, for the next start."""
+        self.asset_cache.refresh_in_background({
+            Constants.APP_ICON_FILE_NAME: Constants.APP_ICON_FILE_PATH,
+            Constants.APP_ICON_IMAGE_FILE_NAME: Constants.APP_ICON_IMAGE_FILE_PATH
+        })
+
+    def _set_overrides(self) -> None:
+        """Set overrides for the application window."""
+        self.master.protocol('WM_DELETE_WINDOW', self._exit_callback)
+
+    def _set_defaults(self) -> None:
+        """Set default value for various attributes."""
+        self.input_url = tk.StringVar()
+        self.selected_file_path = tk.StringVar()
+        self.skip_ssl = tk.BooleanVar(value=False)
+        self.live = tk.BooleanVar(value=False)
+        self.std_output = tk.StringVar()
+        self.progress = ProgressChannel()
+        self.inspector = PlaylistInspector(Constants.PLAYLIST_CACHE_TTL, HttpCache(Constants.HTTP_CACHE_FILE))
+        self.probe_after_id = None
+        self.probe_generation = 0
+        self.probe_result = None
+        self.probe_thread = None
+        self.variants = []
+        self.bandwidth_limiter = BandwidthLimiter()
+        self.bandwidth_limit = tk.StringVar(value='0')
+        self.segment_cache = SegmentCache(max_size=Constants.DEFAULT_SEGMENT_CACHE_SIZE)
+        self.memory_budget = MemoryBudget(Constants.DEFAULT_MEMORY_BUDGET)
+        self.decryptor = SegmentDecryptor(Constants.DEFAULT_DECRYPTION_WORKERS)
+        self.job_progress = {}
+        self.job_values = {}
+        self.job_metrics = {}
+        self.metrics_output = tk.StringVar()
+        self.download_thread = None
+        self.latest_report = None
+        self.help_link = 'https://github.com/coldsofttech/pym3u8downloaderui/blob/main/README.md'
+        self.max_concurrent_jobs = Constants.DEFAULT_MAX_CONCURRENT_JOBS
+        self._load_config()
+        self.scheduler = JobScheduler(self._create_download_thread, self.max_concurrent_jobs)
+
+    def _load_config(self) -> None:
+        """Load UI related configuration settings from the config file (if exists)."""
+        if os.path.exists(Constants.CONFIG_FILE):
+            try:
+                with open(Constants.CONFIG_FILE, 'r') as file:
+                    config = json.load(file)
+                    self.max_concurrent_jobs = max(
+                        1, int(config.get('max_concurrent_jobs', Constants.DEFAULT_MAX_CONCURRENT_JOBS))
+                    )
+                    self.bandwidth_limiter.set_rate(
+                        config.get('bandwidth_limit') or 0, config.get('bandwidth_burst')
+                    )
+                    self.bandwidth_limit.set(str(int(self.bandwidth_limiter.rate // 1024)))
+                    self.segment_cache.max_size = max(
+                        0, int(config.get('segment_cache_size') or Constants.DEFAULT_SEGMENT_CACHE_SIZE)
+                    )
+                    self.memory_budget.set_limit(
+                        max(0, int(config.get('memory_budget') or Constants.DEFAULT_MEMORY_BUDGET))
+                    )
+                    if config.get('decryption_workers') is not None:
+                        self.decryptor = SegmentDecryptor(max(0, int(config['decryption_workers'])))
+            except (OSError, ValueError, TypeError, AttributeError):
+                pass
+
+    def _set_styles(self) -> None:
+        """Set styles for the application."""
+        self.master.tk_setPalette(
+            background=Constants.APP_PALETTE_BACKGROUND, foreground=Constants.APP_PALETTE_FOREGROUND
+        )
+        self.style = ttk.Style()
+        self.style.theme_use(Constants.APP_THEME)
+
+    def _set_fonts(self) -> None:
+        """Set font styles for labels."""
+        self.font_label_style = (
+            Constants.APP_LABEL_FONT_TYPE, Constants.APP_LABEL_FONT_SIZE, Constants.APP_LABEL_FONT_STYLE
+        )
+
+    def _set_menus(self) -> None:
+        """Set up menus for the application."""
+        self.menu_bar = tk.Menu(self.master)
+
+        self.file_menu = tk.Menu(self.menu_bar, tearoff=False)
+        self.file_menu.add_command(label=Constants.MENU_FILE_NEW_TITLE, command=self._new_callback)
+        self.file_menu.add_command(label=Constants.MENU_FILE_OPEN_REPORT_TITLE, command=self._open_report_callback)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label=Constants.MENU_FILE_EXIT_TITLE, command=self._exit_callback)
+        self.menu_bar.add_cascade(label=Constants.MENU_FILE_TITLE, menu=self.file_menu)
+
+        self.help_menu = tk.Menu(self.menu_bar, tearoff=False)
+        self.help_menu.add_command(label=Constants.MENU_HELP_HELP_TITLE, command=self._help_callback)
+        self.help_menu.add_separator()
+        self.help_menu.add_command(label=Constants.MENU_HELP_ABOUT_TITLE, command=lambda: AboutUI(self.master))
+        self.menu_bar.add_cascade(label=Constants.MENU_HELP_TITLE, menu=self.help_menu)
+
+        self.master.config(menu=self.menu_bar)
+
+    def _set_controls(self) -> None:
+        """Set up various controls/widgets in the application window."""
+        self.master.rowconfigure(0, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.input_label = ttk.Label(self.master, text=Constants.LABEL_INPUT_TITLE, font=self.font_label_style)
+        self.input_label.grid(row=1, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.input_entry = ttk.Entry(self.master, textvariable=self.input_url, width=65, font=self.font_label_style)
+        self.input_entry.grid(row=2, column=0, columnspan=2, sticky=tk.E + tk.W, padx=Constants.APP_PADDING)
+
+        self.master.rowconfigure(3, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.output_label = ttk.Label(self.master, text=Constants.LABEL_OUTPUT_TITLE, font=self.font_label_style)
+        self.output_label.grid(row=4, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.output_entry = ttk.Entry(
+            self.master, textvariable=self.selected_file_path, width=55, font=self.font_label_style, state='readonly'
+        )
+        self.output_entry.grid(row=5, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.select_output_button = ttk.Button(
+            self.master, text=Constants.BUTTON_BROWSE_TITLE, command=self._select_output_button_callback, width=10
+        )
+        self.select_output_button.grid(row=5, column=1, sticky=tk.W, padx=(0, Constants.APP_PADDING))
+
+        self.master.rowconfigure(6, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.options_frame = ttk.Frame(self.master)
+        self.options_frame.grid(row=7, column=0, sticky=tk.W, padx=(10, Constants.APP_PADDING))
+        self.skip_ssl_checkbox = ttk.Checkbutton(
+            self.options_frame, text=Constants.LABEL_SKIP_SSL_VERIFICATION_TITLE, variable=self.skip_ssl
+        )
+        self.skip_ssl_checkbox.grid(row=0, column=0, sticky=tk.W)
+        self.live_checkbox = ttk.Checkbutton(
+            self.options_frame, text=Constants.LABEL_LIVE_RECORDING_TITLE, variable=self.live
+        )
+        self.live_checkbox.grid(row=0, column=1, sticky=tk.W, padx=(Constants.APP_PADDING, 0))
+
+        self.bandwidth_frame = ttk.Frame(self.master)
+        self.bandwidth_frame.grid(row=7, column=0, columnspan=2, sticky=tk.E, padx=Constants.APP_PADDING)
+        self.bandwidth_label = ttk.Label(
+            self.bandwidth_frame, text=Constants.LABEL_BANDWIDTH_LIMIT_TITLE, font=self.font_label_style
+        )
+        self.bandwidth_label.grid(row=0, column=0, sticky=tk.E)
+        self.bandwidth_spinbox = ttk.Spinbox(
+            self.bandwidth_frame, textvariable=self.bandwidth_limit, from_=0, to=10 ** 7,
+            increment=Constants.BANDWIDTH_LIMIT_INCREMENT, width=8
+        )
+        self.bandwidth_spinbox.grid(row=0, column=1, sticky=tk.E, padx=(5, 0))
+
+        self.configuration_label = ttk.Label(
+            self.master, text=Constants.LABEL_MASTER_CONFIGURATION_TITLE, font=self.font_label_style
+        )
+        self.configuration_label.grid(row=8, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+        self.configuration_label.grid_remove()
+
+        self.variants_combobox = ttk.Combobox(
+            self.master, state='readonly', width=65
+        )
+        self.variants_combobox.grid(row=9, column=0, columnspan=2, sticky=tk.W, padx=(10, Constants.APP_PADDING))
+        self.variants_combobox.grid_remove()
+
+        self.master.rowconfigure(10, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.download_button = ttk.Button(
+            self.master, text=Constants.BUTTON_DOWNLOAD_TITLE, command=self._download_button_callback
+        )
+        self.download_button.grid(row=11, column=0, columnspan=2, sticky=tk.E, padx=Constants.APP_PADDING)
+
+        self.cancel_button = ttk.Button(
+            self.master, text=Constants.BUTTON_CANCEL_TITLE, command=self._cancel_button_callback
+        )
+        self.cancel_button.grid(row=11, column=0, sticky=tk.E, padx=Constants.APP_PADDING)
+
+        self.master.rowconfigure(12, minsize=Constants.APP_ROW_MIN_SIZE)
+
+        self.stdout_label = ttk.Label(self.master, textvariable=self.std_output, wraplength=430)
+        self.stdout_label.grid(row=13, column=0, columnspan=2, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.metrics_label = ttk.Label(self.master, textvariable=self.metrics_output, wraplength=430)
+        self.metrics_label.grid(row=14, column=0, columnspan=2, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.jobs_label = ttk.Label(self.master, text=Constants.LABEL_JOBS_TITLE, font=self.font_label_style)
+        self.jobs_label.grid(row=15, column=0, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.jobs_treeview = ttk.Treeview(
+            self.master, columns=Constants.JOBS_COLUMNS, show='headings', height=Constants.JOBS_LIST_HEIGHT
+        )
+        for column, title, width in zip(
+                Constants.JOBS_COLUMNS, Constants.JOBS_COLUMN_TITLES, Constants.JOBS_COLUMN_WIDTHS
+        ):
+            self.jobs_treeview.heading(column, text=title)
+            self.jobs_treeview.column(column, width=width, stretch=False)
+        self.jobs_treeview.grid(row=16, column=0, columnspan=2, sticky=tk.W, padx=Constants.APP_PADDING)
+
+        self.input_url.trace_add('write', self._schedule_probe)
+        self.skip_ssl.trace_add('write', self._schedule_probe)
+        self.bandwidth_limit.trace_add('write', self._bandwidth_limit_changed)
+        self.master.after(Constants.APP_REFRESH_INTERVAL, self._refresh_jobs)
+
+    def _bandwidth_limit_changed(self, *args) -> None:
+        """
+        Apply the bandwidth limit entered by the user (in KiB/s) to all running and queued jobs at once.
+
+        :param args: The arguments of the variable trace (unused).
+        :return: None
+        """
+        try:
+            limit = int(self.bandwidth_limit.get() or 0)
+        except ValueError:
+            return
+        if limit >= 0:
+            self.bandwidth_limiter.set_rate(limit * 1024)
+
+    def _schedule_probe(self, *args) -> None:
+        """
+        Schedule probing the input URL once the user stops typing, replacing any probe scheduled before.
+
+        :param args: The arguments of the variable trace (unused).
+        :return: None
+        """
+        if self.probe_after_id is not None:
+            self.master.after_cancel(self.probe_after_id)
+        self.probe_generation += 1
+        self.probe_after_id = self.master.after(Constants.APP_PROBE_DELAY, self._start_probe)
+
+    def _start_probe(self) -> None:
+        """
+        Fetch and classify the playlist of the input URL in the background. The inspected playlist is cached, so the
+        download started afterwards reuses it.
+        """
+        self.probe_after_id = None
+        input_url = self.input_entry.get().strip()
+        parsed_url = urlparse(input_url)
+        if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+            self.probe_result = (self.probe_generation, None)
+            return
+
+        generation, verify_ssl = self.probe_generation, not self.skip_ssl.get()
+
+        def probe() -> None:
+            from pym3u8downloader import M3U8DownloaderError
+
+            try:
+                playlist = self.inspector.inspect(input_url, verify_ssl)
+            except (OSError, ValueError, M3U8DownloaderError):
+                playlist = None
+            self.probe_result = (generation, playlist)
+
+        self.probe_thread = threading.Thread(target=probe, name='PlaylistProbe', daemon=True)
+        self.probe_thread.start()
+
+    def _apply_probe_result(self) -> None:
+        """Show the variants of the probed playlist, unless the input changed since the probe started."""
+        result, self.probe_result = self.probe_result, None
+        if result is None or result[0] != self.probe_generation:
+            return
+
+        playlist = result[1]
+        if isinstance(playlist, MasterPlaylist):
+            self.show_master_configuration_controls(playlist.variants)
+        else:
+            self.hide_master_configuration_controls()
+
+    def _refresh_jobs(self) -> None:
+        """
+        Refresh the job list with the current state of every queued job and show the latest progress event
+        published by the download threads since the previous refresh.
+        """
+        self._apply_probe_result()
+
+        latest_event = None
+        for job_id, event in self.progress.drain().items():
+            self.job_progress[job_id] = latest_event = event
+        if latest_event is not None:
+            self.std_output.set(str(latest_event))
+        self._refresh_metrics()
+
+        for job in list(self.scheduler.jobs):
+            item_id = str(job.job_id)
+            if job.message:
+                state = f'{job.state}: {job.message}'
+            elif job.state == JobState.RUNNING and job.job_id in self.job_progress:
+                state = f'{job.state}: {self.job_progress[job.job_id]}'
+            else:
+                state = job.state
+            values = (job.job_id, job.input_url, job.output_file, state)
+            if self.job_values.get(item_id) == values:
+                continue
+            if self.jobs_treeview.exists(item_id):
+                self.jobs_treeview.item(item_id, values=values)
+            else:
+                self.jobs_treeview.insert('', tk.END, iid=item_id, values=values)
+            self.job_values[item_id] = values
+
+        self.master.after(Constants.APP_REFRESH_INTERVAL, self._refresh_jobs)
+
+    def _refresh_metrics(self) -> None:
+        """Show the transfer metrics of the selected job, or of the most recently started running job."""
+        job_ids = [int(item_id) for item_id in self.jobs_treeview.selection()]
+        if not job_ids:
+            job_ids = [thread.job.job_id for thread in self.scheduler.running_threads() if thread.job]
+        metrics = self.job_metrics.get(max(job_ids)) if job_ids else None
+        self.metrics_output.set(str(metrics) if metrics and metrics.segments_total else '')
+
+    def disable_controls(self) -> None:
+        """Disable all user controls."""
+        self.input_entry.config(state=tk.DISABLED)
+        self.output_entry.config(state=tk.DISABLED)
+        self.select_output_button.config(state=tk.DISABLED)
+        self.skip_ssl_checkbox.config(state=tk.DISABLED)
+        self.live_checkbox.config(state=tk.DISABLED)
+        self.variants_combobox.config(state=tk.DISABLED)
+        self.download_button.config(state=tk.DISABLED)
+        self.file_menu.entryconfig(Constants.MENU_FILE_NEW_TITLE, state=tk.DISABLED)
+
+    def enable_controls(self) -> None:
+        """Enable all user controls."""
+        self.input_entry.config(state=tk.NORMAL)
+        self.output_entry.config(state='readonly')
+        self.select_output_button.config(state=tk.NORMAL)
+        self.skip_ssl_checkbox.config(state=tk.NORMAL)
+        self.live_checkbox.config(state=tk.NORMAL)
+        self.variants_combobox.config(state=tk.NORMAL)
+        self.download_button.config(state=tk.NORMAL)
+        self.file_menu.entryconfig(Constants.MENU_FILE_NEW_TITLE, state=tk.NORMAL)
+
+    def show_master_configuration_controls(self, variants: list) -> None:
+        """
+        Shows variant information in case playlist is identified as master.
+
+        :param variants: The variants of the master playlist.
+        :type variants: list[Variant]
+        :return: None
+        """
+        self.variants = list(variants)
+        self.configuration_label.grid()
+        self.configuration_label.grid_rowconfigure(8, weight=1)
+        self.configuration_label.grid_columnconfigure(0, weight=1)
+        self.variants_combobox.grid()
+        self.variants_combobox.grid_rowconfigure(9, weight=1)
+        self.variants_combobox.grid_columnconfigure(0, weight=1)
+        self.variants_combobox['values'] = [format_variant(variant) for variant in self.variants]
+        if self.variants:
+            self.variants_combobox.current(0)
+
+    def hide_master_configuration_controls(self) -> None:
+        """Hides variant information in case playlist is not identified as master."""
+        self.variants = []
+        self.configuration_label.grid_remove()
+        self.variants_combobox.grid_remove()
+        self.variants_combobox['values'] = None
+
+    def _download_playlist(
+            self,
+            input_url: str,
+            output_file: str,
+            verify_ssl: bool,
+            is_master: bool,
+            variant: Optional[Variant] = None,
+            live: bool = False
+    ) -> None:
+        """
+        Queue the playlist from the given input URL for download.
+
+        :param input_url: Input URL (.m3u8).
+        :type input_url: str
+        :param output_file: Output file (.mp4).
+        :type output_file: str
+        :param verify_ssl: A flag to indicate if SSL warning needs skip.
+        :type verify_ssl: bool
+        :param is_master: A flag to indicate if playlist is master.
+        :type is_master: bool
+        :param variant: The variant to download in case of master playlist.
+        :type variant: Variant
+        :param live: A flag to record live and event playlists until they end.
+        :type live: bool
+        :return: None
+        """
+        self.scheduler.enqueue(DownloadJob(input_url, output_file, verify_ssl, is_master, variant, live))
+
+    def _create_download_thread(self, job: DownloadJob) -> threading.Thread:
+        """
+        Create the thread downloading the given job. Used as thread factory by the job scheduler.
+
+        :param job: The job to be downloaded.
+        :type job: DownloadJob
+        :return: The download thread (not yet started).
+        :rtype: threading.Thread
+        """
+        self.download_thread = DownloadThread(
+            job.input_url, job.output_file, job.verify_ssl, job.is_master, self, job.variant, job, job.live
+        )
+        self.job_metrics[job.job_id] = self.download_thread.metrics
+        return self.download_thread
+
+    def _download_button_callback(self) -> None:
+        """Callback function for the download button."""
+        input_url = self.input_entry.get()
+        output_file = self.output_entry.get()
+        skip_ssl = self.skip_ssl.get()
+        live = self.live.get()
+        variant_index = self.variants_combobox.current()
+
+        if not input_url or not output_file:
+            messagebox.showwarning(Constants.INVALID_INPUT_TITLE, Constants.INVALID_INPUT_MESSAGE)
+            return
+
+        if self.variants and variant_index >= 0:
+            self._download_playlist(input_url, output_file, not skip_ssl, True, self.variants[variant_index], live)
+        else:
+            self._download_playlist(input_url, output_file, not skip_ssl, False, live=live)
+
+    def _cancel_button_callback(self) -> None:
+        """Callback function for the cancel button. Cancels the jobs selected in the job list."""
+        selected_ids = {int(item_id) for item_id in self.jobs_treeview.selection()}
+        for job in list(self.scheduler.jobs):
+            if job.job_id in selected_ids:
+                self.scheduler.cancel(job)
+
+    def _select_output_button_callback(self) -> None:
+        """Callback function for the select output button."""
+        file_types = Constants.BROWSE_FILE_TYPES
+        selected_file_name = filedialog.asksaveasfilename(
+            filetypes=file_types, defaultextension=Constants.BROWSE_DEFAULT_EXTENSION
+        )
+        if selected_file_name:
+            self.selected_file_path.set(selected_file_name)
+
+    def _new_callback(self) -> None:
+        """Callback function for the 'New' option in the file menu."""
+        self.input_entry.delete(0, tk.END)
+        self.selected_file_path.set('')
+        self.skip_ssl.set(False)
+        self.live.set(False)
+        self.hide_master_configuration_controls()
+
+    def _open_report_callback(self) -> None:
+        """Callback function for the 'Open Latest Report' option in the file menu."""
+        if self.latest_report is None or not os.path.isfile(self.latest_report):
+            messagebox.showinfo(Constants.NO_REPORT_TITLE, Constants.NO_REPORT_MESSAGE)
+            return
+
+        webbrowser.open(pathlib.Path(self.latest_report).resolve().as_uri())
+
+    def _exit_callback(self) -> None:
+        """Callback function for the 'Exit' option in the file menu."""
+        if (self.download_thread and self.download_thread.is_alive()) or self.scheduler.is_busy():
+            messagebox.showwarning(Constants.DOWNLOAD_IN_PROGRESS_TITLE, Constants.DOWNLOAD_IN_PROGRESS_MESSAGE)
+            return
+
+        self.master.destroy()
+
+    def _help_callback(self) -> None:
+        """Callback function for the 'Help' option in the help menu."""
+        webbrowser.open(self.help_link)
+
+
+class DownloadThread(DownloadWorker):
+    """Thread class for downloading M3U8 playlists in a separate thread, reporting to the M3U8DownloaderUI."""
+
+    def __init__(
+            self,
+            input_url: str,
+            output_file: str,
+            verify_ssl: bool,
+            is_master: bool,
+            source: M3U8DownloaderUI,
+            variant: Optional[Variant] = None,
+            job: Optional[DownloadJob] = None,
+            live: bool = False
+    ) -> None:
+        """
+        Initialize the DownloadThread class.
+
+        :param input_url: Input URL (.m3u8).
+        :type input_url: str
+        :param output_file: Output file (.mp4).
+        :type output_file: str
+        :param verify_ssl: A flag to indicate if SSL warning needs skip.
+        :type verify_ssl: bool
+        :param is_master: A flag to indicate if playlist is master.
+        :type is_master: bool
+        :param source: The source M3U8DownloaderUI instance.
+        :type source: M3U8DownloaderUI
+        :param variant: The variant to download in case of master playlist.
+        :type variant: Variant
+        :param job: The queued job this thread downloads (if started by the job scheduler).
+        :type job: DownloadJob
+        :param live: A flag to record live and event playlists until they end.
+        :type live: bool
+        """
+        super().__init__(
+            input_url, output_file, verify_ssl, is_master, variant, job, source.progress,
+            inspector=source.inspector, bandwidth_limiter=source.bandwidth_limiter, segment_cache=source.segment_cache,
+            live=live, memory_budget=source.memory_budget, decryptor=source.decryptor
+        )
+        self.source = source
+
+    def _on_completed(self) -> None:
+        """Show the download complete message."""
+        messagebox.showinfo(Constants.DOWNLOAD_COMPLETE_TITLE, Constants.DOWNLOAD_COMPLETE_MESSAGE)
+
+    def _on_report_written(self, report_file: str) -> None:
+        """
+        Remember the profiling report as the latest one, to be opened from the file menu.
+
+        :param report_file: The path of the report.
+        :type report_file: str
+        :return: None
+        """
+        self.source.latest_report = report_file
+
+    def _on_variants_required(self, variants: list) -> None:
+        """
+        Notify the user about the master playlist and show its variants for selection.
+
+        :param variants: The variants of the master playlist.
+        :type variants: list[Variant]
+        :return: None
+        """
+        messagebox.showinfo(Constants.DOWNLOAD_MASTER_IDENTIFIED_TITLE, Constants.DOWNLOAD_MASTER_IDENTIFIED_MESSAGE)
+        self.source.show_master_configuration_controls(variants)
+
+    def _on_media_playlist(self) -> None:
+        """Hide the variant selection, since the playlist is not a master playlist."""
+        self.source.hide_master_configuration_controls()
+
+    def _on_error(self, message: str) -> None:
+        """
+        Show the error message.
+
+        :param message: The error message.
+        :type message: str
+        :return: None
+        """
+        messagebox.showerror(Constants.DOWNLOAD_ERROR_TITLE, message)
+
+
+def main():
+    root = tk.Tk()
+    M3U8DownloaderUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
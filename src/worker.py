@@ -0,0 +1,384 @@
+import json
+import os
+import threading
+from typing import Optional
+
+from .constants import Constants
+from .decryption import SegmentDecryptor
+from .engine import AsyncSegmentDownloader, DownloadCancelledError, SegmentDownloader
+from .httpcache import HttpCache
+from .inspector import PlaylistInspector
+from .memorybudget import MemoryBudget
+from .metrics import TransferMetrics
+from .playlist import MasterPlaylist, Variant
+from .profiling import JobProfiler
+from .progress import ProgressChannel, ProgressEvent
+from .ratelimit import BandwidthLimiter
+from .scheduler import DownloadJob, JobState
+from .segmentcache import SegmentCache
+from .selection import VariantSelector
+
+
+class DownloadWorker(threading.Thread):
+    """
+    Thread class for downloading a single M3U8 playlist with the configured engine, without any user interface.
+
+    User interfaces subclass it and override the _on_* hooks (and _select_variant) to present the outcome.
+    """
+
+    def __init__(
+            self,
+            input_url: str,
+            output_file: str,
+            verify_ssl: bool,
+            is_master: bool,
+            variant: Optional[Variant] = None,
+            job: Optional[DownloadJob] = None,
+            progress: Optional[ProgressChannel] = None,
+            overrides: Optional[dict] = None,
+            inspector: Optional[PlaylistInspector] = None,
+            bandwidth_limiter: Optional[BandwidthLimiter] = None,
+            segment_cache: Optional[SegmentCache] = None,
+            live: bool = False,
+            memory_budget: Optional[MemoryBudget] = None,
+            decryptor: Optional[SegmentDecryptor] = None
+    ) -> None:
+        """
+        Initialize the DownloadWorker class.
+
+        :param input_url: Input URL (.m3u8).
+        :type input_url: str
+        :param output_file: Output file (.mp4).
+        :type output_file: str
+        :param verify_ssl: A flag to indicate if SSL warning needs skip.
+        :type verify_ssl: bool
+        :param is_master: A flag to indicate if playlist is master.
+        :type is_master: bool
+        :param variant: The variant to download in case of master playlist.
+        :type variant: Variant
+        :param job: The queued job this thread downloads (if started by the job scheduler).
+        :type job: DownloadJob
+        :param progress: The channel progress events are published to.
+        :type progress: ProgressChannel
+        :param overrides: Settings (attribute name and value) taking precedence over the config file.
+        :type overrides: dict
+        :param inspector: The inspector the playlist is fetched through, shared to reuse earlier inspections.
+        :type inspector: PlaylistInspector
+        :param bandwidth_limiter: The limiter shared by all jobs (a limiter of this job from the config file if not
+        given).
+        :type bandwidth_limiter: BandwidthLimiter
+        :param segment_cache: The segment cache shared by all jobs (a cache of this job from the config file if not
+        given).
+        :type segment_cache: SegmentCache
+        :param live: A flag to record live and event playlists until they end.
+        :type live: bool
+        :param memory_budget: The memory budget shared by all jobs (a budget of this job from the config file if not
+        given).
+        :type memory_budget: MemoryBudget
+        :param decryptor: The decryptor of encrypted segments shared by all jobs (a decryptor of this job if not
+        given).
+        :type decryptor: SegmentDecryptor
+        """
+        super().__init__()
+        self.input_url = input_url
+        self.output_file = output_file
+        self.verify_ssl = verify_ssl
+        self.is_master = is_master
+        self.variant = variant
+        self.job = job
+        self.progress = progress
+        self.overrides = overrides or {}
+        self.inspector = inspector or PlaylistInspector(
+            Constants.PLAYLIST_CACHE_TTL, HttpCache(Constants.HTTP_CACHE_FILE)
+        )
+        self.bandwidth_limiter = bandwidth_limiter
+        self.segment_cache = segment_cache
+        self.memory_budget = memory_budget
+        self.decryptor = decryptor
+        self.live = live
+        self.live_max_duration = None
+        self.skip_space_check = False
+        self.debug = False
+        self.engine = Constants.DEFAULT_ENGINE
+        self.max_threads = Constants.DEFAULT_MAX_THREADS
+        self.max_concurrency = Constants.DEFAULT_MAX_CONCURRENCY
+        self.output_mode = Constants.OUTPUT_MODE_STREAMING
+        self.reorder_buffer_size = Constants.DEFAULT_REORDER_BUFFER_SIZE
+        self.adaptive_concurrency = Constants.DEFAULT_ADAPTIVE_CONCURRENCY
+        self.segment_timeout = Constants.DEFAULT_SEGMENT_TIMEOUT
+        self.max_retries = Constants.DEFAULT_MAX_RETRIES
+        self.hedge_requests = Constants.DEFAULT_HEDGE_REQUESTS
+        self.decryption_workers = Constants.DEFAULT_DECRYPTION_WORKERS
+        self.size_estimate_samples = Constants.DEFAULT_SIZE_ESTIMATE_SAMPLES
+        self.preallocate = Constants.DEFAULT_PREALLOCATE
+        self.remux_command = Constants.DEFAULT_REMUX_COMMAND
+        self.dump_metrics = False
+        self.profile = False
+        self.trace_memory = False
+        self.variant_deadline = None
+        self.metrics = TransferMetrics()
+        self.downloader = None
+        self.profiler = None
+        self.report_file = None
+        self.cancelled = False
+
+    def _load_config(self) -> None:
+        """Load configuration settings from the config file (if exists)."""
+        if os.path.exists(Constants.CONFIG_FILE):
+            with open(Constants.CONFIG_FILE, 'r') as file:
+                config = json.load(file)
+                self.skip_space_check = config.get('skip_space_check', False)
+                self.debug = config.get('debug', False)
+                self.engine = config.get('engine', Constants.DEFAULT_ENGINE)
+                self.max_threads = config.get('max_threads', Constants.DEFAULT_MAX_THREADS)
+                self.max_concurrency = config.get('max_concurrency', Constants.DEFAULT_MAX_CONCURRENCY)
+                self.output_mode = config.get('output_mode', Constants.OUTPUT_MODE_STREAMING)
+                self.reorder_buffer_size = config.get('reorder_buffer_size', Constants.DEFAULT_REORDER_BUFFER_SIZE)
+                self.adaptive_concurrency = config.get(
+                    'adaptive_concurrency', Constants.DEFAULT_ADAPTIVE_CONCURRENCY
+                )
+                self.segment_timeout = config.get('segment_timeout', Constants.DEFAULT_SEGMENT_TIMEOUT)
+                self.max_retries = config.get('max_retries', Constants.DEFAULT_MAX_RETRIES)
+                self.hedge_requests = config.get('hedge_requests', Constants.DEFAULT_HEDGE_REQUESTS)
+                self.size_estimate_samples = config.get(
+                    'size_estimate_samples', Constants.DEFAULT_SIZE_ESTIMATE_SAMPLES
+                )
+                self.preallocate = config.get('preallocate', Constants.DEFAULT_PREALLOCATE)
+                self.decryption_workers = config.get('decryption_workers', Constants.DEFAULT_DECRYPTION_WORKERS)
+                self.remux_command = config.get('remux_command', Constants.DEFAULT_REMUX_COMMAND)
+                self.dump_metrics = config.get('dump_metrics', False)
+                self.profile = config.get('profile', False)
+                self.trace_memory = config.get('trace_memory', False)
+                self.variant_deadline = config.get('variant_deadline')
+                self.live_max_duration = config.get('live_max_duration')
+                if self.bandwidth_limiter is None and config.get('bandwidth_limit'):
+                    self.bandwidth_limiter = BandwidthLimiter(config['bandwidth_limit'], config.get('bandwidth_burst'))
+                if self.segment_cache is None and config.get('segment_cache_size'):
+                    self.segment_cache = SegmentCache(max_size=config['segment_cache_size'])
+                if self.memory_budget is None and config.get('memory_budget'):
+                    self.memory_budget = MemoryBudget(config['memory_budget'])
+
+        for key, value in self.overrides.items():
+            setattr(self, key, value)
+
+    def _create_downloader(self):
+        """
+        Create the downloader of the configured engine.
+
+        :return: The downloader.
+        :rtype: M3U8Downloader | SegmentDownloader | AsyncSegmentDownloader
+        """
+        from pym3u8downloader import M3U8Downloader
+
+        if self.engine not in Constants.ENGINES:
+            raise ValueError(f'engine should be one of {", ".join(Constants.ENGINES)}.')
+
+        settings = {
+            'input_file_path': self.input_url,
+            'output_file_path': self.output_file,
+            'skip_space_check': self.skip_space_check,
+            'debug': self.debug,
+            'max_threads': self.max_threads,
+            'verify_ssl': self.verify_ssl
+        }
+        if self.engine == Constants.ENGINE_PYM3U8DOWNLOADER:
+            if self.live:
+                raise ValueError(f'Live recording is not supported by the {self.engine} engine.')
+            if self.remux_command:
+                raise ValueError(f'Remuxing is not supported by the {self.engine} engine.')
+            return M3U8Downloader(**settings)
+
+        settings['output_mode'] = self.output_mode
+        settings['reorder_buffer_size'] = self.reorder_buffer_size
+        settings['adaptive_concurrency'] = self.adaptive_concurrency
+        settings['segment_timeout'] = self.segment_timeout
+        settings['max_retries'] = self.max_retries
+        settings['hedge_requests'] = self.hedge_requests
+        settings['size_estimate_samples'] = self.size_estimate_samples
+        settings['preallocate'] = self.preallocate
+        settings['remux_command'] = self.remux_command
+        settings['live'] = self.live
+        settings['live_max_duration'] = self.live_max_duration
+        if self.engine == Constants.ENGINE_ASYNCIO:
+            return AsyncSegmentDownloader(max_concurrency=self.max_concurrency, **settings)
+        else:
+            return SegmentDownloader(**settings)
+
+    def cancel(self) -> None:
+        """Request the download to stop (supported by the threaded and asyncio engines)."""
+        self.cancelled = True
+        if self.downloader is not None and hasattr(self.downloader, 'cancel'):
+            self.downloader.cancel()
+
+    def _dump_metrics(self) -> None:
+        """Write the transfer metrics of the finished job as JSON next to the output file."""
+        try:
+            self.metrics.dump(f'{self.output_file}{Constants.METRICS_FILE_SUFFIX}')
+        except OSError:
+            pass
+
+    def _start_profiling(self) -> None:
+        """Start profiling the job with cProfile and/or tracemalloc, if enabled in the config file."""
+        if self.profile or self.trace_memory:
+            self.profiler = JobProfiler(self.profile, self.trace_memory, Constants.PROFILE_REPORT_LIMIT)
+            self.profiler.start()
+
+    def _stop_profiling(self) -> None:
+        """
+        Stop profiling the job (if profiled) and write the report, and the cProfile statistics if profiled, next to
+        the output file. Called before the outcome is presented, so waiting for the user is not profiled.
+        """
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+
+        profiler.stop()
+        report_file = f'{self.output_file}{Constants.PROFILE_REPORT_SUFFIX}'
+        try:
+            profiler.write(report_file, f'{self.output_file}{Constants.PROFILE_FILE_SUFFIX}', self.input_url)
+        except OSError:
+            return
+        self.report_file = report_file
+        self._on_report_written(report_file)
+
+    def _publish_progress(self, stage: str, completed: int = 0, total: int = 0, message: str = '') -> None:
+        """
+        Publish a progress event of this job to the progress channel (if any).
+
+        :param stage: The name of the stage.
+        :type stage: str
+        :param completed: The number of completed items of the stage.
+        :type completed: int
+        :param total: The total number of items of the stage.
+        :type total: int
+        :param message: Additional information.
+        :type message: str
+        :return: None
+        """
+        if self.progress is not None:
+            job_id = self.job.job_id if self.job else 0
+            self.progress.publish(ProgressEvent(job_id, stage, completed, total, message))
+
+    def _select_variant(self, playlist: MasterPlaylist) -> Optional[Variant]:
+        """
+        Select the variant of a master playlist to download when none was specified: automatically by measured
+        throughput if a variant deadline is configured.
+
+        :param playlist: The master playlist.
+        :type playlist: MasterPlaylist
+        :return: The selected variant, or None if the user needs to select one.
+        :rtype: Variant
+        """
+        if not self.variant_deadline:
+            return None
+
+        selector = VariantSelector(self.variant_deadline, self.inspector, self.verify_ssl)
+        variant = selector.select(playlist)
+        if variant is not None and selector.throughput:
+            self._publish_progress(
+                Constants.PROGRESS_STAGE_STARTED,
+                message=f'Selected variant {variant.name or variant.resolution or variant.bandwidth}: '
+                        f'{selector.throughput / 1024 ** 2:.2f} MiB/s measured, '
+                        f'~{selector.estimate_download_time(variant):.0f}s estimated'
+            )
+        return variant
+
+    def _on_completed(self) -> None:
+        """Hook called when the download completed successfully."""
+        pass
+
+    def _on_report_written(self, report_file: str) -> None:
+        """
+        Hook called when the profiling report of the job was written.
+
+        :param report_file: The path of the report.
+        :type report_file: str
+        :return: None
+        """
+        pass
+
+    def _on_variants_required(self, variants: list) -> None:
+        """
+        Hook called when the playlist is a master playlist and no variant was selected.
+
+        :param variants: The variants of the master playlist.
+        :type variants: list[Variant]
+        :return: None
+        """
+        pass
+
+    def _on_media_playlist(self) -> None:
+        """Hook called when a playlist downloaded as master playlist turns out to be a media playlist."""
+        pass
+
+    def _on_error(self, message: str) -> None:
+        """
+        Hook called when the download failed.
+
+        :param message: The error message.
+        :type message: str
+        :return: None
+        """
+        pass
+
+    def run(self) -> None:
+        """Run the download process in a separate thread."""
+        from pym3u8downloader import M3U8DownloaderError
+
+        state, message = JobState.FAILED, ''
+        decryptor = self.decryptor
+
+        try:
+            self._load_config()
+            self._start_profiling()
+            if decryptor is None:
+                decryptor = SegmentDecryptor(self.decryption_workers)
+            downloader = self.downloader = self._create_downloader()
+            self._publish_progress(Constants.PROGRESS_STAGE_STARTED)
+            if hasattr(downloader, 'on_progress'):
+                downloader.on_progress = self._publish_progress
+                downloader.metrics = self.metrics
+                downloader.inspector = self.inspector
+                downloader.bandwidth_limiter = self.bandwidth_limiter
+                downloader.segment_cache = self.segment_cache
+                downloader.memory_budget = self.memory_budget
+                downloader.decryptor = decryptor
+            if self.cancelled:
+                self.cancel()
+
+            # The playlist is fetched once to classify it; the built-in engines reuse the inspected playlist
+            playlist = self.inspector.inspect(self.input_url, self.verify_ssl)
+            if isinstance(playlist, MasterPlaylist):
+                variant = self.variant or self._select_variant(playlist)
+                if variant is None:
+                    state = JobState.VARIANT_REQUIRED
+                    self._stop_profiling()
+                    self._on_variants_required(playlist.variants)
+                    return
+                if isinstance(downloader, SegmentDownloader):
+                    # The variant is passed on as it is, so its media playlist is fetched without searching again
+                    downloader.download_variant(variant)
+                else:
+                    downloader.download_master_playlist(variant.name, variant.bandwidth, variant.resolution)
+            else:
+                if self.is_master:
+                    self._on_media_playlist()
+                downloader.download_playlist()
+            state = JobState.COMPLETED
+            self._stop_profiling()
+            self._on_completed()
+        except DownloadCancelledError as e:
+            state, message = JobState.CANCELLED, e.message
+        except (OSError, ValueError, TypeError, M3U8DownloaderError) as e:
+            message = getattr(e, 'message', str(e))
+            self._stop_profiling()
+            self._on_error(message)
+        finally:
+            self._stop_profiling()
+            if decryptor is not None and decryptor is not self.decryptor:
+                decryptor.close()
+            self.metrics.finish(state)
+            if self.dump_metrics:
+                self._dump_metrics()
+            if self.job:
+                self.job.finish(state, message)
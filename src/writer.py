@@ -0,0 +1,282 @@
+import errno
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+# Errors raised by kernel-side copies the platform or file system does not support for the given files
+# (EBADF is raised by os.copy_file_range for destinations opened in append mode)
+_UNSUPPORTED_COPY_ERRORS = {
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+    errno.ENOTSOCK, errno.EBADF
+}
+
+
+def copy_file(source_fd: int, destination_fd: int, buffer_size: int = 1024 * 1024) -> int:
+    """
+    Append the source file, from its current position, to the destination file at its current position.
+
+    The data is copied inside the kernel with os.copy_file_range where supported, falling back to os.sendfile and
+    finally to a readinto loop through a single reused buffer. Both positions are advanced by the copied size.
+
+    :param source_fd: The file descriptor of the source file.
+    :type source_fd: int
+    :param destination_fd: The file descriptor of the destination file.
+    :type destination_fd: int
+    :param buffer_size: The size of the buffer used when the kernel-side copies are not supported.
+    :type buffer_size: int
+    :return: The number of bytes copied.
+    :rtype: int
+    """
+    start = os.lseek(source_fd, 0, os.SEEK_CUR)
+    for copy in (_copy_file_range, _sendfile):
+        try:
+            copy(source_fd, destination_fd, buffer_size)
+            break
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+                raise
+    else:
+        _copy_buffered(source_fd, destination_fd, buffer_size)  # Continues after any partial kernel-side copy
+    return os.lseek(source_fd, 0, os.SEEK_CUR) - start
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, count: int) -> None:
+    """
+    Copy the rest of the source file with os.copy_file_range, which advances both file positions.
+
+    :param source_fd: The file descriptor of the source file.
+    :type source_fd: int
+    :param destination_fd: The file descriptor of the destination file.
+    :type destination_fd: int
+    :param count: The maximum number of bytes copied per call.
+    :type count: int
+    :return: None
+    """
+    if not hasattr(os, 'copy_file_range'):
+        raise OSError(errno.ENOSYS, 'os.copy_file_range is not available.')
+    while os.copy_file_range(source_fd, destination_fd, count):
+        pass
+
+
+def _sendfile(source_fd: int, destination_fd: int, count: int) -> None:
+    """
+    Copy the rest of the source file with os.sendfile, advancing the source position explicitly.
+
+    :param source_fd: The file descriptor of the source file.
+    :type source_fd: int
+    :param destination_fd: The file descriptor of the destination file.
+    :type destination_fd: int
+    :param count: The maximum number of bytes copied per call.
+    :type count: int
+    :return: None
+    """
+    if not hasattr(os, 'sendfile'):
+        raise OSError(errno.ENOSYS, 'os.sendfile is not available.')
+    offset = os.lseek(source_fd, 0, os.SEEK_CUR)
+    while True:
+        sent = os.sendfile(destination_fd, source_fd, offset, count)
+        if not sent:
+            break
+        offset += sent
+        os.lseek(source_fd, offset, os.SEEK_SET)
+
+
+def _copy_buffered(source_fd: int, destination_fd: int, buffer_size: int) -> None:
+    """
+    Copy the rest of the source file through a single reused buffer.
+
+    :param source_fd: The file descriptor of the source file.
+    :type source_fd: int
+    :param destination_fd: The file descriptor of the destination file.
+    :type destination_fd: int
+    :param buffer_size: The size of the buffer.
+    :type buffer_size: int
+    :return: None
+    """
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(source_fd, 'rb', buffering=0, closefd=False) as source_file:
+        while True:
+            size = source_file.readinto(buffer)
+            if not size:
+                break
+            written = 0
+            while written < size:
+                written += os.write(destination_fd, view[written:size])
+
+
+class StreamingSegmentWriter:
+    """
+    Class for appending segments to the output file in playlist order as soon as all preceding segments are present.
+
+    Segments are handed over as files (received on disk by a SegmentReceiver), which are appended to the output file
+    inside the kernel where supported and deleted once written. Segments arriving out of order wait in a reorder
+    buffer. The buffer is bounded: a segment which would exceed the limit is only accepted once it is the next
+    segment to be written, which always succeeds, so producers fetching in playlist order can never deadlock.
+    """
+
+    def __init__(
+            self,
+            output_file,
+            next_index: int = 0,
+            max_buffer_size: int = 64 * 1024 * 1024,
+            on_written: Optional[Callable[[int, int, int], None]] = None,
+            copy_buffer_size: int = 1024 * 1024
+    ) -> None:
+        """
+        Initialize the StreamingSegmentWriter class.
+
+        :param output_file: The output file, opened unbuffered and positioned where the next segment is to be
+        written, or a muxer pipe.
+        :type output_file: BinaryIO | MuxerPipe
+        :param next_index: The index of the next segment to be written.
+        :type next_index: int
+        :param max_buffer_size: The maximum number of bytes of segments waiting in the reorder buffer.
+        :type max_buffer_size: int
+        :param on_written: Callable invoked with the index, the offset and the size of every written segment.
+        :type on_written: Callable[[int, int, int], None]
+        :param copy_buffer_size: The size of the chunks copied when the kernel-side copies are not supported.
+        :type copy_buffer_size: int
+        """
+        self.output_file = output_file
+        self.next_index = next_index
+        self.offset = output_file.tell()
+        self.max_buffer_size = max_buffer_size
+        self.on_written = on_written
+        self.copy_buffer_size = copy_buffer_size
+        self.buffered_size = 0
+        self.peak_buffered_size = 0
+        self._buffer = {}
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def offer(self, index: int, part_file_path: str) -> bool:
+        """
+        Write or buffer the segment if possible, without waiting for buffer space.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param part_file_path: The path of the file holding the content of the segment.
+        :type part_file_path: str
+        :return: True if the segment was accepted, False if the reorder buffer is full.
+        :rtype: bool
+        """
+        with self._condition:
+            if index != self.next_index:
+                size = os.path.getsize(part_file_path)
+                if self.buffered_size + size > self.max_buffer_size:
+                    return False
+                self._buffer[index] = (part_file_path, size)
+                self.buffered_size += size
+                self.peak_buffered_size = max(self.peak_buffered_size, self.buffered_size)
+                return True
+
+            self._write(index, part_file_path)
+            while self.next_index in self._buffer:
+                part_file_path, size = self._buffer.pop(self.next_index)
+                self.buffered_size -= size
+                self._write(self.next_index, part_file_path)
+            self._condition.notify_all()
+            return True
+
+    def write(self, index: int, part_file_path: str) -> None:
+        """
+        Write or buffer the segment, waiting for buffer space if the reorder buffer is full.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param part_file_path: The path of the file holding the content of the segment.
+        :type part_file_path: str
+        :return: None
+        """
+        with self._condition:
+            while not self.offer(index, part_file_path):
+                if self._closed:
+                    raise ValueError('Writer is closed.')
+                self._condition.wait()
+
+    def close(self) -> None:
+        """
+        Stop waiting for reorder buffer space: waiting producers are woken up and fail. Segments which can be
+        written or buffered right away are still accepted, so segments in flight when a download fails still
+        extend the written prefix.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _write(self, index: int, part_file_path: str) -> None:
+        """
+        Append the segment to the output file and delete its file.
+
+        :param index: The index of the segment.
+        :type index: int
+        :param part_file_path: The path of the file holding the content of the segment.
+        :type part_file_path: str
+        :return: None
+        """
+        with open(part_file_path, 'rb', buffering=0) as part_file:
+            copy_from = getattr(self.output_file, 'copy_from', None)
+            if copy_from is not None:
+                size = copy_from(part_file.fileno(), self.copy_buffer_size)
+            else:
+                size = copy_file(part_file.fileno(), self.output_file.fileno(), self.copy_buffer_size)
+        os.remove(part_file_path)
+        if self.on_written:
+            self.on_written(index, self.offset, size)
+        self.offset += size
+        self.next_index = index + 1
+
+
+class SegmentReceiver:
+    """
+    Class receiving the content of a segment in chunks straight to disk, so no segment is ever held in memory whole.
+
+    The chunks are written to a temporary file next to the part file which replaces the part file once the segment
+    is complete, so concurrent receivers of the same segment (hedged requests) never mix their content.
+    """
+
+    def __init__(self, part_file_path: str) -> None:
+        """
+        Initialize the SegmentReceiver class.
+
+        :param part_file_path: The path the segment is written to.
+        :type part_file_path: str
+        """
+        self.part_file_path = part_file_path
+        self.size = 0
+        fd, self._temp_file_path = tempfile.mkstemp(
+            suffix='.tmp', prefix=f'{os.path.basename(part_file_path)}.', dir=os.path.dirname(part_file_path)
+        )
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk of the segment.
+
+        :param chunk: The chunk.
+        :type chunk: bytes
+        :return: None
+        """
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> int:
+        """
+        Complete the segment, moving it to the part file.
+
+        :return: The size of the segment in bytes.
+        :rtype: int
+        """
+        self._file.close()
+        os.replace(self._temp_file_path, self.part_file_path)
+        return self.size
+
+    def discard(self) -> None:
+        """Drop the content received so far (nothing once the segment is complete)."""
+        self._file.close()
+        try:
+            os.remove(self._temp_file_path)
+        except OSError:
+            pass
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import AssetCache, Constants
+
+
+class TestAssetCache(unittest.TestCase):
+    """Unit test cases for AssetCache"""
+
+    def setUp(self):
+        self.cache_directory = tempfile.mkdtemp()
+        self.cache = AssetCache(os.path.join(self.cache_directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_directory, ignore_errors=True)
+
+    @pytest.mark.sequential_order
+    def test_get_path(self):
+        """Test if packaged assets are copied into the cache without using the network"""
+        with patch('requests.get') as mock_get:
+            path = self.cache.get_path(Constants.APP_ICON_IMAGE_FILE_NAME)
+            mock_get.assert_not_called()
+        self.assertEqual(path, os.path.join(self.cache.cache_directory, Constants.APP_ICON_IMAGE_FILE_NAME))
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertIsNone(self.cache.get_path('missing.png'))
+
+    @pytest.mark.sequential_order
+    def test_refresh(self):
+        """Test if stale assets are replaced and fresh assets are left alone"""
+        path = self.cache.get_path(Constants.APP_ICON_IMAGE_FILE_NAME)
+        response = MagicMock(content=b'new icon')
+        with patch('requests.get', return_value=response) as mock_get:
+            self.assertFalse(self.cache.refresh(Constants.APP_ICON_IMAGE_FILE_NAME, Constants.APP_ICON_IMAGE_FILE_PATH))
+            mock_get.assert_not_called()
+
+            stale = time.time() - Constants.APP_ASSET_REFRESH_INTERVAL - 1
+            os.utime(path, (stale, stale))
+            self.assertTrue(self.cache.refresh(Constants.APP_ICON_IMAGE_FILE_NAME, Constants.APP_ICON_IMAGE_FILE_PATH))
+            mock_get.assert_called_once()
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(), b'new icon')
+
+    @pytest.mark.sequential_order
+    def test_refresh_failed(self):
+        """Test if a failed refresh keeps the cached asset"""
+        import requests
+
+        path = self.cache.get_path(Constants.APP_ICON_IMAGE_FILE_NAME)
+        stale = time.time() - Constants.APP_ASSET_REFRESH_INTERVAL - 1
+        os.utime(path, (stale, stale))
+        with patch('requests.get', side_effect=requests.ConnectionError('offline')):
+            self.assertFalse(self.cache.refresh(Constants.APP_ICON_IMAGE_FILE_NAME, Constants.APP_ICON_IMAGE_FILE_PATH))
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(os.listdir(self.cache.cache_directory), [Constants.APP_ICON_IMAGE_FILE_NAME])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+from src import BandwidthLimiter, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    """Unit test cases for BandwidthLimiter class."""
+
+    @pytest.mark.sequential_order
+    def test_reserve(self):
+        """Test if reserve allows the burst at once and delays what exceeds it at the configured rate"""
+        limiter = BandwidthLimiter(1000, burst=1000)
+        self.assertEqual(limiter.reserve(1000), 0.0)
+        self.assertAlmostEqual(limiter.reserve(500), 0.5, delta=0.05)
+        self.assertAlmostEqual(limiter.reserve(500), 1.0, delta=0.05)
+
+    @pytest.mark.sequential_order
+    def test_set_rate(self):
+        """Test if the rate can be changed and disabled at runtime"""
+        limiter = BandwidthLimiter(1000)
+        self.assertEqual(limiter.burst, 1000)
+        limiter.reserve(5000)
+        limiter.set_rate(0)
+        self.assertEqual(limiter.reserve(10 ** 9), 0.0)
+        limiter.set_rate(2000, burst=0)
+        self.assertAlmostEqual(limiter.reserve(1000), 0.5, delta=0.05)
+        with self.assertRaises(ValueError):
+            limiter.set_rate(-1)
+
+    @pytest.mark.sequential_order
+    def test_throttle(self):
+        """Test if a downloader waits for the limiter without holding its lock, one reservation at a time"""
+        downloader = SegmentDownloader('https://example.com/index.m3u8', 'video.mp4')
+        downloader.bandwidth_limiter = BandwidthLimiter(1000, burst=0)
+        threads = [threading.Thread(target=downloader._throttle, args=(300,)) for _ in range(2)]
+        start_time = time.monotonic()
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.assertTrue(downloader._bandwidth_lock.acquire(timeout=0))
+        downloader._bandwidth_lock.release()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.55)
+        self.assertAlmostEqual(downloader.bandwidth_limiter.reserve(0), 0.0, delta=0.1)
+
+
+class TestBandwidthLimitedDownload(_LocalServerTestCase):
+    """Unit test cases for downloads sharing a BandwidthLimiter."""
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if the download is throttled to the limit of the shared limiter"""
+        total = sum(len(segment) for segment in self.segments)
+        downloader = SegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=4
+        )
+        downloader.bandwidth_limiter = BandwidthLimiter(total * 2, burst=0)
+        start_time = time.monotonic()
+        downloader.download_playlist()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.45)
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import pytest
+
+from src.cli import main, read_batch_file
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestReadBatchFile(unittest.TestCase):
+    """Unit test cases for read_batch_file function."""
+
+    @pytest.mark.sequential_order
+    def test_read_batch_file(self):
+        """Test if read batch file returns the URL and output pairs, skipping blank and comment lines"""
+        batch = io.StringIO(
+            '# recordings\n'
+            'https://example.com/a/index.m3u8 a.mp4\n'
+            '\n'
+            'https://example.com/b/index.m3u8\tmy videos/b.mp4\n'
+        )
+        self.assertEqual(
+            read_batch_file(batch),
+            [('https://example.com/a/index.m3u8', 'a.mp4'), ('https://example.com/b/index.m3u8', 'my videos/b.mp4')]
+        )
+
+    @pytest.mark.sequential_order
+    def test_read_batch_file_invalid(self):
+        """Test if read batch file raises ValueError for lines without output file"""
+        with self.assertRaises(ValueError):
+            read_batch_file(io.StringIO('https://example.com/a/index.m3u8\n'))
+
+    @pytest.mark.sequential_order
+    def test_import_headless(self):
+        """Test if the batch mode can be imported without importing tkinter or requests"""
+        code = 'import sys, src.cli; print("tkinter" in sys.modules, "requests" in sys.modules)'
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(__file__))
+        )
+        self.assertEqual(result.stdout.strip(), 'False False')
+
+    @pytest.mark.sequential_order
+    def test_import_package(self):
+        """Test if importing the package for its constants, as setup.py does, imports none of the dependencies"""
+        code = (
+            'import sys; from src import Constants; '
+            'print([name for name in ("tkinter", "requests", "pym3u8downloader") if name in sys.modules])'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(__file__))
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+class TestBatchMode(_LocalServerTestCase):
+    """Unit test cases for the headless batch mode."""
+
+    def _run(self, lines: list, *arguments) -> tuple:
+        batch_file = os.path.join(self.temp_directory, 'batch.txt')
+        with open(batch_file, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        output = io.StringIO()
+        stdout = sys.stdout
+        sys.stdout = output
+        try:
+            exit_code = main(
+                [batch_file, '--engine', 'threaded', '--skip-space-check', '--interval', '0.05', *arguments]
+            )
+        finally:
+            sys.stdout = stdout
+        return exit_code, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    @pytest.mark.sequential_order
+    def test_batch(self):
+        """Test if the batch mode downloads all playlists and reports their outcome as JSON lines"""
+        outputs = [os.path.join(self.temp_directory, f'video{index}.mp4') for index in range(3)]
+        exit_code, records = self._run(
+            [f'{self.base_url}/media/index.m3u8 {outputs[0]}', f'{self.base_url}/media/index.m3u8 {outputs[1]}',
+             f'{self.base_url}/master.m3u8 {outputs[2]}'],
+            '--jobs', '2'
+        )
+        self.assertEqual(exit_code, 0)
+        for output_file in outputs:
+            with open(output_file, 'rb') as file:
+                self.assertEqual(file.read(), b''.join(self.segments))
+
+        finished = [record for record in records if record['event'] == 'finished']
+        self.assertEqual(len(finished), 3)
+        self.assertTrue(all(record['state'] == 'Completed' for record in finished))
+        self.assertEqual(finished[0]['metrics']['segments_completed'], len(self.segments))
+        self.assertEqual(records[-1], {'event': 'summary', 'jobs': 3, 'completed': 3})
+
+    @pytest.mark.sequential_order
+    def test_batch_failed(self):
+        """Test if the batch mode exits with 1 when a playlist cannot be downloaded"""
+        output_file = os.path.join(self.temp_directory, 'video.mp4')
+        exit_code, records = self._run([f'{self.base_url}/missing.m3u8 {output_file}'])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(records[-2]['state'], 'Failed')
+
+    @pytest.mark.sequential_order
+    def test_batch_pym3u8downloader(self):
+        """Test if the batch mode fails jobs of the pym3u8downloader engine, as it prints to the standard output"""
+        output_file = os.path.join(self.temp_directory, 'video.mp4')
+        exit_code, records = self._run(
+            [f'{self.base_url}/media/index.m3u8 {output_file}'], '--engine', 'pym3u8downloader'
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(records[-2]['state'], 'Failed')
+        self.assertIn('batch mode', records[-2]['message'])
+        self.assertFalse(os.path.exists(output_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
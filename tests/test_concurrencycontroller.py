@@ -0,0 +1,103 @@
+import asyncio
+import time
+import unittest
+from urllib.parse import urlparse
+
+import pytest
+
+from src import AsyncSegmentDownloader, ConcurrencyController, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestConcurrencyController(unittest.TestCase):
+    """Unit test cases for ConcurrencyController class."""
+
+    def setUp(self):
+        self.changes = []
+        self.controller = ConcurrencyController(
+            8, 2, on_change=lambda host, limit, reason: self.changes.append((host, limit, reason))
+        )
+
+    def _request(self, host: str, latency: float = 0.1, success: bool = True) -> None:
+        self.assertTrue(self.controller.try_acquire(host))
+        self.controller.release(host, latency, success)
+
+    @pytest.mark.sequential_order
+    def test_try_acquire(self):
+        """Test if no more requests than the limit of the host start"""
+        self.assertTrue(self.controller.try_acquire('a'))
+        self.assertTrue(self.controller.try_acquire('a'))
+        self.assertFalse(self.controller.try_acquire('a'))
+        self.assertTrue(self.controller.try_acquire('b'))
+        self.controller.release('a', success=None)
+        self.assertTrue(self.controller.try_acquire('a'))
+        self.assertEqual(self.changes, [])
+
+    @pytest.mark.sequential_order
+    def test_additive_increase(self):
+        """Test if the limit grows by one request per round of successful requests up to the maximum"""
+        for _ in range(4):
+            self._request('a')
+        self.assertEqual(self.controller.get_limit('a'), 3)
+        for _ in range(100):
+            self._request('a')
+        self.assertEqual(self.controller.get_limit('a'), 8)
+        self.assertEqual(self.controller.get_limit('b'), 2)
+        self.assertEqual([limit for _, limit, _ in self.changes], [3, 4, 5, 6, 7, 8])
+
+    @pytest.mark.sequential_order
+    def test_multiplicative_decrease(self):
+        """Test if failures and latency spikes halve the limit, at most once per round trip"""
+        for _ in range(100):
+            self._request('a', latency=0.05)
+        self._request('a', success=False)
+        self._request('a', success=False)
+        self.assertEqual(self.controller.get_limit('a'), 4)
+        time.sleep(0.1)
+        self._request('a', latency=10)
+        self.assertEqual(self.controller.get_limit('a'), 2)
+        self.assertEqual(self.changes[-2:], [('a', 4, 'request failed'), ('a', 2, 'latency 10.00s')])
+
+
+class TestAdaptiveConcurrency(_LocalServerTestCase):
+    """Unit test cases for downloads with adaptive concurrency."""
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if both engines download all segments in order with adaptive concurrency"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                downloader = engine(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=8,
+                    adaptive_concurrency=True
+                )
+                downloader.download_playlist()
+                with open(self.output_file, 'rb') as file:
+                    self.assertEqual(file.read(), b''.join(self.segments))
+                self.assertGreaterEqual(downloader.metrics.concurrency, 1)
+
+    @pytest.mark.sequential_order
+    def test_request_slot(self):
+        """Test if the latency reported is the time until the first response headers, not the whole fetch"""
+        url = f'{self.base_url}/media/segment0.ts'
+
+        def fetch(timings):
+            timings.extend([0.05, 0.01])
+            time.sleep(0.2)  # e.g. waiting for the bandwidth limiter
+
+        async def fetch_async(downloader):
+            async with downloader._request_slot_async(url) as timings:
+                timings.append(0.01)
+                await asyncio.sleep(0.2)
+
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                downloader = engine(url, self.output_file)
+                downloader._concurrency = ConcurrencyController(8)
+                if engine is SegmentDownloader:
+                    with downloader._request_slot(url) as timings:
+                        fetch(timings)
+                else:
+                    downloader._concurrency_condition = asyncio.Condition()
+                    asyncio.run(fetch_async(downloader))
+                self.assertEqual(downloader._concurrency._get_host(urlparse(url).netloc).latency, 0.01)
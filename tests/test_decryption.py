@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+
+import pytest
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from pym3u8downloader import M3U8DownloaderError
+
+from src import AsyncSegmentDownloader, HttpCache, KeyCache, SegmentDecryptor, SegmentDownloader
+from src.decryption import decrypt_aes_128
+from src.playlist import parse_playlist
+from test_segmentdownloader import _LocalServerTestCase
+
+_KEY = bytes(range(16))
+
+
+def _encrypt(data: bytes, iv: bytes) -> bytes:
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    encryptor = Cipher(algorithms.AES(_KEY), modes.CBC(iv)).encryptor()
+    return encryptor.update(padder.update(data) + padder.finalize()) + encryptor.finalize()
+
+
+class TestSegmentKey(unittest.TestCase):
+    """Unit test cases for the parsing of encrypted playlists."""
+
+    @pytest.mark.sequential_order
+    def test_parse_playlist(self):
+        """Test if every segment gets the key (and IV) of the EXT-X-KEY tag preceding it"""
+        playlist = parse_playlist(
+            '#EXTM3U\n#EXT-X-MEDIA-SEQUENCE:7\n#EXTINF:2.0,\na.ts\n'
+            '#EXT-X-KEY:METHOD=AES-128,URI="keys/1.bin"\n#EXTINF:2.0,\nb.ts\n'
+            '#EXT-X-KEY:METHOD=AES-128,URI="https://keys.example/2.bin",IV=0x0102\n#EXTINF:2.0,\nc.ts\n'
+            '#EXT-X-KEY:METHOD=NONE\n#EXTINF:2.0,\nd.ts\n#EXT-X-ENDLIST\n',
+            'https://media.example/video/index.m3u8'
+        )
+        a, b, c, d = playlist.segments
+        self.assertIsNone(a.key)
+        self.assertEqual((b.key.method, b.key.uri), ('AES-128', 'https://media.example/video/keys/1.bin'))
+        self.assertEqual(b.iv, (8).to_bytes(16, 'big'))
+        self.assertEqual(c.key.uri, 'https://keys.example/2.bin')
+        self.assertEqual(c.iv, bytes(14) + b'\x01\x02')
+        self.assertIsNone(d.key)
+
+    @pytest.mark.sequential_order
+    def test_parse_playlist_invalid_iv(self):
+        """Test if an invalid initialization vector is rejected"""
+        with self.assertRaises(ValueError):
+            parse_playlist('#EXTM3U\n#EXT-X-KEY:METHOD=AES-128,URI="k",IV=0x\n#EXTINF:2.0,\na.ts\n', 'http://host/')
+
+    @pytest.mark.sequential_order
+    def test_decrypt_file(self):
+        """Test if segment files are decrypted in chunks in the calling thread and in worker processes"""
+        iv = bytes(16)
+        data = os.urandom(3 * 1024 * 1024 + 5)
+        with tempfile.TemporaryDirectory() as directory:
+            source_path, destination_path = os.path.join(directory, 'a.enc'), os.path.join(directory, 'a.ts')
+            for max_workers in (0, 1):
+                with self.subTest(max_workers=max_workers):
+                    decryptor = SegmentDecryptor(max_workers)
+                    try:
+                        with open(source_path, 'wb') as file:
+                            file.write(_encrypt(data, iv))
+                        self.assertEqual(decryptor.decrypt_file(source_path, destination_path, _KEY, iv), len(data))
+                        with open(destination_path, 'rb') as file:
+                            self.assertEqual(file.read(), data)
+
+                        with open(source_path, 'wb') as file:
+                            file.write(b'x' * 16)
+                        with self.assertRaises(ValueError):
+                            decryptor.decrypt_file(source_path, destination_path, _KEY, iv)
+                    finally:
+                        decryptor.close()
+
+
+class TestSegmentDecryption(_LocalServerTestCase):
+    """Unit test cases for downloads of encrypted playlists."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.files['/media/key.bin'] = _KEY
+        for index, segment in enumerate(self.segments):
+            self.server.files[f'/media/segment{index}.ts'] = _encrypt(segment, index.to_bytes(16, 'big'))
+        self.server.files['/media/index.m3u8'] = self.server.files['/media/index.m3u8'].replace(
+            b'#EXT-X-TARGETDURATION:2\n', b'#EXT-X-TARGETDURATION:2\n#EXT-X-KEY:METHOD=AES-128,URI="key.bin"\n'
+        )
+
+    def _assert_output(self):
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if both engines decrypt the segments through the decryptor, fetching the key once"""
+        decryptor = SegmentDecryptor(2)
+        try:
+            for engine in (SegmentDownloader, AsyncSegmentDownloader):
+                for output_mode in SegmentDownloader.OUTPUT_MODES:
+                    with self.subTest(engine=engine.__name__, output_mode=output_mode):
+                        self.server.requests.clear()
+                        downloader = engine(
+                            f'{self.base_url}/media/index.m3u8', self.output_file, max_threads=4,
+                            output_mode=output_mode
+                        )
+                        downloader.decryptor = decryptor
+                        downloader.download_playlist()
+                        self._assert_output()
+                        self.assertEqual(self.server.requests.count('/media/key.bin'), 1)
+        finally:
+            decryptor.close()
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_without_decryptor(self):
+        """Test if segments are decrypted in the download threads without decryptor"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.download_playlist()
+        self._assert_output()
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_unsupported_method(self):
+        """Test if segments encrypted with an unsupported method fail the download"""
+        self.server.files['/media/index.m3u8'] = self.server.files['/media/index.m3u8'].replace(
+            b'METHOD=AES-128', b'METHOD=SAMPLE-AES'
+        )
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        with self.assertRaises(M3U8DownloaderError):
+            downloader.download_playlist()
+
+    @pytest.mark.sequential_order
+    def test_key_cache(self):
+        """Test if keys are revalidated against the HTTP cache and invalid keys are rejected"""
+        import requests
+
+        self.server.etags = {'/media/key.bin': '"k1"'}
+        http_cache = HttpCache(os.path.join(self.temp_directory, 'http_cache.json'))
+        with requests.Session() as session:
+            for _ in range(2):
+                self.assertEqual(KeyCache(http_cache).get(f'{self.base_url}/media/key.bin', session), _KEY)
+            self.assertEqual((http_cache.misses, http_cache.hits), (1, 1))
+
+            self.server.files['/media/short.bin'] = b'short'
+            with self.assertRaises(M3U8DownloaderError):
+                KeyCache().get(f'{self.base_url}/media/short.bin', session)
+
+    @pytest.mark.sequential_order
+    def test_decrypt_aes_128(self):
+        """Test if the decryption function inverts the encryption of the segment"""
+        iv = os.urandom(16)
+        self.assertEqual(decrypt_aes_128(_encrypt(self.segments[0], iv), _KEY, iv), self.segments[0])
@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from src import HttpCache, PlaylistInspector
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestHttpCache(_LocalServerTestCase):
+    """Unit test cases for HttpCache class."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.etags = {'/media/index.m3u8': '"v1"'}
+        self.cache_file = os.path.join(self.temp_directory, 'http_cache.json')
+
+    @pytest.mark.sequential_order
+    def test_inspect_revalidates(self):
+        """Test if a playlist which is no longer fresh is revalidated and its parsed playlist reused on 304"""
+        url = f'{self.base_url}/media/index.m3u8'
+        inspector = PlaylistInspector(ttl=60, http_cache=HttpCache(self.cache_file))
+        playlist = inspector.inspect(url)
+        self.assertEqual(inspector.http_cache.get_headers(url), {'If-None-Match': '"v1"'})
+
+        inspector.ttl = 0
+        self.assertIs(inspector.inspect(url), playlist)
+        self.assertEqual((inspector.http_cache.hits, inspector.http_cache.misses), (1, 1))
+
+        self.server.etags['/media/index.m3u8'] = '"v2"'
+        self.server.files['/media/index.m3u8'] = b'#EXTM3U\n#EXTINF:2.0,\nsegment0.ts\n#EXT-X-ENDLIST\n'
+        self.assertEqual(len(inspector.inspect(url).segments), 1)
+        self.assertEqual(inspector.http_cache.get_headers(url), {'If-None-Match': '"v2"'})
+
+    @pytest.mark.sequential_order
+    def test_persistent(self):
+        """Test if the cached responses survive a restart and are served on 304"""
+        url = f'{self.base_url}/media/index.m3u8'
+        PlaylistInspector(ttl=0, http_cache=HttpCache(self.cache_file)).inspect(url)
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+        inspector = PlaylistInspector(ttl=0, http_cache=HttpCache(self.cache_file))
+        playlist = inspector.inspect(url)
+        self.assertEqual(len(playlist.segments), len(self.segments))
+        self.assertEqual(playlist.segments[0].uri, f'{self.base_url}/media/segment0.ts')
+        self.assertEqual(inspector.http_cache.hits, 1)
+
+    @pytest.mark.sequential_order
+    def test_put_limits_entries(self):
+        """Test if only the most recently stored responses are kept, and responses without validators are not stored"""
+        cache = HttpCache(self.cache_file, max_entries=2)
+        for name in ('a', 'b', 'c'):
+            cache.put(f'http://host/{name}.m3u8', name.encode(), etag=f'"{name}"')
+        self.assertIsNone(cache.get('http://host/a.m3u8'))
+        self.assertEqual(cache.get('http://host/c.m3u8'), (b'c', 'http://host/c.m3u8'))
+
+        PlaylistInspector(ttl=0, http_cache=cache).inspect(f'{self.base_url}/master.m3u8')
+        self.assertEqual(cache.get_headers(f'{self.base_url}/master.m3u8'), {})
+
+    @pytest.mark.sequential_order
+    def test_put_writes_bodies(self):
+        """Test if every body is written to its own file and the index at most once per write interval"""
+        cache = HttpCache(self.cache_file)
+        cache.put('http://host/a.m3u8', b'#EXTM3U a', etag='"a"')
+        cache.put('http://host/b.m3u8', b'#EXTM3U b', etag='"b"')
+        with open(self.cache_file, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        self.assertEqual(list(index['entries']), ['http://host/a.m3u8'])
+        self.assertNotIn('content', index['entries']['http://host/a.m3u8'])
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+
+        cache.flush()
+        cache = HttpCache(self.cache_file, max_entries=1)
+        self.assertEqual(cache.get('http://host/b.m3u8'), (b'#EXTM3U b', 'http://host/b.m3u8'))
+        cache.put('http://host/c.m3u8', b'#EXTM3U c', etag='"c"')
+        self.assertIsNone(cache.get('http://host/b.m3u8'))
+        self.assertEqual(len(os.listdir(cache.directory)), 1)
@@ -0,0 +1,75 @@
+import os
+import pstats
+import tracemalloc
+import unittest
+
+import pytest
+
+from src import DownloadWorker, JobProfiler, JobState, PlaylistInspector
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestJobProfiler(unittest.TestCase):
+    """Unit test cases for JobProfiler class."""
+
+    @pytest.mark.sequential_order
+    def test_trace_memory(self):
+        """Test if tracemalloc is started by the first tracing job and stopped after the last one"""
+        first, second = JobProfiler(trace_memory=True), JobProfiler(trace_memory=True)
+        first.start()
+        second.start()
+        first.stop()
+        self.assertTrue(tracemalloc.is_tracing())
+        second.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    @pytest.mark.sequential_order
+    def test_stop_twice(self):
+        """Test if stopping a stopped profiler does nothing"""
+        profiler = JobProfiler(profile=True, trace_memory=True)
+        profiler.start()
+        profiler.stop()
+        profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+class TestJobProfiling(_LocalServerTestCase):
+    """Unit test cases for profiled download jobs."""
+
+    def _run(self, overrides):
+        reports = []
+
+        class ProfiledWorker(DownloadWorker):
+            def _on_report_written(self, report_file):
+                reports.append(report_file)
+
+        worker = ProfiledWorker(
+            f'{self.base_url}/media/index.m3u8', self.output_file, True, False, overrides=overrides,
+            inspector=PlaylistInspector(ttl=0)
+        )
+        worker.run()
+        self.assertEqual(worker.metrics.state, JobState.COMPLETED)
+        return worker, reports
+
+    @pytest.mark.sequential_order
+    def test_profile(self):
+        """Test if a profiled job writes the cProfile statistics and a report with functions and allocations"""
+        worker, reports = self._run({'profile': True, 'trace_memory': True, 'skip_space_check': True})
+        self.assertEqual(reports, [f'{self.output_file}.profile.txt'])
+        self.assertEqual(worker.report_file, reports[0])
+        self.assertGreater(pstats.Stats(f'{self.output_file}.prof').total_calls, 0)
+        with open(reports[0], 'r', encoding='utf-8') as file:
+            report = file.read()
+        self.assertIn(f'{self.base_url}/media/index.m3u8', report)
+        self.assertIn('functions by cumulative time', report)
+        self.assertIn('allocations by line', report)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    @pytest.mark.sequential_order
+    def test_not_profiled(self):
+        """Test if no report is written unless profiling is enabled"""
+        worker, reports = self._run({'skip_space_check': True})
+        self.assertEqual(reports, [])
+        self.assertIsNone(worker.report_file)
+        self.assertFalse(os.path.exists(f'{self.output_file}.profile.txt'))
+        self.assertFalse(os.path.exists(f'{self.output_file}.prof'))
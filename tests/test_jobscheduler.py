@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+from src import DownloadJob, JobScheduler, JobState
+
+
+class TestJobScheduler(unittest.TestCase):
+    """Unit test cases for JobScheduler class."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = []
+        self.lock = threading.Lock()
+        self.output_file = 'video.mp4'
+        self.input_url = 'https://raw.githubusercontent.com/coldsofttech/pym3u8downloader/main/tests/files/index.m3u8'
+
+    def tearDown(self):
+        self.release.set()
+
+    def _thread_factory(self, job):
+        def run():
+            with self.lock:
+                self.started.append(job)
+            self.release.wait(5)
+            job.finish(JobState.COMPLETED)
+
+        return threading.Thread(target=run)
+
+    def _create_job(self):
+        return DownloadJob(self.input_url, self.output_file, True, False)
+
+    @pytest.mark.sequential_order
+    def test_enqueue_respects_max_workers(self):
+        """Test if enqueue runs no more jobs than the worker limit"""
+        scheduler = JobScheduler(self._thread_factory, max_workers=2)
+        jobs = [scheduler.enqueue(self._create_job()) for _ in range(5)]
+        self.assertEqual([job.state for job in jobs].count(JobState.RUNNING), 2)
+        self.assertEqual([job.state for job in jobs].count(JobState.QUEUED), 3)
+        self.assertTrue(scheduler.is_busy())
+
+        self.release.set()
+        deadline = time.monotonic() + 5
+        while scheduler.is_busy() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertFalse(scheduler.is_busy())
+        self.assertTrue(all(job.state == JobState.COMPLETED for job in jobs))
+        self.assertEqual(len(self.started), len(jobs))
+
+    @pytest.mark.sequential_order
+    def test_max_workers_increase_starts_pending(self):
+        """Test if increasing the worker limit starts queued jobs"""
+        scheduler = JobScheduler(self._thread_factory, max_workers=1)
+        jobs = [scheduler.enqueue(self._create_job()) for _ in range(3)]
+        self.assertEqual(len(scheduler.running_threads()), 1)
+        scheduler.max_workers = 3
+        self.assertEqual(len(scheduler.running_threads()), 3)
+        self.assertTrue(all(job.state == JobState.RUNNING for job in jobs))
+
+    @pytest.mark.sequential_order
+    def test_invalid_max_workers(self):
+        """Test if scheduler raises ValueError for invalid worker limit"""
+        with self.assertRaises(ValueError):
+            JobScheduler(self._thread_factory, max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
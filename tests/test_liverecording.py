@@ -0,0 +1,95 @@
+import pytest
+
+from src import AsyncSegmentDownloader, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class _LivePlaylist(dict):
+    """Files of the test server whose live playlist publishes two more segments on every request."""
+
+    def __init__(self, files: dict, segment_count: int, window: int = 4) -> None:
+        super().__init__(files)
+        self.segment_count = segment_count
+        self.window = window
+        self.published = 2
+        self.reloads = 0
+
+    def get(self, path, default=None):
+        if path != '/live/index.m3u8':
+            return super().get(path, default)
+        end = min(self.published, self.segment_count)
+        start = max(0, end - self.window)
+        self.published += 2
+        self.reloads += 1
+        return (
+            f'#EXTM3U\n#EXT-X-TARGETDURATION:0.05\n#EXT-X-MEDIA-SEQUENCE:{100 + start}\n'
+            + ''.join(f'#EXTINF:2.0,\n../media/segment{index}.ts\n' for index in range(start, end))
+            + ('#EXT-X-ENDLIST\n' if end == self.segment_count else '')
+        ).encode()
+
+    def __contains__(self, path):
+        return path == '/live/index.m3u8' or super().__contains__(path)
+
+
+class TestLiveRecording(_LocalServerTestCase):
+    """Unit test cases for recording live playlists."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.files = _LivePlaylist(self.server.files, len(self.segments))
+
+    def _create_downloader(self, engine: type, **kwargs):
+        downloader = engine(
+            f'{self.base_url}/live/index.m3u8', self.output_file, skip_space_check=True, live=True, **kwargs
+        )
+        downloader._live_min_poll_interval = 0
+        return downloader
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_live(self):
+        """Test if both engines record each segment of a live playlist once, in order, with one pool for all polls"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.server.files.published = 2
+                self.server.requests.clear()
+                downloader = self._create_downloader(engine)
+                created = []
+                create_concurrency_controller = downloader._create_concurrency_controller
+                downloader._create_concurrency_controller = (
+                    lambda max_limit: created.append(max_limit) or create_concurrency_controller(max_limit)
+                )
+                downloader.download_playlist()
+                self.assertEqual(len(created), 1)
+                with open(self.output_file, 'rb') as file:
+                    self.assertEqual(file.read(), b''.join(self.segments))
+                segment_requests = [path for path in self.server.requests if path.endswith('.ts')]
+                self.assertEqual(len(segment_requests), len(self.segments))
+                self.assertEqual(downloader.metrics.segments_total, len(self.segments))
+                self.assertTrue(downloader.is_download_complete)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_live_max_duration(self):
+        """Test if recording stops once the maximum duration is recorded"""
+        downloader = self._create_downloader(SegmentDownloader, live_max_duration=9)
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments[:5]))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_live_fell_behind(self):
+        """Test if segments which left the playlist are skipped and recording goes on"""
+        self.server.files.window = 1
+        downloader = self._create_downloader(SegmentDownloader)
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments[1::2]))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_vod(self):
+        """Test if a playlist which already ended is downloaded as usual in live mode"""
+        downloader = SegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, live=True
+        )
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from src import M3U8DownloaderUI
+from src.playlist import MasterPlaylist, Variant
 
 
 class TestM3U8DownloaderUI(unittest.TestCase):
@@ -37,7 +38,7 @@ class TestM3U8DownloaderUI(unittest.TestCase):
         self.source.selected_file_path.set(self.output_file)
         self.source._new_callback()
         self.assertEqual(self.source.input_entry.get(), '')
-        self.assertEqual(self.source.selected_file_path, '')
+        self.assertEqual(self.source.selected_file_path.get(), '')
 
     @pytest.mark.sequential_order
     def test__exit_callback_download_thread_running(self):
@@ -89,6 +90,48 @@ class TestM3U8DownloaderUI(unittest.TestCase):
         self.assertEqual(str(self.source.download_button.cget('state')), 'normal')
         self.assertEqual(str(self.source.file_menu.entrycget(0, 'state')), 'normal')
 
+    @pytest.mark.sequential_order
+    def test__start_probe(self):
+        """Test if probing a master playlist shows its variants before the download is started"""
+        playlist = MasterPlaylist(self.input_url, [Variant('720/index.m3u8', '1280000', '720', '1280x720')])
+        with patch.object(self.source.inspector, 'inspect', return_value=playlist) as mock_inspect:
+            self.source.input_entry.insert(0, self.input_url)
+            self.assertIsNotNone(self.source.probe_after_id)
+            self.source._start_probe()
+            self.source.probe_thread.join()
+            self.source._apply_probe_result()
+            mock_inspect.assert_called_once_with(self.input_url, True)
+        self.assertEqual(
+            self.source.variants_combobox.get(), 'Name: 720 | Bandwidth: 1280000 | Resolution: 1280x720'
+        )
+
+    @pytest.mark.sequential_order
+    def test__start_probe_outdated(self):
+        """Test if the result of a probe is dropped when the input changed while probing"""
+        playlist = MasterPlaylist(self.input_url, [Variant('720/index.m3u8', '1280000', '720', '1280x720')])
+        with patch.object(self.source.inspector, 'inspect', return_value=playlist):
+            self.source.input_entry.insert(0, self.input_url)
+            self.source._start_probe()
+            self.source.probe_thread.join()
+            self.source.input_entry.insert(tk.END, '?changed')
+            self.source._apply_probe_result()
+        self.assertEqual(self.source.variants_combobox.get(), '')
+
+    @pytest.mark.sequential_order
+    def test__start_probe_after_new(self):
+        """Test if the input URL is probed after the 'New' option reset the form"""
+        self.source.skip_ssl.set(True)
+        self.source._new_callback()
+        self.assertFalse(self.source.skip_ssl.get())
+        self.assertIsNotNone(self.source.probe_after_id)
+        playlist = MasterPlaylist(self.input_url, [Variant('720/index.m3u8', '1280000', '720', '1280x720')])
+        with patch.object(self.source.inspector, 'inspect', return_value=playlist) as mock_inspect:
+            self.source._start_probe()
+            self.source.input_entry.insert(0, self.input_url)
+            self.source._start_probe()
+            self.source.probe_thread.join()
+            mock_inspect.assert_called_once_with(self.input_url, True)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+from src import AsyncSegmentDownloader, MemoryBudget, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Unit test cases for MemoryBudget class."""
+
+    @pytest.mark.sequential_order
+    def test_try_acquire(self):
+        """Test if reservations are limited, except for the first one and overdrafts"""
+        budget = MemoryBudget(1000)
+        self.assertTrue(budget.try_acquire(1500))
+        self.assertFalse(budget.try_acquire(1))
+        self.assertTrue(budget.try_acquire(100, overdraw=True))
+        budget.release(1500)
+        self.assertTrue(budget.try_acquire(900))
+        self.assertEqual((budget.in_use, budget.peak), (1000, 1600))
+        budget.set_limit(0)
+        self.assertTrue(budget.try_acquire(10 ** 9))
+
+    @pytest.mark.sequential_order
+    def test_acquire(self):
+        """Test if a reservation waits for released bytes and stops waiting when cancelled or allowed to overdraw"""
+        budget = MemoryBudget(1000)
+        budget.try_acquire(800)
+        threading.Timer(0.2, budget.release, (800,)).start()
+        start_time = time.perf_counter()
+        self.assertTrue(budget.acquire(500))
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.15)
+
+        cancel_event = threading.Event()
+        threading.Timer(0.2, cancel_event.set).start()
+        self.assertFalse(budget.acquire(800, cancel_event))
+        overdraw = threading.Event()
+        threading.Timer(0.2, overdraw.set).start()
+        self.assertTrue(budget.acquire(800, overdraw=overdraw.is_set))
+        self.assertEqual(budget.in_use, 1300)
+
+    @pytest.mark.sequential_order
+    def test_listener(self):
+        """Test if listeners are invoked on every release and limit change until they are removed"""
+        budget = MemoryBudget(1000)
+        calls = []
+        budget.add_listener(lambda: calls.append(budget.in_use))
+        budget.try_acquire(800)
+        budget.release(300)
+        budget.set_limit(2000)
+        self.assertEqual(calls, [500, 500])
+        budget.remove_listener(budget._listeners[0])
+        budget.release(500)
+        self.assertEqual(len(calls), 2)
+
+    @pytest.mark.sequential_order
+    def test_invalid_limit(self):
+        """Test if a negative limit is rejected"""
+        with self.assertRaises(ValueError):
+            MemoryBudget(-1)
+
+
+class TestMemoryBudgetDownload(_LocalServerTestCase):
+    """Unit test cases for downloads within a memory budget."""
+
+    def _download(self, engine, budget, output_mode=SegmentDownloader.OUTPUT_MODE_STREAMING):
+        settings = {'max_concurrency': 8} if engine is AsyncSegmentDownloader else {}
+        downloader = engine(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=8,
+            output_mode=output_mode, **settings
+        )
+        downloader.memory_budget = budget
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertEqual(budget.in_use, 0)
+        return downloader
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_streaming(self):
+        """Test if streaming downloads of both engines stay within the budget, plus the segment written next"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            for limit in (1, 3000):
+                with self.subTest(engine=engine.__name__, limit=limit):
+                    budget = MemoryBudget(limit)
+                    self.server.delay = 0.01
+                    downloader = self._download(engine, budget)
+                    largest = max(map(len, self.segments))
+                    self.assertLessEqual(budget.peak, max(limit, largest) + largest)
+                    self.assertGreater(downloader.metrics.peak_buffered_bytes, 0)
+                    self.assertIn('MiB buffered', str(downloader.metrics))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_staged(self):
+        """Test if staged downloads of both engines write the segments to disk as they arrive"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                budget = MemoryBudget(1)
+                downloader = self._download(engine, budget, SegmentDownloader.OUTPUT_MODE_STAGED)
+                self.assertEqual(budget.peak, 0)
+                self.assertEqual(downloader.metrics.peak_buffered_bytes, 0)
+                self.assertEqual(downloader.metrics.to_dict()['peak_buffered_bytes'], 0)
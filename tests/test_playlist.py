@@ -0,0 +1,61 @@
+import unittest
+
+import pytest
+
+from src.playlist import MasterPlaylist, MediaPlaylist, parse_playlist
+
+
+class TestParsePlaylist(unittest.TestCase):
+    """Unit test cases for parse_playlist function."""
+
+    def setUp(self):
+        self.url = 'https://example.com/videos/index.m3u8'
+
+    @pytest.mark.sequential_order
+    def test_parse_playlist_media(self):
+        """Test if parse playlist identifies media playlist and resolves segment URLs"""
+        content = (
+            '#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXT-X-MEDIA-SEQUENCE:10\n'
+            '#EXTINF:6.0,\nsegment0.ts\n#EXTINF:4.5,\n/other/segment1.ts\n'
+            '#EXTINF:6.0,\nhttps://cdn.example.com/segment2.ts\n#EXT-X-ENDLIST\n'
+        )
+        playlist = parse_playlist(content, self.url)
+        self.assertIsInstance(playlist, MediaPlaylist)
+        self.assertEqual(playlist.target_duration, 6.0)
+        self.assertTrue(playlist.is_endlist)
+        self.assertEqual(
+            [segment.uri for segment in playlist.segments],
+            [
+                'https://example.com/videos/segment0.ts',
+                'https://example.com/other/segment1.ts',
+                'https://cdn.example.com/segment2.ts'
+            ]
+        )
+        self.assertEqual([segment.sequence for segment in playlist.segments], [10, 11, 12])
+        self.assertEqual(playlist.segments[1].duration, 4.5)
+
+    @pytest.mark.sequential_order
+    def test_parse_playlist_master(self):
+        """Test if parse playlist identifies master playlist and its variants"""
+        content = (
+            '#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1280000,RESOLUTION=1280x720,NAME="720"\n720/index.m3u8\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=640000,RESOLUTION=640x360,NAME="360"\n360/index.m3u8\n'
+        )
+        playlist = parse_playlist(content, self.url)
+        self.assertIsInstance(playlist, MasterPlaylist)
+        self.assertEqual(len(playlist.variants), 2)
+        self.assertEqual(playlist.variants[0].uri, 'https://example.com/videos/720/index.m3u8')
+        self.assertEqual(
+            playlist.variants[1].to_dict(), {'bandwidth': '640000', 'name': '360', 'resolution': '640x360'}
+        )
+        self.assertEqual(playlist.search(resolution='640x360'), [playlist.variants[1]])
+
+    @pytest.mark.sequential_order
+    def test_parse_playlist_invalid(self):
+        """Test if parse playlist raises ValueError for content which is not a playlist"""
+        with self.assertRaises(ValueError):
+            parse_playlist('<html></html>', self.url)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from pym3u8downloader import M3U8DownloaderError
+
+from src import DownloadJob, DownloadWorker, JobState, PlaylistInspector
+from src.playlist import MasterPlaylist, MediaPlaylist
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestPlaylistInspector(_LocalServerTestCase):
+    """Unit test cases for PlaylistInspector class."""
+
+    @pytest.mark.sequential_order
+    def test_inspect(self):
+        """Test if inspect classifies the playlist and fetches it only once while it is fresh"""
+        inspector = PlaylistInspector()
+        master = inspector.inspect(f'{self.base_url}/master.m3u8')
+        self.assertIsInstance(master, MasterPlaylist)
+        self.assertIs(inspector.inspect(f'{self.base_url}/master.m3u8'), master)
+        self.assertIsInstance(inspector.inspect(f'{self.base_url}/master.m3u8', verify_ssl=False), MasterPlaylist)
+        self.assertIsInstance(inspector.inspect(f'{self.base_url}/media/index.m3u8'), MediaPlaylist)
+        self.assertEqual(self.server.requests, ['/master.m3u8', '/master.m3u8', '/media/index.m3u8'])
+        self.assertEqual((inspector.hits, inspector.misses), (1, 3))
+
+        inspector.invalidate(f'{self.base_url}/master.m3u8')
+        self.assertIsNone(inspector.get_cached(f'{self.base_url}/master.m3u8'))
+        self.assertIsNotNone(inspector.get_cached(f'{self.base_url}/media/index.m3u8'))
+
+    @pytest.mark.sequential_order
+    def test_inspect_no_cache(self):
+        """Test if inspect fetches the playlist every time when caching is disabled"""
+        inspector = PlaylistInspector(ttl=0)
+        inspector.inspect(f'{self.base_url}/master.m3u8')
+        inspector.inspect(f'{self.base_url}/master.m3u8')
+        self.assertEqual(self.server.requests, ['/master.m3u8', '/master.m3u8'])
+
+    @pytest.mark.sequential_order
+    def test_inspect_not_found(self):
+        """Test if inspect raises M3U8DownloaderError for missing playlists without caching the failure"""
+        inspector = PlaylistInspector()
+        for _ in range(2):
+            with self.assertRaises(M3U8DownloaderError):
+                inspector.inspect(f'{self.base_url}/missing.m3u8')
+        self.assertEqual(len(self.server.requests), 2)
+
+    @pytest.mark.sequential_order
+    def test_download_worker_master(self):
+        """Test if the variant selection and the download of a master playlist fetch the master playlist once"""
+        inspector = PlaylistInspector()
+        overrides = {'engine': 'threaded', 'skip_space_check': True}
+        url = f'{self.base_url}/master.m3u8'
+
+        job = DownloadJob(url, self.output_file, True, False)
+        worker = DownloadWorker(url, self.output_file, True, False, job=job, overrides=overrides, inspector=inspector)
+        worker.start()
+        worker.join()
+        self.assertEqual(job.state, JobState.VARIANT_REQUIRED)
+
+        variant = inspector.inspect(url).variants[0]
+        job = DownloadJob(url, self.output_file, True, True, variant)
+        worker = DownloadWorker(
+            url, self.output_file, True, True, variant, job, overrides=overrides, inspector=inspector
+        )
+        worker.start()
+        worker.join()
+        self.assertEqual(job.state, JobState.COMPLETED)
+        self.assertTrue(os.path.exists(self.output_file))
+        self.assertEqual(self.server.requests.count('/master.m3u8'), 1)
+        self.assertEqual(self.server.requests.count('/media/index.m3u8'), 1)
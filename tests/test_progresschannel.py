@@ -0,0 +1,56 @@
+import threading
+import unittest
+
+import pytest
+
+from src.progress import ProgressChannel, ProgressEvent
+
+
+class TestProgressChannel(unittest.TestCase):
+    """Unit test cases for ProgressChannel class."""
+
+    @pytest.mark.sequential_order
+    def test_drain_keeps_latest_event(self):
+        """Test if drain keeps only the latest event of every job"""
+        channel = ProgressChannel()
+        for completed in range(1, 11):
+            channel.publish(ProgressEvent(1, 'Download', completed, 10))
+        channel.publish(ProgressEvent(2, 'Downloading'))
+        channel.publish(ProgressEvent(1, 'Build', 5, 10))
+
+        events = channel.drain()
+        self.assertEqual(list(events), [2, 1])
+        self.assertEqual(str(events[1]), 'Build: 50% (5/10)')
+        self.assertEqual(str(events[2]), 'Downloading')
+        self.assertEqual(channel.drain(), {})
+
+    @pytest.mark.sequential_order
+    def test_publish_from_threads(self):
+        """Test if events published from several threads are all drained"""
+        channel = ProgressChannel(max_events=10000)
+        threads = [
+            threading.Thread(
+                target=lambda job_id=job_id: [channel.publish(ProgressEvent(job_id, 'Download', i, 1000))
+                                              for i in range(1, 1001)]
+            )
+            for job_id in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = channel.drain()
+        self.assertEqual(sorted(events), [0, 1, 2, 3])
+        self.assertTrue(all(event.percentage == 100 for event in events.values()))
+
+    @pytest.mark.sequential_order
+    def test_event_message(self):
+        """Test if the message of an event takes precedence over its progress"""
+        event = ProgressEvent(1, 'Build', 0, 0, 'Merged 1.0 MiB in 0.01s (100.0 MiB/s)')
+        self.assertEqual(event.percentage, 0)
+        self.assertEqual(str(event), 'Merged 1.0 MiB in 0.01s (100.0 MiB/s)')
+
+
+if __name__ == "__main__":
+    unittest.main()
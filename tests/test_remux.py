@@ -0,0 +1,91 @@
+import os
+import shlex
+import sys
+import unittest
+
+import pytest
+from pym3u8downloader import M3U8DownloaderError
+
+from src import AsyncSegmentDownloader, SegmentDownloader
+from src.remux import get_muxer_arguments
+from test_segmentdownloader import _LocalServerTestCase
+
+# A pipe-compatible muxer: writes a header followed by its standard input to the output file, or fails right away
+_FAKE_MUXER = """import sys
+if len(sys.argv) > 2:
+    sys.stderr.write(sys.argv[2] + '\\n')
+    sys.exit(3)
+data = sys.stdin.buffer.read()
+with open(sys.argv[1], 'wb') as file:
+    file.write(b'MUX' + data)
+"""
+
+
+class TestMuxerArguments(unittest.TestCase):
+    """Unit test cases for the parsing of muxer commands."""
+
+    @pytest.mark.sequential_order
+    def test_get_muxer_arguments(self):
+        """Test if the output placeholder is replaced within a single argument"""
+        self.assertEqual(
+            get_muxer_arguments('ffmpeg -i pipe:0 -c copy "{output}"', '/tmp/my video.mp4'),
+            ['ffmpeg', '-i', 'pipe:0', '-c', 'copy', '/tmp/my video.mp4']
+        )
+
+    @pytest.mark.sequential_order
+    def test_invalid_command(self):
+        """Test if empty commands and commands without the output placeholder are rejected"""
+        for command in ('', 'ffmpeg -i pipe:0 out.mp4'):
+            with self.subTest(command=command):
+                with self.assertRaises(ValueError):
+                    get_muxer_arguments(command, 'video.mp4')
+
+
+class TestRemux(_LocalServerTestCase):
+    """Unit test cases for downloads piped into a muxer."""
+
+    def setUp(self):
+        super().setUp()
+        script_path = os.path.join(self.temp_directory, 'muxer.py')
+        with open(script_path, 'w') as file:
+            file.write(_FAKE_MUXER)
+        self.command = f'{shlex.quote(sys.executable)} {shlex.quote(script_path)} {{output}}'
+
+    def _download(self, engine, output_mode, command):
+        downloader = engine(
+            f'{self.base_url}/media/index.m3u8', self.output_file, max_threads=4, output_mode=output_mode,
+            remux_command=command
+        )
+        downloader.download_playlist()
+        return downloader
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if both engines pipe the segments into the muxer in playlist order in both output modes"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            for output_mode in SegmentDownloader.OUTPUT_MODES:
+                with self.subTest(engine=engine.__name__, output_mode=output_mode):
+                    self.server.delay = 0.005
+                    downloader = self._download(engine, output_mode, self.command)
+                    with open(self.output_file, 'rb') as file:
+                        self.assertEqual(file.read(), b'MUX' + b''.join(self.segments))
+                    self.assertFalse(os.path.exists(downloader.checkpoint_file_path))
+                    self.assertFalse(os.path.exists(downloader.parts_directory_path))
+
+    @pytest.mark.sequential_order
+    def test_muxer_failed(self):
+        """Test if a failing muxer fails the download with its error message"""
+        for output_mode in SegmentDownloader.OUTPUT_MODES:
+            with self.subTest(output_mode=output_mode):
+                with self.assertRaises(M3U8DownloaderError) as context:
+                    self._download(SegmentDownloader, output_mode, f'{self.command} "invalid input"')
+                self.assertIn('invalid input', context.exception.message)
+
+    @pytest.mark.sequential_order
+    def test_muxer_not_found(self):
+        """Test if a muxer which cannot be started fails the download"""
+        with self.assertRaises(M3U8DownloaderError):
+            self._download(
+                SegmentDownloader, SegmentDownloader.OUTPUT_MODE_STREAMING,
+                os.path.join(self.temp_directory, 'missing-muxer') + ' {output}'
+            )
@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from src import AsyncSegmentDownloader, SegmentCache, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestSegmentCache(unittest.TestCase):
+    """Unit test cases for SegmentCache class."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.temp_directory, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    def _put(self, cache: SegmentCache, url: str, data: bytes, **validators) -> None:
+        source_path = os.path.join(self.temp_directory, 'received.ts')
+        with open(source_path, 'wb') as file:
+            file.write(data)
+        cache.put(url, source_path, **validators)
+
+    def _get(self, cache: SegmentCache, url: str):
+        destination_path = os.path.join(self.temp_directory, f'segment{cache.hits + cache.misses}.ts')
+        size = cache.get(url, destination_path)
+        if size is None:
+            self.assertFalse(os.path.exists(destination_path))
+            return None
+        with open(destination_path, 'rb') as file:
+            data = file.read()
+        self.assertEqual(size, len(data))
+        return data
+
+    @pytest.mark.sequential_order
+    def test_get(self):
+        """Test if stored segments are served with their validators and identical content is stored once"""
+        cache = SegmentCache(self.cache_directory, max_size=1000)
+        self.assertIsNone(self._get(cache, 'http://host/a.ts'))
+        self.assertIsNone(cache.get_headers('http://host/a.ts'))
+        self._put(cache, 'http://host/a.ts', b'a' * 100, etag='"1"', last_modified='Mon, 05 Oct 2026 10:00:00 GMT')
+        self._put(cache, 'http://host/b.ts', b'a' * 100)
+        self.assertEqual(self._get(cache, 'http://host/a.ts'), b'a' * 100)
+        self.assertEqual(self._get(cache, 'http://host/b.ts'), b'a' * 100)
+        self.assertEqual(
+            cache.get_headers('http://host/a.ts'),
+            {'If-None-Match': '"1"', 'If-Modified-Since': 'Mon, 05 Oct 2026 10:00:00 GMT'}
+        )
+        self.assertEqual(cache.get_headers('http://host/b.ts'), {})
+        self.assertEqual(cache.size, 100)
+        cache.record_miss()
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    @pytest.mark.sequential_order
+    def test_put_evicts_least_recently_used(self):
+        """Test if the least recently used segments are evicted once the cache is full"""
+        cache = SegmentCache(self.cache_directory, max_size=250)
+        self._put(cache, 'http://host/a.ts', b'a' * 100)
+        self._put(cache, 'http://host/b.ts', b'b' * 100)
+        self._get(cache, 'http://host/a.ts')
+        self._put(cache, 'http://host/c.ts', b'c' * 100)
+        self.assertIsNone(self._get(cache, 'http://host/b.ts'))
+        self.assertIsNotNone(self._get(cache, 'http://host/a.ts'))
+        self.assertIsNotNone(self._get(cache, 'http://host/c.ts'))
+        self.assertEqual((cache.size, cache.evictions), (200, 1))
+        self._put(cache, 'http://host/d.ts', b'd' * 300)
+        self.assertIsNone(self._get(cache, 'http://host/d.ts'))
+
+    @pytest.mark.sequential_order
+    def test_flush(self):
+        """Test if the cached segments survive a restart and damaged segments are not served"""
+        cache = SegmentCache(self.cache_directory, max_size=1000)
+        self._put(cache, 'http://host/a.ts', b'a' * 100)
+        self._put(cache, 'http://host/b.ts', b'b' * 100)
+        cache.flush()
+
+        for root, _, files in os.walk(self.cache_directory):
+            for file_name in files:
+                if file_name != 'index.json' and open(os.path.join(root, file_name), 'rb').read(1) == b'b':
+                    with open(os.path.join(root, file_name), 'wb') as file:
+                        file.write(b'x' * 100)
+
+        cache = SegmentCache(self.cache_directory, max_size=1000)
+        self.assertEqual(self._get(cache, 'http://host/a.ts'), b'a' * 100)
+        self.assertIsNone(self._get(cache, 'http://host/b.ts'))
+        self.assertEqual(cache.size, 100)
+
+
+class TestSegmentCacheDownload(_LocalServerTestCase):
+    """Unit test cases for downloads through a segment cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = SegmentCache(os.path.join(self.temp_directory, 'cache'), max_size=1024 * 1024)
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.segment_cache = self.cache
+        downloader.download_playlist()
+        self.assertEqual(self.cache.misses, len(self.segments))
+        self.assertTrue(os.path.isfile(os.path.join(self.cache.directory, 'index.json')))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if both engines serve the segments of a playlist downloaded before from the cache"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            for output_mode in (SegmentDownloader.OUTPUT_MODE_STREAMING, SegmentDownloader.OUTPUT_MODE_STAGED):
+                with self.subTest(engine=engine.__name__, output_mode=output_mode):
+                    output_file = os.path.join(self.temp_directory, f'{engine.__name__}-{output_mode}.mp4')
+                    downloader = engine(
+                        f'{self.base_url}/media/index.m3u8', output_file, skip_space_check=True,
+                        output_mode=output_mode
+                    )
+                    downloader.segment_cache = self.cache
+                    self.server.requests.clear()
+                    downloader.download_playlist()
+                    with open(output_file, 'rb') as file:
+                        self.assertEqual(file.read(), b''.join(self.segments))
+                    self.assertEqual(self.server.requests, ['/media/index.m3u8'])
+                    self.assertEqual(downloader.metrics.cache_hits, len(self.segments))
+                    self.assertEqual(downloader.metrics.cache_bytes_saved, sum(map(len, self.segments)))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_revalidated(self):
+        """Test if both engines revalidate segments cached with validators and fetch the changed ones in full"""
+        self.server.etags = {f'/media/segment{index}.ts': '"1"' for index in range(len(self.segments))}
+        self.cache = SegmentCache(os.path.join(self.temp_directory, 'revalidated'), max_size=1024 * 1024)
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.segment_cache = self.cache
+        downloader.download_playlist()
+
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.segments[3] = engine.__name__.encode() * 100
+                self.server.files['/media/segment3.ts'] = self.segments[3]
+                self.server.etags['/media/segment3.ts'] = f'"{engine.__name__}"'
+                output_file = os.path.join(self.temp_directory, f'{engine.__name__}.mp4')
+                downloader = engine(f'{self.base_url}/media/index.m3u8', output_file, skip_space_check=True)
+                downloader.segment_cache = self.cache
+                self.server.requests.clear()
+                downloader.download_playlist()
+                with open(output_file, 'rb') as file:
+                    self.assertEqual(file.read(), b''.join(self.segments))
+                self.assertEqual(len(self.server.requests), len(self.segments) + 1)
+                metrics = downloader.metrics
+                self.assertEqual((metrics.cache_hits, metrics.cache_misses), (len(self.segments) - 1, 1))
+                self.assertEqual(metrics.cache_bytes_saved, sum(map(len, self.segments)) - len(self.segments[3]))
+                self.assertIn(f'cache {len(self.segments) - 1}/{len(self.segments)} hits', str(metrics))
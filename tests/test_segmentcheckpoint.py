@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from src.checkpoint import SegmentCheckpoint
+from src.playlist import Segment
+
+
+class TestSegmentCheckpoint(unittest.TestCase):
+    """Unit test cases for SegmentCheckpoint class."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_directory, 'video.mp4.checkpoint')
+        self.url = 'https://example.com/index.m3u8'
+        self.segments = [Segment(index, f'https://example.com/segment{index}.ts', 2.0, index) for index in range(4)]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    @pytest.mark.sequential_order
+    def test_record_offsets(self):
+        """Test if record derives offsets once the preceding segments are finished"""
+        checkpoint = SegmentCheckpoint(self.file_path, self.url, self.segments)
+        self.assertFalse(checkpoint.open())
+        checkpoint.record(1, 200)
+        self.assertIsNone(checkpoint.get_offset(1))
+        checkpoint.record(0, 100)
+        checkpoint.record(2, 300)
+        checkpoint.close()
+        self.assertEqual(checkpoint.get_offset(1), 100)
+        self.assertEqual(checkpoint.get_offset(2), 300)
+
+    @pytest.mark.sequential_order
+    def test_open_resume(self):
+        """Test if open resumes a manifest of the same playlist, ignoring a partially written line"""
+        checkpoint = SegmentCheckpoint(self.file_path, self.url, self.segments)
+        checkpoint.open()
+        checkpoint.record(0, 100)
+        checkpoint.record(2, 300)
+        checkpoint.close()
+        with open(self.file_path, 'a') as file:
+            file.write('{"index": 3, "si')
+
+        resumed = SegmentCheckpoint(self.file_path, f'{self.url}?token=new', self.segments)
+        self.assertTrue(resumed.open())
+        self.assertEqual(resumed.completed, {0: 100, 2: 300})
+        resumed.record(1, 200)
+        resumed.close()
+
+        reloaded = SegmentCheckpoint(self.file_path, self.url, self.segments)
+        self.assertTrue(reloaded.open())
+        reloaded.close()
+        self.assertEqual(reloaded.completed, {0: 100, 1: 200, 2: 300})
+        self.assertEqual(reloaded.get_offset(2), 300)
+
+    @pytest.mark.sequential_order
+    def test_open_other_playlist(self):
+        """Test if open replaces a manifest of another playlist"""
+        checkpoint = SegmentCheckpoint(self.file_path, self.url, self.segments)
+        checkpoint.open()
+        checkpoint.record(0, 100)
+        checkpoint.close()
+
+        other = SegmentCheckpoint(self.file_path, self.url, self.segments[:2])
+        self.assertFalse(other.open())
+        other.remove()
+        self.assertEqual(other.completed, {})
+        self.assertFalse(os.path.exists(self.file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,308 @@
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import pytest
+from pym3u8downloader import M3U8DownloaderError, M3U8DownloaderWarning
+
+from src import AsyncSegmentDownloader, DownloadCancelledError, SegmentDownloader
+from src.playlist import Variant
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Request handler serving the files of the owning test server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(getattr(self.server, 'delay', 0))
+        time.sleep(getattr(self.server, 'stalls', {}).pop(self.path, 0))
+        self.server.requests.append(self.path)
+        failures = getattr(self.server, 'failures', {})
+        if failures.get(self.path):
+            failures[self.path] -= 1
+            self.send_error(503)
+            return
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = getattr(self.server, 'etags', {}).get(self.path)
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.server.head_requests.append(self.path)
+        body = self.server.files.get(self.path, b'')
+        self.send_response(200 if self.path in self.server.files else 404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _LocalServerTestCase(unittest.TestCase):
+    """Base class for test cases downloading from a local HTTP server."""
+
+    def setUp(self):
+        self.segments = [bytes([index]) * (1000 + index) for index in range(20)]
+        files = {f'/media/segment{index}.ts': body for index, body in enumerate(self.segments)}
+        files['/media/index.m3u8'] = (
+            '#EXTM3U\n#EXT-X-TARGETDURATION:2\n'
+            + ''.join(f'#EXTINF:2.0,\nsegment{index}.ts\n' for index in range(len(self.segments)))
+            + '#EXT-X-ENDLIST\n'
+        ).encode()
+        files['/master.m3u8'] = (
+            b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1280000,RESOLUTION=1280x720,NAME="720"\nmedia/index.m3u8\n'
+        )
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.files = files
+        self.server.requests = []
+        self.server.head_requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.temp_directory = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_directory, 'video.mp4')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+
+class TestSegmentDownloader(_LocalServerTestCase):
+    """Unit test cases for SegmentDownloader class."""
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if download playlist writes all segments in playlist order"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, max_threads=4)
+        downloader.download_playlist()
+        self.assertTrue(downloader.is_download_complete)
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertFalse(os.path.exists(downloader.parts_directory_path))
+        self.assertEqual(downloader.metrics.segments_completed, len(self.segments))
+        self.assertEqual(downloader.metrics.bytes_downloaded, sum(len(segment) for segment in self.segments))
+        self.assertEqual(sum(downloader.metrics.latency_counts), len(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_master(self):
+        """Test if download playlist raises M3U8DownloaderError for master playlist"""
+        downloader = SegmentDownloader(f'{self.base_url}/master.m3u8', self.output_file)
+        with self.assertRaises(M3U8DownloaderError) as context:
+            downloader.download_playlist()
+        self.assertIn('as master playlist', context.exception.message)
+
+    @pytest.mark.sequential_order
+    def test_download_master_playlist(self):
+        """Test if download master playlist lists variants and downloads the selected variant"""
+        downloader = SegmentDownloader(f'{self.base_url}/master.m3u8', self.output_file, skip_space_check=True)
+        with self.assertRaises(M3U8DownloaderWarning) as context:
+            downloader.download_master_playlist()
+        self.assertEqual(context.exception.json_data[0]['resolution'], '1280x720')
+
+        downloader.download_master_playlist(resolution='1280x720')
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_variant(self):
+        """Test if download variant fetches the media playlist of the variant without the master playlist"""
+        downloader = SegmentDownloader(f'{self.base_url}/master.m3u8', self.output_file, skip_space_check=True)
+        downloader.download_variant(Variant(f'{self.base_url}/media/index.m3u8', '1280000', '720', '1280x720'))
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertEqual(self.server.requests[0], '/media/index.m3u8')
+        self.assertNotIn('/master.m3u8', self.server.requests)
+        self.assertTrue(downloader.is_download_complete)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_missing_segment(self):
+        """Test if download playlist fails when a segment cannot be downloaded"""
+        del self.server.files['/media/segment5.ts']
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        with self.assertRaises(Exception):
+            downloader.download_playlist()
+        self.assertFalse(downloader.is_download_complete)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_resume(self):
+        """Test if a failed download is resumed by fetching only the missing segments"""
+        missing_segment = self.server.files.pop('/media/segment5.ts')
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        with self.assertRaises(Exception):
+            downloader.download_playlist()
+        self.assertTrue(os.path.exists(downloader.checkpoint_file_path))
+
+        self.server.files['/media/segment5.ts'] = missing_segment
+        self.server.requests.clear()
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertIn('/media/segment5.ts', self.server.requests)
+        self.assertLess(len(self.server.requests), len(self.segments))
+        self.assertFalse(os.path.exists(downloader.checkpoint_file_path))
+        self.assertFalse(os.path.exists(downloader.parts_directory_path))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_staged(self):
+        """Test if download playlist stages and joins all segments in staged mode"""
+        downloader = SegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, max_threads=4, output_mode='staged'
+        )
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertFalse(os.path.exists(downloader.parts_directory_path))
+        self.assertFalse(os.path.exists(downloader.checkpoint_file_path))
+        self.assertGreater(downloader.merge_throughput, 0)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_on_progress(self):
+        """Test if progress is reported to on_progress whenever the percentage changes"""
+        events = []
+        downloader = SegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, output_mode='staged'
+        )
+        downloader.on_progress = lambda *args: events.append(args)
+        downloader.download_playlist()
+        downloads = [event for event in events if event[0] == 'Download']
+        self.assertEqual(len(downloads), len(self.segments))
+        self.assertEqual(downloads[-1][1:3], (len(self.segments), len(self.segments)))
+        self.assertIn('Merged', events[-1][3])
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_small_reorder_buffer(self):
+        """Test if download playlist completes when out-of-order segments do not fit the reorder buffer"""
+        downloader = SegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=8,
+            reorder_buffer_size=0
+        )
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_resume_streaming(self):
+        """Test if a resumed streaming download drops data written after the last recorded segment"""
+        missing_segment = self.server.files.pop('/media/segment5.ts')
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        with self.assertRaises(Exception):
+            downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments[:5]))
+        with open(self.output_file, 'ab') as file:
+            file.write(b'partial segment')
+
+        self.server.files['/media/segment5.ts'] = missing_segment
+        self.server.requests.clear()
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+        self.assertNotIn('/media/segment4.ts', self.server.requests)
+        self.assertEqual(downloader.metrics.segments_resumed, 5)
+
+    @pytest.mark.sequential_order
+    def test_cancel(self):
+        """Test if a cancelled download raises DownloadCancelledError"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True)
+        downloader.cancel()
+        with self.assertRaises(DownloadCancelledError):
+            downloader.download_playlist()
+        self.assertTrue(downloader.is_cancelled)
+        self.assertFalse(os.path.exists(self.output_file))
+
+
+class TestAsyncSegmentDownloader(_LocalServerTestCase):
+    """Unit test cases for AsyncSegmentDownloader class."""
+
+    @pytest.mark.sequential_order
+    def test_download_playlist(self):
+        """Test if download playlist writes all segments in playlist order"""
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_concurrency=8
+        )
+        downloader.download_playlist()
+        self.assertTrue(downloader.is_download_complete)
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_staged(self):
+        """Test if download playlist stages and joins all segments in staged mode"""
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, output_mode='staged'
+        )
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_small_reorder_buffer(self):
+        """Test if download playlist completes when out-of-order segments do not fit the reorder buffer"""
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, reorder_buffer_size=0
+        )
+        downloader.download_playlist()
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_missing_segment(self):
+        """Test if download playlist fails when a segment cannot be downloaded"""
+        del self.server.files['/media/segment5.ts']
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True
+        )
+        with self.assertRaises(OSError):
+            downloader.download_playlist()
+        self.assertFalse(downloader.is_download_complete)
+
+    @pytest.mark.sequential_order
+    def test_cancel_from_other_thread(self):
+        """Test if cancelling from another thread stops the event loop"""
+        self.server.delay = 0.2
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_concurrency=2
+        )
+        timer = threading.Timer(0.3, downloader.cancel)
+        timer.start()
+        try:
+            with self.assertRaises(DownloadCancelledError):
+                downloader.download_playlist()
+        finally:
+            timer.cancel()
+
+    @pytest.mark.sequential_order
+    def test_invalid_output_mode(self):
+        """Test if invalid output mode raises ValueError"""
+        with self.assertRaises(ValueError):
+            AsyncSegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, output_mode='memory')
+
+    @pytest.mark.sequential_order
+    def test_invalid_max_concurrency(self):
+        """Test if invalid max concurrency raises ValueError"""
+        with self.assertRaises(ValueError):
+            AsyncSegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, max_concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
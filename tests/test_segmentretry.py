@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from pym3u8downloader import M3U8DownloaderError
+
+from src import AsyncSegmentDownloader, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestSegmentRetry(_LocalServerTestCase):
+    """Unit test cases for segment timeouts, retries and hedged requests."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.failures = {}
+        self.server.stalls = {}
+        # Retry without waiting to keep the tests fast
+        self.backoff_base = SegmentDownloader._backoff_base
+        SegmentDownloader._backoff_base = 0.01
+
+    def tearDown(self):
+        SegmentDownloader._backoff_base = self.backoff_base
+        super().tearDown()
+
+    def _assert_output(self):
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_retry(self):
+        """Test if both engines retry segments failing with a temporary error"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.server.failures.update({'/media/segment3.ts': 2, '/media/segment7.ts': 1})
+                downloader = engine(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_retries=2
+                )
+                downloader.download_playlist()
+                self._assert_output()
+                self.assertEqual(downloader.metrics.retries, 3)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_retries_exhausted(self):
+        """Test if both engines give up on a segment after the maximum number of retries"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.server.failures['/media/segment3.ts'] = 3
+                downloader = engine(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_retries=2
+                )
+                with self.assertRaises(M3U8DownloaderError) as context:
+                    downloader.download_playlist()
+                self.assertIn('after 3 attempt(s)', context.exception.message)
+                self.assertFalse(downloader.is_download_complete)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_segment_timeout(self):
+        """Test if both engines abandon and retry a stalled segment request after the segment timeout"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.server.stalls['/media/segment5.ts'] = 3
+                downloader = engine(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=4,
+                    segment_timeout=0.5
+                )
+                if engine is AsyncSegmentDownloader:
+                    downloader.max_concurrency = 4  # Stay within the listen backlog of the test server
+                start_time = time.perf_counter()
+                downloader.download_playlist()
+                self.assertLess(time.perf_counter() - start_time, 2.5)
+                self._assert_output()
+                self.assertEqual(downloader.metrics.retries, 1)
+
+    @pytest.mark.sequential_order
+    def test_download_playlist_hedge_requests(self):
+        """Test if both engines send a duplicate request for a segment slower than the observed p95 latency"""
+        for engine in (SegmentDownloader, AsyncSegmentDownloader):
+            with self.subTest(engine=engine.__name__):
+                self.server.stalls['/media/segment18.ts'] = 3
+                downloader = engine(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, skip_space_check=True, max_threads=1,
+                    hedge_requests=True
+                )
+                downloader._hedge_min_samples = 10
+                if engine is AsyncSegmentDownloader:
+                    downloader.max_concurrency = 1
+                start_time = time.perf_counter()
+                downloader.download_playlist()
+                self.assertLess(time.perf_counter() - start_time, 2.5)
+                self._assert_output()
+                self.assertEqual(downloader.metrics.hedges, 1)
+                self.assertEqual(downloader.metrics.retries, 0)
@@ -0,0 +1,88 @@
+import os
+from collections import namedtuple
+from unittest import mock
+
+import pytest
+
+from src import AsyncSegmentDownloader, Constants, SegmentDownloader
+from test_segmentdownloader import _LocalServerTestCase
+
+_DiskUsage = namedtuple('_DiskUsage', 'total used free')
+
+
+class TestSizeEstimation(_LocalServerTestCase):
+    """Unit test cases for the size estimation and preallocation of the segment downloaders."""
+
+    def _get_segments(self, downloader):
+        return downloader._fetch_playlist(f'{self.base_url}/media/index.m3u8').segments
+
+    @pytest.mark.sequential_order
+    def test_estimate_size(self):
+        """Test if the size of every segment is requested with 0 samples or no more segments than samples"""
+        for samples in (0, len(self.segments)):
+            with self.subTest(samples=samples):
+                self.server.head_requests.clear()
+                downloader = SegmentDownloader(
+                    f'{self.base_url}/media/index.m3u8', self.output_file, size_estimate_samples=samples
+                )
+                segments = self._get_segments(downloader)
+                self.assertEqual(downloader._estimate_size(segments), sum(map(len, self.segments)))
+                self.assertEqual(len(self.server.head_requests), len(self.segments))
+
+    @pytest.mark.sequential_order
+    def test_estimate_size_default(self):
+        """Test if a bounded number of segments is sampled by default"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file)
+        segments = self._get_segments(downloader) * 10
+        downloader._estimate_size(segments)
+        self.assertEqual(len(self.server.head_requests), Constants.DEFAULT_SIZE_ESTIMATE_SAMPLES)
+
+    @pytest.mark.sequential_order
+    def test_estimate_size_sampled(self):
+        """Test if the size is extrapolated from evenly spread samples"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, size_estimate_samples=4)
+        estimated_size = downloader._estimate_size(self._get_segments(downloader))
+        self.assertCountEqual(self.server.head_requests, [f'/media/segment{index}.ts' for index in (0, 5, 10, 15)])
+        self.assertEqual(estimated_size, (1000 + 1005 + 1010 + 1015) * 5)
+
+    @pytest.mark.sequential_order
+    def test_low_on_storage(self):
+        """Test if the download fails before fetching any segment when the estimate exceeds the free space"""
+        downloader = SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, size_estimate_samples=4)
+        with mock.patch('src.engine.shutil.disk_usage', return_value=_DiskUsage(20000, 0, 20000)):
+            with self.assertRaises(OSError):
+                downloader.download_playlist()
+        self.assertFalse([path for path in self.server.requests if path.endswith('.ts')])
+
+    @pytest.mark.sequential_order
+    def test_preallocate(self):
+        """Test if the output file is preallocated and truncated to its actual size"""
+        for output_mode in SegmentDownloader.OUTPUT_MODES:
+            for estimated_size in (100, 1000000):
+                with self.subTest(output_mode=output_mode, estimated_size=estimated_size):
+                    downloader = SegmentDownloader(
+                        f'{self.base_url}/media/index.m3u8', self.output_file, output_mode=output_mode,
+                        preallocate=True
+                    )
+                    with mock.patch.object(downloader, '_estimate_size', return_value=estimated_size):
+                        downloader.download_playlist()
+                    with open(self.output_file, 'rb') as file:
+                        self.assertEqual(file.read(), b''.join(self.segments))
+
+    @pytest.mark.sequential_order
+    @pytest.mark.skipif(not hasattr(os, 'posix_fallocate'), reason='posix_fallocate is not supported')
+    def test_preallocate_reserves_space(self):
+        """Test if the estimated size is reserved before the segments are written"""
+        downloader = AsyncSegmentDownloader(
+            f'{self.base_url}/media/index.m3u8', self.output_file, max_concurrency=4, preallocate=True
+        )
+        with mock.patch('src.engine.os.posix_fallocate', wraps=os.posix_fallocate) as posix_fallocate:
+            downloader.download_playlist()
+        posix_fallocate.assert_called_once_with(mock.ANY, 0, sum(map(len, self.segments)))
+        self.assertEqual(os.path.getsize(self.output_file), sum(map(len, self.segments)))
+
+    @pytest.mark.sequential_order
+    def test_invalid_size_estimate_samples(self):
+        """Test if a negative number of samples is rejected"""
+        with self.assertRaises(ValueError):
+            SegmentDownloader(f'{self.base_url}/media/index.m3u8', self.output_file, size_estimate_samples=-1)
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import time
+import tkinter as tk
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from src import AssetCache, M3U8DownloaderUI
+
+
+class TestStartup(unittest.TestCase):
+    """Benchmark test cases for the startup of M3U8DownloaderUI"""
+
+    STARTUP_BUDGET = 2.0  # Maximum time (in seconds) from creating the window until it is painted
+
+    def setUp(self):
+        self.cache_directory = tempfile.mkdtemp()
+        patcher = patch('src.assets.get_cache_directory', return_value=self.cache_directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_directory, ignore_errors=True)
+
+    @pytest.mark.sequential_order
+    def test_startup(self):
+        """Test if the window is painted within the budget without touching the network"""
+        with patch('requests.get') as mock_get, patch.object(AssetCache, 'refresh_in_background') as mock_refresh:
+            start = time.perf_counter()
+            root = tk.Tk()
+            try:
+                M3U8DownloaderUI(root)
+                root.update_idletasks()
+                elapsed = time.perf_counter() - start
+                mock_get.assert_not_called()
+
+                root.update()
+                mock_refresh.assert_called_once()
+            finally:
+                root.destroy()
+
+        self.assertLess(elapsed, self.STARTUP_BUDGET, f'Startup took {elapsed * 1000:.1f} ms')
+        self.assertTrue(os.listdir(self.cache_directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
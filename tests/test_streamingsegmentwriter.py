@@ -0,0 +1,176 @@
+import errno
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from src.writer import SegmentReceiver, StreamingSegmentWriter, copy_file
+
+
+class TestStreamingSegmentWriter(unittest.TestCase):
+    """Unit test cases for StreamingSegmentWriter class."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.output_file = open(os.path.join(self.temp_directory, 'video.mp4'), 'w+b', buffering=0)
+
+    def tearDown(self):
+        self.output_file.close()
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    def _part(self, index: int, data: bytes) -> str:
+        part_file_path = os.path.join(self.temp_directory, f'segment{index}.ts')
+        with open(part_file_path, 'wb') as file:
+            file.write(data)
+        return part_file_path
+
+    def _output(self) -> bytes:
+        self.output_file.seek(0)
+        return self.output_file.read()
+
+    @pytest.mark.sequential_order
+    def test_write_out_of_order(self):
+        """Test if segments arriving out of order are written in playlist order and their files deleted"""
+        written = []
+        writer = StreamingSegmentWriter(self.output_file, on_written=lambda *args: written.append(args))
+        writer.write(2, self._part(2, b'cc'))
+        writer.write(1, self._part(1, b'b'))
+        self.assertEqual(self._output(), b'')
+        self.assertEqual(writer.buffered_size, 3)
+
+        writer.write(0, self._part(0, b'aaa'))
+        self.assertEqual(self._output(), b'aaabcc')
+        self.assertEqual(written, [(0, 0, 3), (1, 3, 1), (2, 4, 2)])
+        self.assertEqual(writer.next_index, 3)
+        self.assertEqual(writer.buffered_size, 0)
+        self.assertEqual(writer.peak_buffered_size, 3)
+        self.assertEqual(os.listdir(self.temp_directory), ['video.mp4'])
+
+    @pytest.mark.sequential_order
+    def test_offer_buffer_full(self):
+        """Test if offer rejects out-of-order segments exceeding the buffer but always accepts the next segment"""
+        self.output_file.write(b'xx')
+        writer = StreamingSegmentWriter(self.output_file, next_index=5, max_buffer_size=4)
+        self.assertTrue(writer.offer(6, self._part(6, b'bbbb')))
+        self.assertFalse(writer.offer(7, self._part(7, b'c')))
+        self.assertTrue(writer.offer(5, self._part(5, b'aaaaaaaa')))
+        self.assertTrue(writer.offer(7, self._part(7, b'c')))
+        self.assertEqual(self._output(), b'xxaaaaaaaabbbbc')
+
+    @pytest.mark.sequential_order
+    def test_write_waits_for_buffer_space(self):
+        """Test if write blocks while the buffer is full and resumes once preceding segments are written"""
+        writer = StreamingSegmentWriter(self.output_file, max_buffer_size=1)
+        writer.write(1, self._part(1, b'b'))
+        thread = threading.Thread(target=writer.write, args=(2, self._part(2, b'c')))
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+
+        writer.write(0, self._part(0, b'a'))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self._output(), b'abc')
+
+    @pytest.mark.sequential_order
+    def test_close(self):
+        """Test if close fails waiting producers but still accepts segments which can be written right away"""
+        writer = StreamingSegmentWriter(self.output_file, max_buffer_size=0)
+        errors = []
+
+        def write():
+            try:
+                writer.write(1, self._part(1, b'b'))
+            except ValueError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        writer.close()
+        thread.join(5)
+        self.assertEqual(len(errors), 1)
+        with self.assertRaises(ValueError):
+            writer.write(2, self._part(2, b'c'))
+        writer.write(0, self._part(0, b'a'))
+        self.assertEqual(self._output(), b'a')
+
+
+class TestSegmentReceiver(unittest.TestCase):
+    """Unit test cases for SegmentReceiver class."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.part_file_path = os.path.join(self.temp_directory, 'segment0.ts')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    @pytest.mark.sequential_order
+    def test_commit(self):
+        """Test if the chunks only replace the part file once the segment is complete"""
+        receiver = SegmentReceiver(self.part_file_path)
+        receiver.write(b'ab')
+        receiver.write(b'c')
+        self.assertFalse(os.path.exists(self.part_file_path))
+        self.assertEqual(receiver.commit(), 3)
+        with open(self.part_file_path, 'rb') as file:
+            self.assertEqual(file.read(), b'abc')
+        self.assertEqual(os.listdir(self.temp_directory), ['segment0.ts'])
+
+    @pytest.mark.sequential_order
+    def test_discard(self):
+        """Test if discarded segments leave no file behind"""
+        receiver = SegmentReceiver(self.part_file_path)
+        receiver.write(b'ab')
+        receiver.discard()
+        self.assertEqual(os.listdir(self.temp_directory), [])
+
+
+class TestCopyFile(unittest.TestCase):
+    """Unit test cases for copy_file function."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.source_file = os.path.join(self.temp_directory, 'segment.ts')
+        self.destination_file = os.path.join(self.temp_directory, 'video.mp4')
+        self.content = os.urandom(300 * 1024)
+        with open(self.source_file, 'wb') as file:
+            file.write(self.content)
+        open(self.destination_file, 'wb').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    def _copy(self, skip: int = 0) -> int:
+        with open(self.source_file, 'rb', buffering=0) as source:
+            with open(self.destination_file, 'r+b', buffering=0) as destination:
+                source.seek(skip)
+                destination.seek(0, os.SEEK_END)
+                return copy_file(source.fileno(), destination.fileno(), 64 * 1024)
+
+    @pytest.mark.sequential_order
+    def test_copy_file(self):
+        """Test if copy file appends the rest of the source file"""
+        with open(self.destination_file, 'wb') as file:
+            file.write(b'header')
+        self.assertEqual(self._copy(skip=100), len(self.content) - 100)
+        with open(self.destination_file, 'rb') as file:
+            self.assertEqual(file.read(), b'header' + self.content[100:])
+
+    @pytest.mark.sequential_order
+    def test_copy_file_fallback(self):
+        """Test if copy file falls back to a buffered copy when kernel-side copies are not supported"""
+        unsupported = OSError(errno.ENOSYS, 'Function not implemented')
+        with mock.patch('os.copy_file_range', side_effect=unsupported, create=True), \
+                mock.patch('os.sendfile', side_effect=unsupported, create=True):
+            self.assertEqual(self._copy(), len(self.content))
+        with open(self.destination_file, 'rb') as file:
+            self.assertEqual(file.read(), self.content)
+
+
+if __name__ == "__main__":
+    unittest.main()
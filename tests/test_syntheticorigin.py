@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+import unittest
+
+import pytest
+import requests
+
+from benchmarks import SyntheticOrigin
+from benchmarks.harness import compare, run_case
+from benchmarks.origin import IV, KEY
+from src.decryption import decrypt_aes_128
+from src.playlist import MasterPlaylist, parse_playlist
+
+
+class TestSyntheticOrigin(unittest.TestCase):
+    """Unit test cases for SyntheticOrigin class and the benchmark harness."""
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    @pytest.mark.sequential_order
+    def test_playlists(self):
+        """Test if the master playlist lists the variants and their media playlists list the segments"""
+        with SyntheticOrigin(segment_count=5, segment_size=1000, variants=2) as origin:
+            master = parse_playlist(requests.get(origin.master_url).text, origin.master_url)
+            self.assertIsInstance(master, MasterPlaylist)
+            self.assertEqual([variant.name for variant in master.variants], ['v1', 'v2'])
+            self.assertEqual(master.variants[1].uri, origin.get_media_url())
+
+            media = parse_playlist(requests.get(origin.get_media_url()).text, origin.get_media_url())
+            self.assertEqual(len(media.segments), 5)
+            self.assertEqual(len(requests.get(media.segments[4].uri).content), 1000)
+            lowest_segment_url = origin.get_media_url(1).replace('index.m3u8', 'segment0.ts')
+            self.assertEqual(len(requests.get(lowest_segment_url).content), 500)
+            self.assertEqual(requests.get(media.segments[4].uri.replace('segment4', 'segment5')).status_code, 404)
+
+    @pytest.mark.sequential_order
+    def test_encrypted(self):
+        """Test if the segments of encrypted playlists decrypt with the served key"""
+        with SyntheticOrigin(segment_count=2, segment_size=1000, variants=1, encrypted=True) as origin:
+            media = parse_playlist(requests.get(origin.get_media_url()).text, origin.get_media_url())
+            segment = media.segments[0]
+            self.assertEqual((segment.key.method, segment.iv), ('AES-128', IV))
+            self.assertEqual(requests.get(segment.key.uri).content, KEY)
+            self.assertEqual(len(decrypt_aes_128(requests.get(segment.uri).content, KEY, IV)), 1000)
+
+    @pytest.mark.sequential_order
+    def test_error_rate(self):
+        """Test if segment requests fail at the given rate"""
+        with SyntheticOrigin(segment_count=1, segment_size=10, variants=1, error_rate=0.5) as origin:
+            with requests.Session() as session:
+                statuses = [session.get(f'{origin.url}/v1/segment0.ts').status_code for _ in range(100)]
+            self.assertEqual(statuses.count(503), origin.errors)
+            self.assertTrue(20 < origin.errors < 80)
+
+    @pytest.mark.sequential_order
+    def test_run_case(self):
+        """Test if a benchmark case downloads the highest variant and measures it"""
+        with SyntheticOrigin(segment_count=10, segment_size=4096, variants=2) as origin:
+            result = run_case(origin, self.temp_directory, 'threaded', 'staged', 4)
+        self.assertEqual(result['state'], 'Completed', result['message'])
+        self.assertGreater(result['throughput'], 0)
+        self.assertGreater(result['ttfb'], 0)
+        self.assertIsNotNone(result['merge_time'])
+
+    @pytest.mark.sequential_order
+    def test_compare(self):
+        """Test if only changes beyond the tolerance and the noise floor are regressions"""
+        baseline = [{
+            'engine': 'threaded', 'output_mode': 'staged', 'concurrency': 4, 'state': 'Completed',
+            'throughput': 100.0, 'ttfb': 0.01, 'peak_rss': None, 'merge_time': 1.0
+        }]
+        result = dict(baseline[0], throughput=70.0, ttfb=0.04, merge_time=1.1)
+        self.assertEqual(compare([result], baseline, 0.2), ['threaded/staged/4: throughput 100 -> 70'])
+        failed = dict(baseline[0], state='Failed', message='error')
+        self.assertEqual(len(compare([failed], baseline, 0.2)), 1)
@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from src.metrics import TransferMetrics
+
+
+class TestTransferMetrics(unittest.TestCase):
+    """Unit test cases for TransferMetrics class."""
+
+    @pytest.mark.sequential_order
+    def test_record_segment(self):
+        """Test if recorded segments update the counters and the latency histogram"""
+        metrics = TransferMetrics()
+        metrics.start(10, segments_resumed=2)
+        metrics.record_segment(1000, 0.01)
+        metrics.record_segment(1000, 0.05)
+        metrics.record_segment(2000, 0.3)
+        metrics.record_segment(500, 60)
+        metrics.record_retry()
+
+        self.assertEqual(metrics.segments_completed, 6)
+        self.assertEqual(metrics.bytes_downloaded, 4500)
+        self.assertEqual(metrics.retries, 1)
+        self.assertEqual(metrics.latency_counts[0], 2)
+        self.assertEqual(metrics.latency_counts[3], 1)
+        self.assertEqual(metrics.latency_counts[-1], 1)
+        self.assertEqual(metrics.get_latency_percentile(50), 0.05)
+        self.assertEqual(metrics.get_latency_percentile(95), float('inf'))
+        self.assertIsNotNone(metrics.eta)
+
+    @pytest.mark.sequential_order
+    def test_eta(self):
+        """Test if the ETA is unknown before the first segment and zero once all segments are transferred"""
+        metrics = TransferMetrics()
+        metrics.start(2)
+        self.assertIsNone(metrics.eta)
+        self.assertIsNone(metrics.get_latency_percentile(95))
+        metrics.record_segment(100, 0.1)
+        metrics.record_segment(100, 0.1)
+        self.assertEqual(metrics.eta, 0.0)
+
+    @pytest.mark.sequential_order
+    def test_dump(self):
+        """Test if dump writes all metrics as JSON"""
+        temp_directory = tempfile.mkdtemp()
+        try:
+            metrics = TransferMetrics()
+            metrics.start(1)
+            metrics.record_segment(100, 45)
+            metrics.finish('Completed')
+            file_path = os.path.join(temp_directory, 'video.mp4.metrics.json')
+            metrics.dump(file_path)
+            with open(file_path, 'r') as file:
+                data = json.load(file)
+            self.assertEqual(data['state'], 'Completed')
+            self.assertGreater(data['peak_rss'], 0)
+            self.assertEqual(data['bytes_downloaded'], 100)
+            self.assertIsNone(data['latency_p95'])
+            self.assertEqual(data['latency_histogram']['>30s'], 1)
+            self.assertEqual(sum(data['latency_histogram'].values()), 1)
+        finally:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import pytest
+
+from src import DownloadJob, DownloadWorker, JobState, PlaylistInspector, VariantSelector
+from test_segmentdownloader import _LocalServerTestCase
+
+
+class TestVariantSelector(_LocalServerTestCase):
+    """Unit test cases for VariantSelector class."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.files['/variants.m3u8'] = (
+            b'#EXTM3U\n'
+            b'#EXT-X-STREAM-INF:BANDWIDTH=800000000,NAME="huge"\nmedia/index.m3u8\n'
+            b'#EXT-X-STREAM-INF:BANDWIDTH=8000,NAME="low"\nmedia/index.m3u8\n'
+            b'#EXT-X-STREAM-INF:BANDWIDTH=80000,NAME="medium"\nmedia/index.m3u8\n'
+        )
+        self.url = f'{self.base_url}/variants.m3u8'
+        self.inspector = PlaylistInspector()
+
+    @pytest.mark.sequential_order
+    def test_select(self):
+        """Test if select picks the highest bandwidth variant expected to download within the deadline"""
+        selector = VariantSelector(10, self.inspector, probe_segments=2)
+        variant = selector.select(self.inspector.inspect(self.url))
+        self.assertEqual(variant.name, 'medium')
+        self.assertEqual(selector.duration, 40.0)
+        self.assertGreater(selector.throughput, 0)
+        self.assertEqual(
+            sorted(path for path in self.server.requests if path.endswith('.ts')),
+            ['/media/segment0.ts', '/media/segment1.ts']
+        )
+
+    @pytest.mark.sequential_order
+    def test_select_nothing_fits(self):
+        """Test if select falls back to the lowest bandwidth variant when no variant fits the deadline"""
+        selector = VariantSelector(1e-9, self.inspector)
+        self.assertEqual(selector.select(self.inspector.inspect(self.url)).name, 'low')
+
+    @pytest.mark.sequential_order
+    def test_download_worker_deadline(self):
+        """Test if a configured variant deadline selects the variant without asking the user"""
+        job = DownloadJob(self.url, self.output_file, True, False)
+        worker = DownloadWorker(
+            self.url, self.output_file, True, False, job=job, inspector=self.inspector,
+            overrides={'skip_space_check': True, 'variant_deadline': 10}
+        )
+        worker.start()
+        worker.join()
+        self.assertEqual(job.state, JobState.COMPLETED)
+        with open(self.output_file, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(self.segments))